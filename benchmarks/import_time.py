@@ -0,0 +1,93 @@
+"""Startup import-time report.
+
+Imports the entry point in a fresh interpreter under ``python -X importtime``
+and reports the total, the slowest modules, and any heavy third-party
+package that got imported at startup even though it is meant to load lazily.
+
+    python benchmarks/import_time.py                     # report
+    python benchmarks/import_time.py --check             # fail if a heavy package is imported eagerly
+    python benchmarks/import_time.py --budget-ms 300     # also fail if startup imports take longer
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGET = "src.voiceai.main"
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "0")) or None
+
+# Loaded on first use, never at import time
+LAZY_PACKAGES = (
+    "pyaudio",
+    "sounddevice",
+    "numpy",
+    "webrtcvad",
+    "openai",
+    "elevenlabs",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "google_auth_httplib2",
+    "httplib2",
+)
+
+
+def measure_imports(target=DEFAULT_TARGET):
+    """Import target in a fresh interpreter; return {module: (self_us, cumulative_us)}."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "src")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {target} failed:\n{result.stderr.strip()[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def eager_heavy_imports(modules):
+    return sorted(package for package in LAZY_PACKAGES if package in modules)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="module to import (default %(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="imports to time; the fastest is reported")
+    parser.add_argument("--top", type=int, default=15, help="how many of the slowest modules to list")
+    parser.add_argument("--check", action="store_true", help="fail if a lazily loaded package is imported")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="fail if importing the target takes longer (default: no budget)")
+    args = parser.parse_args(argv)
+
+    # The first run also compiles bytecode; the fastest of several is the steady-state cold start
+    runs = [measure_imports(args.target) for _ in range(max(1, args.runs))]
+    modules = min(runs, key=lambda run: run[args.target][1])
+    total_ms = modules[args.target][1] / 1000
+
+    print(f"Importing {args.target}: {total_ms:.1f} ms (best of {len(runs)})")
+    print("\nSlowest modules (self ms / cumulative ms):")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {name:<48} {self_us / 1000:>8.1f} {cumulative_us / 1000:>8.1f}")
+
+    failures = []
+    eager = eager_heavy_imports(modules)
+    if eager:
+        print(f"\nImported at startup but meant to load lazily: {', '.join(eager)}")
+        if args.check:
+            failures.append("eager imports")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nOver budget: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        failures.append("budget")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""Offline microbenchmarks for the call hot paths.
+
+Runs on synthetic data only; no API keys, network or audio devices needed.
+Benchmarks whose modules cannot be imported here (e.g. PyAudio without
+PortAudio) are reported as skipped.
+
+    python benchmarks/run_benchmarks.py                  # run and print
+    python benchmarks/run_benchmarks.py --save           # also write the baseline
+    python benchmarks/run_benchmarks.py --compare        # fail on regressions
+    python benchmarks/run_benchmarks.py -k slots --threshold 0.5
+
+Baselines are machine-specific, so they are not committed; save one on the
+machine that runs the comparison.
+"""
+import argparse
+import atexit
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "results", "baseline.json")
+DEFAULT_THRESHOLD = float(os.getenv("BENCH_REGRESSION_THRESHOLD", "0.25"))
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Skip(Exception):
+    pass
+
+
+def _import(path):
+    try:
+        module = __import__(path, fromlist=["*"])
+    except (ImportError, OSError) as e:
+        raise Skip(f"{path} unavailable: {e}")
+    return module
+
+
+# ---------------------------------------------------------------------------
+# Calendar
+
+def _synthetic_calendar(event_count, seed=7):
+    rng = random.Random(seed)
+    tz = datetime.now().astimezone().tzinfo
+    start = datetime(2024, 6, 3, 8, 0, tzinfo=tz)
+    end = start + timedelta(days=3)
+    busy, events = [], []
+    for _ in range(event_count):
+        begin = start + timedelta(minutes=15 * rng.randrange(0, 3 * 24 * 4))
+        finish = begin + timedelta(minutes=15 * rng.randrange(1, 5))
+        busy.append({"start": begin.isoformat(), "end": finish.isoformat()})
+        events.append({
+            "summary": "Busy",
+            "start": {"dateTime": begin.isoformat()},
+            "end": {"dateTime": finish.isoformat()},
+        })
+    return start, end, busy, events
+
+
+def _slot_benchmark(event_count):
+    def setup():
+        calendar_service = _import("voiceai.services.calendar_service")
+        calendar = calendar_service.GoogleCalendarService()
+        start, end, busy, events = _synthetic_calendar(event_count)
+        return lambda: calendar._find_free_slots(start, end, busy, 30, events)
+    return setup
+
+for _count in (10, 100, 1000):
+    benchmark(f"calendar.find_free_slots[{_count}]")(_slot_benchmark(_count))
+
+
+# ---------------------------------------------------------------------------
+# Session parsing helpers
+
+def _session_helpers():
+    session = _import("src.voiceai.session")
+    fake = SimpleNamespace(
+        full_transcript=[
+            "Agent: Hi, who's calling?",
+            "Caller: This is Dr. Patel's office about your blood test results",
+            "Agent: Available times are Tuesday at 10:00 AM, Tuesday at 02:00 PM. Which works for you?",
+            "Caller: Tuesday at 2:30 pm works for me",
+        ],
+        available_slots=[],
+    )
+    return session.CallSession, fake
+
+
+@benchmark("session.parse_user_time_request")
+def _():
+    CallSession, fake = _session_helpers()
+    return lambda: CallSession._parse_user_time_request(fake)
+
+
+@benchmark("session.extract_caller_purpose")
+def _():
+    CallSession, fake = _session_helpers()
+    transcript = "Hi, I'm calling from the clinic to set up a follow up consultation next week"
+    return lambda: CallSession._extract_caller_purpose(fake, transcript)
+
+
+# ---------------------------------------------------------------------------
+# LLM response parsing
+
+@benchmark("llm.parse_response")
+def _():
+    llm_service = _import("voiceai.services.llm_service")
+    engine = llm_service.ConversationEngine(client=SimpleNamespace())
+    payload = json.dumps({
+        "response": "Thanks for calling. Could you tell me what this is regarding?",
+        "intent": "unclear",
+        "action": "continue",
+        "confidence": 0.6,
+    })
+    return lambda: engine._parse_response(payload)
+
+
+@benchmark("llm.parse_response_invalid")
+def _():
+    llm_service = _import("voiceai.services.llm_service")
+    engine = llm_service.ConversationEngine(client=SimpleNamespace())
+    return lambda: engine._parse_response("Sorry, could you repeat that?")
+
+
+# ---------------------------------------------------------------------------
+# Audio capture path
+
+FRAME_BYTES = 640      # 20 ms of 16 kHz 16-bit mono, one VAD frame
+CAPTURE_BYTES = 2048   # one 1024-sample capture chunk
+
+def _noise(size, seed=3):
+    rng = random.Random(seed)
+    return bytes(rng.getrandbits(8) for _ in range(size))
+
+
+@benchmark("audio.ring_buffer_write_read")
+def _():
+    ring_buffer = _import("voiceai.services.ring_buffer")
+    ring = ring_buffer.AudioRingBuffer(32000 * 2)
+    chunk = _noise(CAPTURE_BYTES)
+    dest = bytearray(1920)
+
+    def run():
+        for _ in range(16):
+            ring.write(chunk)
+        while ring.available() >= len(dest):
+            ring.read_into(dest)
+        ring.clear()
+    return run
+
+
+@benchmark("audio.vad_framer")
+def _():
+    vad_gate = _import("voiceai.services.vad_gate")
+    framer = vad_gate.VADFramer(FRAME_BYTES)
+    chunk = _noise(CAPTURE_BYTES)
+    return lambda: framer.push(chunk)
+
+
+@benchmark("audio.vad_gate_60ms")
+def _():
+    webrtcvad = _import("webrtcvad")
+    vad_gate = _import("voiceai.services.vad_gate")
+    frame_pool = _import("voiceai.services.frame_pool")
+    vad = webrtcvad.Vad(2)
+    gate = vad_gate.VADGate(lambda frame: vad.is_speech(frame, 16000), FRAME_BYTES,
+                            frame_ms=20, preroll_ms=300, hangover_ms=1000,
+                            keepalive_interval_ms=1000, keepalive_ms=100)
+    pool = frame_pool.FramePool(FRAME_BYTES * 3, 64)
+    audio = _noise(FRAME_BYTES * 3)
+
+    def run():
+        frame = pool.acquire()
+        frame.view[:] = audio
+        for out in gate.process(frame):
+            out.release()
+        frame.release()
+    return run
+
+
+@benchmark("audio.handler_buffering")
+def _():
+    audio_handler = _import("voiceai.services.audio_handler")
+    frame_pool = _import("voiceai.services.frame_pool")
+    # buffer_audio/get_buffered_audio only touch the frame deque, not the device
+    handler = SimpleNamespace(audio_buffer=deque(maxlen=50))
+    pool = frame_pool.FramePool(FRAME_BYTES * 3, 64)
+
+    def run():
+        for _ in range(25):
+            frame = pool.acquire()
+            audio_handler.AudioHandler.buffer_audio(handler, frame)
+            frame.release()
+        audio_handler.AudioHandler.get_buffered_audio(handler)
+    return run
+
+
+# ---------------------------------------------------------------------------
+# TTS chunk assembly
+
+def _tts_chunks():
+    # Roughly what ElevenLabs streams for one sentence: ~2 s of PCM in 4 KB chunks
+    audio = _noise(64000)
+    return [audio[i:i + 4096] for i in range(0, len(audio), 4096)]
+
+
+@benchmark("tts.chunk_join")
+def _():
+    chunks = _tts_chunks()
+    return lambda: b"".join(chunks)
+
+
+@benchmark("tts.cache_put_get")
+def _():
+    tts_cache = _import("voiceai.services.tts_cache")
+    directory = tempfile.mkdtemp(prefix="tts-bench-")
+    atexit.register(shutil.rmtree, directory, True)
+    cache = tts_cache.TTSCache(cache_dir=directory, max_memory_bytes=8 * 1024 * 1024)
+    chunks = _tts_chunks()
+    keys = itertools.cycle([
+        tts_cache.TTSCache.make_key(f"sentence {i}", "voice", "model", "pcm_16000") for i in range(8)
+    ])
+
+    def run():
+        key = next(keys)
+        cache.put(key, chunks)
+        cache.get(key)
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Runner
+
+def measure(func, rounds=9, target_seconds=0.1):
+    """Best and median time per call in microseconds."""
+    func()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= target_seconds / 5 or number >= 1_000_000:
+            break
+        number *= 4
+    number = max(1, int(number * (target_seconds / 5) / max(elapsed, 1e-9)))
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) / number * 1e6)
+    return {"median_us": statistics.median(per_call), "min_us": min(per_call), "calls": number}
+
+
+def run(selected):
+    results, skipped = {}, {}
+    for name, setup in BENCHMARKS.items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        try:
+            func = setup()
+        except Skip as e:
+            skipped[name] = str(e)
+            print(f"{name:<38} skipped ({e})")
+            continue
+        results[name] = measure(func)
+        print(f"{name:<38} {results[name]['min_us']:>12.2f} us")
+    return results, skipped
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        allowed = baseline.get("thresholds", {}).get(name, threshold)
+        # The best round is far less sensitive to scheduler noise than the median
+        ratio = result["min_us"] / previous["min_us"]
+        marker = "REGRESSION" if ratio > 1 + allowed else ""
+        print(f"{name:<38} {previous['min_us']:>10.2f} -> {result['min_us']:>10.2f} us "
+              f"({(ratio - 1) * 100:+.1f}%) {marker}")
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="selected", action="append", default=[],
+                        help="only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare with the baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before failing, as a fraction (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    results, skipped = run(args.selected)
+    regressions = []
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --save first")
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.baseline} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "thresholds": previous.get("thresholds", {}),
+                "results": results,
+                "skipped": skipped,
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+import asyncio
+import time
+import uuid
+from src.voiceai.services.calendar_service import GoogleCalendarService
+from src.voiceai.services.async_calendar import AsyncCalendarService
+from src.voiceai.services.tts_cache import TTSCache
+from src.voiceai.services.response_cache import ResponseCache
+from src.voiceai.services.availability_cache import AvailabilityCache
+from src.voiceai.services.call_store import CallStore
+from src.voiceai.services.tracing import Tracer, build_exporter
+from src.voiceai.services.tts_service import ElevenLabsTTSService
+from src.voiceai.session import CallSession
+from src.voiceai import config
+
+class CallManager:
+    """Runs many CallSessions on one event loop with shared service clients.
+
+    The OpenAI and ElevenLabs clients, the TTS cache and the calendar service
+    are created once and handed to every session, so concurrent calls share
+    one pre-warmed HTTP connection pool instead of each opening their own.
+    The vendor SDKs and PyAudio are slow to import, so their clients are
+    built on first use.
+
+    Each call needs its own audio: pass ``audio_source`` (anything with
+    AudioHandler's interface, like the replay ``WavAudioSource``) and
+    ``audio_sink`` (a StreamingPlayer-like player) to ``start_call``. A call
+    started without them uses this machine's microphone and speakers, and
+    only one such call can run at a time.
+    """
+
+    def __init__(self, max_calls=None):
+        self.max_calls = max_calls or config.MAX_CONCURRENT_CALLS
+
+        self._http_pool = None
+        self._llm_client = None
+        self._tts_client = None
+        self.tts_cache = TTSCache()
+        self.response_cache = ResponseCache() if config.RESPONSE_CACHE_ENABLED else None
+        self.calendar_service = AsyncCalendarService(GoogleCalendarService())
+        self.availability_cache = AvailabilityCache(self.calendar_service)
+        self.call_store = CallStore() if config.CALL_STORE_ENABLED else None
+        self.tracer = Tracer(exporter=build_exporter(), enabled=config.TRACING_ENABLED)
+        self.pyaudio_instance = None
+
+        self.sessions = {}
+        self._tasks = {}
+        # Id of the call using the local microphone and speakers, if any
+        self._local_audio_call = None
+
+    async def initialize(self):
+        """Get everything the first call needs ready; the independent steps run concurrently."""
+        print("Initializing Hiya Guard...")
+        started = time.monotonic()
+        # Created up front so both SDK clients, built concurrently below, share it
+        http_pool = self.http_pool
+
+        await asyncio.gather(
+            self._prepare_http(http_pool),
+            self._prepare_calendar(),
+            self._prepare_greeting(),
+            self._prepare_llm(),
+            self._prepare_audio(),
+        )
+
+        print(f"Hiya Guard ready ({(time.monotonic() - started) * 1000:.0f} ms)")
+
+    async def _prepare_http(self, http_pool):
+        # DNS, TCP and TLS to the LLM and TTS hosts happen now rather than on the first turn
+        answered = await http_pool.warm()
+        print(f"HTTP pool warmed ({answered} connections, HTTP/2 {'on' if http_pool.http2 else 'off'})")
+        http_pool.start()
+
+    async def _prepare_calendar(self):
+        try:
+            await self.calendar_service.authenticate()
+            print("Google Calendar authenticated")
+        except Exception as e:
+            print(f"Calendar authentication failed: {e}")
+            print("  Continuing without calendar integration")
+
+        slots = await self.availability_cache.refresh()
+        print(f"Cached {len(slots)} free calendar slots")
+        self.availability_cache.start()
+
+    async def _prepare_greeting(self):
+        try:
+            # Building the client imports the SDK, which would otherwise stall the loop
+            tts_client = await asyncio.to_thread(lambda: self.tts_client)
+        except Exception as e:
+            print(f"ElevenLabs client setup failed: {e}")
+            return
+        greeter = ElevenLabsTTSService(client=tts_client, cache=self.tts_cache)
+        # Lands in the shared TTS cache, so every call's greeting plays without synthesis
+        if await greeter.generate_greeting(config.GREETING_TEXT):
+            print("Greeting audio cached")
+        else:
+            print("Greeting synthesis failed; it will be synthesized on the first call")
+
+    async def _prepare_llm(self):
+        try:
+            await asyncio.to_thread(lambda: self.llm_client)
+        except Exception as e:
+            print(f"OpenAI client setup failed: {e}")
+
+    async def _prepare_audio(self):
+        # PortAudio initialisation enumerates devices, which can take a while
+        try:
+            await asyncio.to_thread(self._get_pyaudio)
+        except Exception as e:
+            print(f"Audio setup failed: {e}")
+
+    @property
+    def http_pool(self):
+        if self._http_pool is None:
+            from src.voiceai.services.http_pool import HttpPool
+            self._http_pool = HttpPool()
+        return self._http_pool
+
+    @property
+    def llm_client(self):
+        if self._llm_client is None:
+            from openai import AsyncOpenAI
+            self._llm_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY, http_client=self.http_pool.client)
+        return self._llm_client
+
+    @property
+    def tts_client(self):
+        if self._tts_client is None:
+            from elevenlabs.client import AsyncElevenLabs
+            # Without an explicit timeout the SDK disables every timeout on a custom httpx client
+            self._tts_client = AsyncElevenLabs(api_key=config.ELEVENLABS_API_KEY, httpx_client=self.http_pool.client,
+                                               timeout=config.HTTP_TIMEOUT_SECONDS)
+        return self._tts_client
+
+    def _build_session(self, session_id, caller=None, audio_source=None, audio_sink=None):
+        return CallSession(
+            session_id,
+            self.calendar_service,
+            availability_cache=self.availability_cache,
+            llm_client=self.llm_client,
+            tts_client=self.tts_client,
+            tts_cache=self.tts_cache,
+            response_cache=self.response_cache,
+            pyaudio_instance=self._get_pyaudio() if audio_source is None else None,
+            call_store=self.call_store,
+            caller=caller,
+            tracer=self.tracer,
+            audio_handler=audio_source,
+            player=audio_sink
+        )
+
+    def _get_pyaudio(self):
+        if self.pyaudio_instance is None:
+            import pyaudio
+            self.pyaudio_instance = pyaudio.PyAudio()
+        return self.pyaudio_instance
+
+    def start_call(self, session_id=None, caller=None, audio_source=None, audio_sink=None):
+        """Start a new call in the background and return its session id.
+
+        Without audio_source and audio_sink the call uses the local microphone
+        and speakers, which only one call can hold at a time.
+        """
+        active = [s for s in self.sessions.values() if s.state != "ended"]
+        if len(active) >= self.max_calls:
+            raise RuntimeError(f"Already handling {len(active)} calls (limit {self.max_calls})")
+
+        uses_local_audio = audio_source is None or audio_sink is None
+        local_call = self.sessions.get(self._local_audio_call)
+        if uses_local_audio and local_call is not None and local_call.state != "ended":
+            raise RuntimeError(f"Call {self._local_audio_call} is already using the local microphone and speakers")
+
+        session_id = session_id or uuid.uuid4().hex[:8]
+        if session_id in self.sessions:
+            raise ValueError(f"Call {session_id} already exists")
+
+        session = self._build_session(session_id, caller, audio_source, audio_sink)
+        if uses_local_audio:
+            self._local_audio_call = session_id
+        self.sessions[session_id] = session
+        self._tasks[session_id] = asyncio.create_task(self._run_session(session))
+        return session_id
+
+    async def _run_session(self, session):
+        try:
+            await session.run()
+        except Exception as e:
+            print(f"[{session.session_id}] Call error: {e}")
+
+    async def stop_call(self, session_id):
+        """Ask a call to end and wait until its summary has been produced."""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return False
+
+        session.stop()
+        await self.wait_for_call(session_id)
+        return True
+
+    async def wait_for_call(self, session_id):
+        task = self._tasks.get(session_id)
+        if task is not None:
+            await task
+
+    def list_calls(self):
+        return [session.get_info() for session in self.sessions.values()]
+
+    def get_stats(self):
+        stats = {
+            "tts_cache": self.tts_cache.get_stats(),
+            "availability_cache": self.availability_cache.get_stats(),
+        }
+        if self.response_cache is not None:
+            stats["response_cache"] = self.response_cache.get_stats()
+        if self.call_store is not None:
+            stats["call_store"] = self.call_store.get_stats()
+        if self._http_pool is not None:
+            stats["http_pool"] = self._http_pool.get_stats()
+        stats["latency"] = self.tracer.report()
+        return stats
+
+    def remove_ended_calls(self):
+        for session_id in [sid for sid, s in self.sessions.items() if s.state == "ended"]:
+            self.sessions.pop(session_id)
+            self._tasks.pop(session_id, None)
+            if self._local_audio_call == session_id:
+                self._local_audio_call = None
+
+    async def shutdown(self):
+        for session in self.sessions.values():
+            session.stop()
+
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        await self.availability_cache.stop()
+        self.calendar_service.close()
+        if self.call_store is not None:
+            # Let the writer finish the last batch without blocking the loop
+            await asyncio.to_thread(self.call_store.close)
+        self.tracer.close()
+        if self._http_pool is not None:
+            await self._http_pool.aclose()
+
+        if self.pyaudio_instance is not None:
+            self.pyaudio_instance.terminate()
+            self.pyaudio_instance = None
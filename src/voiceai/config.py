@@ -8,25 +8,124 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 
 USER_NAME = os.getenv("USER_NAME", "the user")
+GREETING_TEXT = f"Hello, you've reached {USER_NAME}'s AI assistant. How can I help you?"
+
+MAX_CONCURRENT_CALLS = int(os.getenv("MAX_CONCURRENT_CALLS", "8"))
 
 AUDIO_SAMPLE_RATE = 16000
 AUDIO_CHANNELS = 1
 AUDIO_CHUNK_SIZE = 1024
 AUDIO_FORMAT = "int16"
+AUDIO_CAPTURE_MODE = os.getenv("AUDIO_CAPTURE_MODE", "callback")
+AUDIO_RING_BUFFER_SECONDS = 2
+AUDIO_POOL_FRAME_MS = 60
+AUDIO_FRAME_POOL_SIZE = 128
 
 VAD_AGGRESSIVENESS = 2
 VAD_FRAME_DURATION_MS = 20
+VAD_GATE_ENABLED = os.getenv("VAD_GATE_ENABLED", "true").lower() == "true"
+# Barge-in runs VAD on the raw microphone while the agent talks. There is no echo cancellation,
+# so on open speakers the agent's own voice interrupts it; enable only with a headset or AEC.
+BARGE_IN_ENABLED = os.getenv("BARGE_IN_ENABLED", "false").lower() == "true"
+BARGE_IN_MIN_SPEECH_MS = 200
+VAD_PREROLL_MS = 300
+# Must cover the trailing silence AssemblyAI needs to detect end of turn
+VAD_HANGOVER_MS = 1000
+VAD_KEEPALIVE_INTERVAL_MS = 1000
+VAD_KEEPALIVE_MS = 100
 
 ASSEMBLYAI_LANGUAGE = "en_us"
+# Universal Streaming endpoint; the replay harness points sessions at a local stand-in
+ASSEMBLYAI_STREAMING_URL = os.getenv("ASSEMBLYAI_STREAMING_URL", "wss://streaming.assemblyai.com/v3/ws")
 
 OPENAI_MODEL = "gpt-4o"
 OPENAI_TEMPERATURE = 0.7
+SPAM_FASTPATH_ENABLED = os.getenv("SPAM_FASTPATH_ENABLED", "true").lower() == "true"
+SPAM_DECLINE_THRESHOLD = 0.9
+SPAM_HINT_THRESHOLD = 0.3
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = 2000
+RESPONSE_CACHE_TTL_SECONDS = 24 * 3600
+RESPONSE_CACHE_MAX_DISTANCE = 7
+RESPONSE_CACHE_MIN_WORDS = 6
+# Only scripted spam replies are reused; legitimate callers always get a fresh answer
+RESPONSE_CACHE_INTENTS = ("spam",)
+RESPONSE_CACHE_ACTIONS = ("continue", "decline", "end_call")
+
+LLM_HISTORY_TOKEN_BUDGET = 1200
+LLM_HISTORY_KEEP_TURNS = 3
+LLM_HISTORY_MAX_NOTE_LINES = 12
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() == "true"
+SPECULATION_ENABLED = os.getenv("SPECULATION_ENABLED", "true").lower() == "true"
+SPECULATION_STABLE_MS = 300
+# Re-summarize the whole transcript with the LLM at hang-up instead of using the rolling summary
+LLM_CALL_SUMMARY = os.getenv("LLM_CALL_SUMMARY", "false").lower() == "true"
 
 ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
 ELEVENLABS_MODEL_ID = "eleven_turbo_v2"
 
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(".cache", "tts"))
+TTS_CACHE_MEMORY_MB = 64
+# Files beyond this are deleted least recently used first
+TTS_CACHE_DISK_MB = 256
+
+# One pooled HTTP client shared by the OpenAI and ElevenLabs SDKs
+HTTP_MAX_CONNECTIONS = 32
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 16
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 120
+HTTP_CONNECT_TIMEOUT_SECONDS = 5
+HTTP_TIMEOUT_SECONDS = 60
+# Used only when the h2 package is installed (pip install "httpx[http2]")
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_WARM_URLS = ("https://api.openai.com/v1/models", "https://api.elevenlabs.io/v1/models")
+# Connections opened per host at startup (one is enough over HTTP/2)
+HTTP_WARM_CONNECTIONS = 2
+# Re-warm the pool this often so connections survive the gaps between calls. Each ping is an
+# unauthenticated HEAD request to every HTTP_WARM_URLS host, so it is off (0) unless set.
+HTTP_KEEPALIVE_PING_SECONDS = float(os.getenv("HTTP_KEEPALIVE_PING_SECONDS", "0"))
+
+PLAYBACK_SAMPLE_RATE = 16000
+PLAYBACK_BLOCK_SIZE = 320
+PLAYBACK_PREBUFFER_MS = 200
+PLAYBACK_MAX_BUFFER_MS = 5000
+
+# Business hours and offered slots are in the calendar's zone, not the host's, so they
+# follow its DST changes and match the zone events are created in
+CALENDAR_TIMEZONE = os.getenv("CALENDAR_TIMEZONE", "America/New_York")
+BUSINESS_HOURS_START = 9
+BUSINESS_HOURS_END = 17
+SCHEDULE_WEEKENDS = False
+SLOT_GRANULARITY_MINUTES = 30
+SLOT_SEARCH_MAX_RESULTS = 10
+CALENDAR_MAX_WORKERS = 4
+CALENDAR_CACHE_TTL_SECONDS = 300
+CALENDAR_REFRESH_INTERVAL_SECONDS = 120
+
 RECONNECT_MAX_RETRIES = 3
 RECONNECT_BASE_DELAY = 1
+# Caller audio held while the STT connection is down, replayed once it is back
+STT_REPLAY_BUFFER_SECONDS = 5
+# Uplink messages to STT: fixed-size frames, with at most this much audio queued
+UPLINK_FRAME_MS = 50
+UPLINK_MAX_QUEUE_MS = 1000
+
+CALL_STORE_ENABLED = os.getenv("CALL_STORE_ENABLED", "true").lower() == "true"
+CALL_STORE_PATH = os.getenv("CALL_STORE_PATH", os.path.join("data", "calls.db"))
+CALL_STORE_BATCH_SIZE = 200
+CALL_STORE_FLUSH_SECONDS = 0.5
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+# "memory" keeps recent records in a ring, "jsonl" appends them to TRACE_FILE, "none" only keeps the stats
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "memory")
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join("data", "traces.jsonl"))
+TRACE_MEMORY_RECORDS = 10000
+TRACE_MAX_SAMPLES = 5000
+
+# Offline replay harness (python -m src.voiceai.replay)
+REPLAY_CASSETTE_DIR = os.getenv("REPLAY_CASSETTE_DIR", os.path.join("data", "cassettes"))
+REPLAY_GAP_MS = 1000
+REPLAY_TAIL_MS = 2500
 
 SILENCE_TIMEOUT_SECONDS = 30
 
@@ -0,0 +1,39 @@
+"""Replay a call offline from WAV files and a cassette.
+
+    python -m src.voiceai.replay caller.wav --record            # record real vendor responses
+    python -m src.voiceai.replay caller.wav                     # replay them as fast as possible
+    python -m src.voiceai.replay caller.wav --realtime          # replay at wall-clock speed
+"""
+import argparse
+import asyncio
+import os
+import sys
+from src.voiceai.replay.harness import ReplayHarness, print_report
+from src.voiceai import config
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wav", nargs="+", help="caller audio, 16-bit mono 16 kHz; several files play back to back")
+    parser.add_argument("--cassette", help="cassette file (default: <first wav name>.json in REPLAY_CASSETTE_DIR)")
+    parser.add_argument("--record", action="store_true", help="call the real services and write the cassette")
+    parser.add_argument("--realtime", action="store_true", help="replay at wall-clock speed")
+    args = parser.parse_args(argv)
+
+    cassette = args.cassette
+    if cassette is None:
+        name = os.path.splitext(os.path.basename(args.wav[0]))[0]
+        cassette = os.path.join(config.REPLAY_CASSETTE_DIR, f"{name}.json")
+    if not args.record and not os.path.exists(cassette):
+        print(f"No cassette at {cassette}; run with --record first")
+        return 2
+
+    harness = ReplayHarness(args.wav, cassette, record=args.record, realtime=args.realtime)
+    report = asyncio.run(harness.run())
+    print_report(report)
+    if args.record:
+        print(f"Cassette saved to {cassette}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
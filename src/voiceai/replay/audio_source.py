@@ -0,0 +1,130 @@
+import asyncio
+import time
+import wave
+import webrtcvad
+from voiceai import config
+from voiceai.services.frame_pool import FramePool
+
+def read_wav(path, sample_rate=None):
+    """Return the PCM frames of a 16-bit mono WAV file at the call sample rate."""
+    sample_rate = sample_rate or config.AUDIO_SAMPLE_RATE
+    with wave.open(path, "rb") as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getframerate() != sample_rate:
+            raise ValueError(
+                f"{path}: expected 16-bit mono {sample_rate} Hz audio, got {wav.getsampwidth() * 8}-bit "
+                f"{wav.getnchannels()}-channel {wav.getframerate()} Hz"
+            )
+        return wav.readframes(wav.getnframes())
+
+
+class WavAudioSource:
+    """Feeds caller audio from WAV files through AudioHandler's interface.
+
+    The files are played back to back with ``gap_ms`` of silence between
+    them and ``tail_ms`` after the last, so STT can close the final turn.
+    With ``realtime`` each frame is released when it would have finished
+    being captured; otherwise frames are produced as fast as the consumer
+    takes them. ``finished`` is set once all the audio has been delivered.
+    """
+
+    def __init__(self, paths, realtime=True, gap_ms=None, tail_ms=None):
+        self.sample_rate = config.AUDIO_SAMPLE_RATE
+        self.channels = 1
+        self.realtime = realtime
+        self.vad = webrtcvad.Vad(config.VAD_AGGRESSIVENESS)
+        self.frame_duration_ms = config.VAD_FRAME_DURATION_MS
+        self.frame_size = int(self.sample_rate * self.frame_duration_ms / 1000)
+        self.use_callback = config.AUDIO_CAPTURE_MODE == "callback"
+        self.chunk_bytes = config.AUDIO_CHUNK_SIZE * 2
+        self.bytes_per_second = self.sample_rate * 2
+
+        vad_frames_per_pool_frame = max(1, config.AUDIO_POOL_FRAME_MS // self.frame_duration_ms)
+        self.pool_frame_bytes = self.frame_size * vad_frames_per_pool_frame * 2
+        self.frame_pool = FramePool(self.pool_frame_bytes, config.AUDIO_FRAME_POOL_SIZE)
+
+        gap = bytes(self._ms_to_bytes(config.REPLAY_GAP_MS if gap_ms is None else gap_ms))
+        tail = bytes(self._ms_to_bytes(config.REPLAY_TAIL_MS if tail_ms is None else tail_ms))
+        self.audio = gap.join(read_wav(path, self.sample_rate) for path in paths) + tail
+
+        self.position = 0
+        self.is_recording = False
+        self.started = None
+        self.finished = asyncio.Event()
+
+    def _ms_to_bytes(self, ms):
+        return self.sample_rate * 2 * ms // 1000
+
+    @property
+    def duration_ms(self):
+        return len(self.audio) * 1000 // self.bytes_per_second
+
+    @property
+    def position_ms(self):
+        """How much of the recording has been handed to the session."""
+        return self.position * 1000 // self.bytes_per_second
+
+    def start_recording(self):
+        self.is_recording = True
+        self.started = time.monotonic()
+        return True
+
+    def _captured_bytes(self):
+        """How much audio a live microphone would have delivered by now."""
+        if not self.realtime:
+            return len(self.audio)
+        return int((time.monotonic() - self.started) * self.bytes_per_second)
+
+    def _take(self, size):
+        chunk = self.audio[self.position:self.position + size]
+        self.position += len(chunk)
+        if self.position >= len(self.audio):
+            self.finished.set()
+        return chunk
+
+    async def iter_frames(self):
+        """Yield pooled AudioFrames; the caller releases each one."""
+        frame_bytes = self.pool_frame_bytes
+
+        while self.is_recording and self.position < len(self.audio):
+            if self.realtime:
+                due = self.started + (self.position + frame_bytes) / self.bytes_per_second
+                await asyncio.sleep(max(0.0, due - time.monotonic()))
+            else:
+                await asyncio.sleep(0)
+            if not self.is_recording:
+                break
+
+            chunk = self._take(frame_bytes)
+            frame = self.frame_pool.acquire()
+            frame.view[:len(chunk)] = chunk
+            # The last frame of the recording is padded with silence
+            frame.view[len(chunk):] = bytes(frame_bytes - len(chunk))
+            yield frame
+
+    def read_audio_chunk(self):
+        if not self.is_recording or self.position >= len(self.audio):
+            return None
+        if self._captured_bytes() < min(self.position + self.chunk_bytes, len(self.audio)):
+            return None
+        return self._take(self.chunk_bytes)
+
+    def apply_vad(self, audio_data):
+        if len(audio_data) != self.frame_size * 2:
+            return False
+        try:
+            return self.vad.is_speech(audio_data, self.sample_rate)
+        except Exception:
+            return False
+
+    def get_capture_stats(self):
+        return {
+            "position_ms": self.position * 1000 // self.bytes_per_second,
+            "duration_ms": self.duration_ms,
+            "frame_pool": self.frame_pool.get_stats(),
+        }
+
+    def stop_recording(self):
+        self.is_recording = False
+
+    def cleanup(self):
+        self.stop_recording()
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+from voiceai.services.calendar_service import GoogleCalendarService
+from voiceai.services.slot_finder import SlotFinder, calendar_zone
+
+class OfflineCalendar:
+    """In-memory calendar with AsyncCalendarService's interface, for replays.
+
+    Business hours are free apart from the events booked during the replay.
+    """
+
+    format_time_slots = GoogleCalendarService.format_time_slots
+
+    def __init__(self):
+        self.events = []
+
+    async def authenticate(self):
+        return True
+
+    async def get_free_slots(self, days_ahead: int = 3, slot_duration_minutes: int = 30, fallback: bool = True):
+        start = datetime.now(calendar_zone())
+        finder = SlotFinder(slot_minutes=slot_duration_minutes)
+        return finder.find(start, start + timedelta(days=days_ahead), list(self.events))
+
+    async def create_event(self, start_time, caller_purpose, caller_info=""):
+        start = start_time if start_time.tzinfo else start_time.replace(tzinfo=calendar_zone())
+        self.events.append((start, start + timedelta(minutes=30)))
+        return f"offline://events/{len(self.events)}"
+
+    def close(self):
+        pass
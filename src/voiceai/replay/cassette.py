@@ -0,0 +1,90 @@
+import base64
+import json
+import os
+from datetime import datetime
+
+CASSETTE_VERSION = 1
+
+class Cassette:
+    """Recorded vendor responses for one call, stored as JSON.
+
+    ``stt`` holds the transcript messages in the order they arrived, each
+    tagged with how much caller audio had been sent to STT at that point
+    (``audio_ms``) and how far into the caller's recording the call was
+    (``caller_ms``, absent in older cassettes). ``llm``
+    and ``tts`` map a request (the caller's message, the text to speak) to
+    the responses it got, with their timing, so a replay can reproduce both
+    what was said and how long it took. Requests seen more than once are
+    answered in recorded order, repeating the last response when they run out.
+    """
+
+    def __init__(self, path=None, data=None):
+        self.path = path
+        data = data or {}
+        self.created = data.get("created") or datetime.now().isoformat(timespec="seconds")
+        self.stt = list(data.get("stt", []))
+        self.llm = {key: list(entries) for key, entries in data.get("llm", {}).items()}
+        self.tts = {key: list(entries) for key, entries in data.get("tts", {}).items()}
+        self._cursors = {}
+        self.misses = {"llm": 0, "tts": 0}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {data.get('version')!r} in {path}")
+        return cls(path, data)
+
+    def save(self, path=None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CASSETTE_VERSION,
+                "created": self.created,
+                "stt": self.stt,
+                "llm": self.llm,
+                "tts": self.tts,
+            }, f, indent=1)
+        self.path = path
+
+    def add_stt(self, audio_ms, transcript, end_of_turn, caller_ms=None):
+        event = {"audio_ms": audio_ms, "transcript": transcript, "end_of_turn": end_of_turn}
+        if caller_ms is not None:
+            event["caller_ms"] = caller_ms
+        self.stt.append(event)
+
+    def add_llm(self, key, content, first_token_ms, total_ms):
+        self.llm.setdefault(key, []).append({
+            "content": content,
+            "first_token_ms": round(first_token_ms, 1),
+            "total_ms": round(total_ms, 1),
+        })
+
+    def add_tts(self, text, audio, first_byte_ms, total_ms):
+        self.tts.setdefault(text, []).append({
+            "audio": base64.b64encode(audio).decode("ascii"),
+            "first_byte_ms": round(first_byte_ms, 1),
+            "total_ms": round(total_ms, 1),
+        })
+
+    def _next(self, kind, key):
+        entries = getattr(self, kind).get(key)
+        if not entries:
+            self.misses[kind] += 1
+            return None
+        index = self._cursors.get((kind, key), 0)
+        self._cursors[(kind, key)] = index + 1
+        return entries[min(index, len(entries) - 1)]
+
+    def next_llm(self, key):
+        return self._next("llm", key)
+
+    def next_tts(self, text):
+        entry = self._next("tts", text)
+        if entry is None:
+            return None
+        return dict(entry, audio=base64.b64decode(entry["audio"]))
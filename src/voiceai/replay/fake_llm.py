@@ -0,0 +1,92 @@
+import re
+import time
+from types import SimpleNamespace
+from voiceai.replay.pacing import Pacer, spread
+
+def request_key(messages):
+    """Cassette key for a chat request: the last user message."""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content") or ""
+    return ""
+
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+def _pieces(content):
+    # Roughly token-sized: a word and the whitespace after it
+    return re.findall(r"\S+\s*|\s+", content) or [content]
+
+
+class FakeOpenAI:
+    """Stand-in for AsyncOpenAI that answers chat completions from a cassette.
+
+    Only ``chat.completions.create`` is provided, streaming or not. With
+    ``realtime`` the recorded time to first token and total time are
+    reproduced; otherwise responses come back immediately. Requests with no
+    recorded response raise, which the engine handles like an API error.
+    """
+
+    def __init__(self, cassette, realtime=False):
+        self.cassette = cassette
+        self.pacer = Pacer(realtime)
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, messages, stream=False, **kwargs):
+        self.requests += 1
+        started = self.pacer.clock()
+        key = request_key(messages)
+        entry = self.cassette.next_llm(key)
+        if entry is None:
+            raise LookupError(f"No recorded LLM response for {key[:60]!r}")
+
+        if not stream:
+            await self.pacer.wait_until(started, entry["total_ms"])
+            return _completion(entry["content"])
+        return self._stream(entry, started)
+
+    async def _stream(self, entry, started):
+        pieces = _pieces(entry["content"])
+        for piece, offset_ms in zip(pieces, spread(len(pieces), entry["first_token_ms"], entry["total_ms"])):
+            await self.pacer.wait_until(started, offset_ms)
+            yield _chunk(piece)
+
+
+class RecordingOpenAI:
+    """Wraps a real AsyncOpenAI client and records each chat completion into a cassette."""
+
+    def __init__(self, client, cassette):
+        self.client = client
+        self.cassette = cassette
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, messages, stream=False, **kwargs):
+        started = time.monotonic()
+        key = request_key(messages)
+        response = await self.client.chat.completions.create(messages=messages, stream=stream, **kwargs)
+
+        if not stream:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self.cassette.add_llm(key, response.choices[0].message.content, elapsed_ms, elapsed_ms)
+            return response
+        return self._record_stream(key, response, started)
+
+    async def _record_stream(self, key, stream, started):
+        parts = []
+        first_token_ms = None
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if first_token_ms is None:
+                    first_token_ms = (time.monotonic() - started) * 1000
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+
+        total_ms = (time.monotonic() - started) * 1000
+        self.cassette.add_llm(key, "".join(parts), first_token_ms or total_ms, total_ms)
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import time
+import uuid
+import websockets
+from voiceai import config
+from voiceai.services.stt_service import AssemblyAISTTService
+
+def _bytes_per_ms(sample_rate=None):
+    return (sample_rate or config.AUDIO_SAMPLE_RATE) * 2 // 1000
+
+
+class FakeAssemblyAIServer:
+    """Local WebSocket server speaking the AssemblyAI Universal Streaming (v3) protocol.
+
+    Sends ``Begin`` on connect, then replays recorded ``Turn`` messages as the
+    caller's audio arrives: each one goes out once the server has received
+    as much audio as had been sent when it was recorded. Transcripts are
+    therefore tied to the audio timeline, not the wall clock, and come out
+    the same whether audio is streamed in real time or as fast as possible.
+    Replies ``Termination`` to a ``Terminate`` message.
+
+    How much audio the session sends depends on how long the greeting held
+    it back, which differs between paces. Given ``caller_clock`` (ms into the
+    caller's recording), events that carry ``caller_ms`` are released by
+    that instead, so turn boundaries land where they did when recording.
+    """
+
+    def __init__(self, events, host="127.0.0.1", port=0, sample_rate=None, caller_clock=None):
+        self.events = list(events)
+        self.caller_clock = caller_clock
+        self.host = host
+        self.port = port
+        self.sample_rate = sample_rate or config.AUDIO_SAMPLE_RATE
+        self._server = None
+        self._next = 0
+        self._turn_order = 0
+
+        self.connections = 0
+        self.bytes_received = 0
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/v3/ws"
+
+    @property
+    def audio_ms(self):
+        return self.bytes_received // _bytes_per_ms(self.sample_rate)
+
+    @property
+    def pending(self):
+        """Recorded messages not sent yet."""
+        return len(self.events) - self._next
+
+    async def start(self):
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, websocket, path=None):
+        self.connections += 1
+        await websocket.send(json.dumps({
+            "type": "Begin",
+            "id": uuid.uuid4().hex,
+            "expires_at": int(time.time()) + 3600,
+        }))
+        # Caller time also advances while the session holds audio back, so check it on a timer too
+        ticker = asyncio.create_task(self._tick(websocket)) if self.caller_clock is not None else None
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    self.bytes_received += len(message)
+                    await self._send_due(websocket)
+                    continue
+
+                if json.loads(message).get("type") == "Terminate":
+                    await websocket.send(json.dumps({
+                        "type": "Termination",
+                        "audio_duration_seconds": self.audio_ms / 1000,
+                    }))
+                    break
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            if ticker is not None:
+                ticker.cancel()
+
+    async def _tick(self, websocket):
+        try:
+            while self.pending:
+                await asyncio.sleep(0.02)
+                await self._send_due(websocket)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    def _due(self, event):
+        if self.caller_clock is not None and "caller_ms" in event:
+            return event["caller_ms"] <= self.caller_clock()
+        return event["audio_ms"] <= self.audio_ms
+
+    async def _send_due(self, websocket):
+        while self._next < len(self.events) and self._due(self.events[self._next]):
+            event = self.events[self._next]
+            self._next += 1
+            await websocket.send(json.dumps({
+                "type": "Turn",
+                "turn_order": self._turn_order,
+                "turn_is_formatted": event["end_of_turn"],
+                "end_of_turn": event["end_of_turn"],
+                "end_of_turn_confidence": 1.0 if event["end_of_turn"] else 0.0,
+                "transcript": event["transcript"],
+                "words": [],
+            }))
+            if event["end_of_turn"]:
+                self._turn_order += 1
+
+
+class RecordingSTTService(AssemblyAISTTService):
+    """AssemblyAISTTService that records every transcript, and the audio sent before it, into a cassette."""
+
+    def __init__(self, on_transcript_callback, cassette, caller_clock=None):
+        super().__init__(self._record)
+        self._forward = on_transcript_callback
+        self.cassette = cassette
+        self.caller_clock = caller_clock
+        self.bytes_sent = 0
+
+    async def _send(self, audio_data):
+        if self.websocket and self.is_connected:
+            self.bytes_sent += len(audio_data)
+        await super()._send(audio_data)
+
+    async def _replay(self):
+        self.bytes_sent += len(self.replay_buffer)
+        await super()._replay()
+
+    async def _record(self, transcript, is_final):
+        caller_ms = self.caller_clock() if self.caller_clock is not None else None
+        self.cassette.add_stt(self.bytes_sent // _bytes_per_ms(), transcript, is_final, caller_ms)
+        result = self._forward(transcript, is_final)
+        if asyncio.iscoroutine(result):
+            await result
@@ -0,0 +1,63 @@
+import time
+from types import SimpleNamespace
+from voiceai import config
+from voiceai.replay.pacing import Pacer, spread
+
+CHUNK_BYTES = 4096
+# Used to size the silence returned for text that was never recorded
+FALLBACK_MS_PER_CHAR = 60
+
+
+class FakeElevenLabs:
+    """Stand-in for AsyncElevenLabs that streams recorded speech from a cassette.
+
+    Only ``text_to_speech.convert_as_stream`` is provided. Text that was not
+    recorded (e.g. a greeting with a different user name) gets silence of a
+    plausible length, so the call can carry on; such misses are counted on
+    the cassette.
+    """
+
+    def __init__(self, cassette, realtime=False):
+        self.cassette = cassette
+        self.pacer = Pacer(realtime)
+        self.requests = 0
+        self.text_to_speech = SimpleNamespace(convert_as_stream=self._convert_as_stream)
+
+    async def _convert_as_stream(self, text, **kwargs):
+        self.requests += 1
+        started = self.pacer.clock()
+        entry = self.cassette.next_tts(text)
+        if entry is None:
+            duration_ms = min(len(text) * FALLBACK_MS_PER_CHAR, 10000)
+            audio = bytes(config.AUDIO_SAMPLE_RATE * 2 * duration_ms // 1000)
+            entry = {"audio": audio, "first_byte_ms": 0, "total_ms": 0}
+
+        audio = entry["audio"]
+        chunks = [audio[i:i + CHUNK_BYTES] for i in range(0, len(audio), CHUNK_BYTES)]
+        for chunk, offset_ms in zip(chunks, spread(len(chunks), entry["first_byte_ms"], entry["total_ms"])):
+            await self.pacer.wait_until(started, offset_ms)
+            yield chunk
+
+
+class RecordingElevenLabs:
+    """Wraps a real AsyncElevenLabs client and records each synthesis into a cassette."""
+
+    def __init__(self, client, cassette):
+        self.client = client
+        self.cassette = cassette
+        self.text_to_speech = SimpleNamespace(convert_as_stream=self._convert_as_stream)
+
+    async def _convert_as_stream(self, text, **kwargs):
+        started = time.monotonic()
+        first_byte_ms = None
+        chunks = []
+        async for chunk in self.client.text_to_speech.convert_as_stream(text=text, **kwargs):
+            if chunk:
+                if first_byte_ms is None:
+                    first_byte_ms = (time.monotonic() - started) * 1000
+                chunks.append(chunk)
+            yield chunk
+
+        total_ms = (time.monotonic() - started) * 1000
+        if chunks:
+            self.cassette.add_tts(text, b"".join(chunks), first_byte_ms, total_ms)
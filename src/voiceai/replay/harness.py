@@ -0,0 +1,174 @@
+import asyncio
+import sys
+import tempfile
+import time
+from src.voiceai.session import CallSession
+from src.voiceai.services.stt_service import AssemblyAISTTService
+from src.voiceai.services.tracing import InMemoryExporter, Tracer
+from src.voiceai.services.tts_cache import TTSCache
+from src.voiceai.replay.audio_source import WavAudioSource
+from src.voiceai.replay.calendar import OfflineCalendar
+from src.voiceai.replay.cassette import Cassette
+from src.voiceai.replay.fake_llm import FakeOpenAI, RecordingOpenAI
+from src.voiceai.replay.fake_stt import FakeAssemblyAIServer, RecordingSTTService
+from src.voiceai.replay.fake_tts import FakeElevenLabs, RecordingElevenLabs
+from src.voiceai.replay.player import ReplayPlayer
+from src.voiceai import config
+
+# Once the audio is over, stop waiting for recorded transcripts after this long without progress
+STALL_SECONDS = 1.0
+
+
+class _TurnTracker:
+    """Wraps the session's transcript callback to know when a turn is being handled."""
+
+    def __init__(self):
+        self.active = 0
+        self.turns = 0
+
+    def wrap(self, callback):
+        async def on_transcript(transcript, is_final):
+            if not is_final:
+                return await callback(transcript, is_final)
+            self.active += 1
+            self.turns += 1
+            try:
+                return await callback(transcript, is_final)
+            finally:
+                self.active -= 1
+        return on_transcript
+
+
+class ReplayHarness:
+    """Runs one CallSession offline against recorded or recording vendor stand-ins.
+
+    Caller audio comes from WAV files and the agent's speech goes to a
+    ReplayPlayer. In replay mode STT is a local AssemblyAI-compatible server
+    and the OpenAI and ElevenLabs clients are fakes, all fed from a cassette;
+    no keys or network are needed. In record mode the real services are used
+    (always in real time) and their responses are written to the cassette.
+
+    Latency per stage comes from the session's tracer, as in a live call.
+    """
+
+    def __init__(self, wav_paths, cassette_path, record=False, realtime=False):
+        self.wav_paths = list(wav_paths)
+        self.cassette_path = cassette_path
+        self.record = record
+        self.realtime = realtime or record
+        self.cassette = Cassette(cassette_path) if record else Cassette.load(cassette_path)
+        self.tracer = Tracer(exporter=InMemoryExporter())
+        self.tracker = _TurnTracker()
+        self.server = None
+        self.session = None
+        self.source = None
+
+    def _caller_ms(self):
+        return self.source.position_ms
+
+    def _clients(self):
+        if self.record:
+            # The real SDKs are only needed to record, so replays run without them installed
+            from openai import AsyncOpenAI
+            from elevenlabs.client import AsyncElevenLabs
+            return (RecordingOpenAI(AsyncOpenAI(api_key=config.OPENAI_API_KEY), self.cassette),
+                    RecordingElevenLabs(AsyncElevenLabs(api_key=config.ELEVENLABS_API_KEY), self.cassette))
+        return FakeOpenAI(self.cassette, self.realtime), FakeElevenLabs(self.cassette, self.realtime)
+
+    def _stt_factory(self, on_transcript):
+        on_transcript = self.tracker.wrap(on_transcript)
+        if self.record:
+            return RecordingSTTService(on_transcript, self.cassette, caller_clock=self._caller_ms)
+
+        stt = AssemblyAISTTService(on_transcript)
+        stt.url = self.server.url
+        if not self.realtime:
+            # Audio arrives far faster than real time; dropping any would shift the transcript timeline
+            stt.uplink.max_queue_frames = sys.maxsize
+        return stt
+
+    async def run(self):
+        """Replay the call and return a report with timings, latency and the call summary."""
+        source = self.source = WavAudioSource(self.wav_paths, realtime=self.realtime)
+        if not self.record:
+            self.server = FakeAssemblyAIServer(self.cassette.stt, caller_clock=self._caller_ms)
+            await self.server.start()
+
+        player = ReplayPlayer(sample_rate=16000, realtime=self.realtime, tracer=self.tracer)
+        llm_client, tts_client = self._clients()
+
+        try:
+            with tempfile.TemporaryDirectory(prefix="replay-tts-") as cache_dir:
+                self.session = CallSession(
+                    "replay",
+                    OfflineCalendar(),
+                    llm_client=llm_client,
+                    tts_client=tts_client,
+                    # A fresh cache, so every utterance goes through the TTS stand-in
+                    tts_cache=TTSCache(cache_dir=cache_dir),
+                    audio_handler=source,
+                    stt_factory=self._stt_factory,
+                    player=player,
+                    tracer=self.tracer
+                )
+                started = time.monotonic()
+                task = asyncio.create_task(self.session.run())
+                await self._hang_up_when_done(task, source, player)
+                await task
+                wall_ms = (time.monotonic() - started) * 1000
+        finally:
+            if self.server is not None:
+                await self.server.stop()
+
+        if self.record:
+            self.cassette.save()
+
+        return {
+            "mode": "record" if self.record else "replay",
+            "pace": "realtime" if self.realtime else "fast",
+            "audio_ms": source.duration_ms,
+            "wall_ms": round(wall_ms),
+            "speedup": round(source.duration_ms / wall_ms, 1) if wall_ms else 0.0,
+            "turns": self.tracker.turns,
+            "misses": dict(self.cassette.misses),
+            "latency": self.tracer.report(self.session.call_id),
+            "summary": self.session.summary,
+        }
+
+    async def _hang_up_when_done(self, task, source, player):
+        finished = asyncio.ensure_future(source.finished.wait())
+        try:
+            await asyncio.wait({task, finished}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            finished.cancel()
+
+        # The audio is over: let the remaining transcripts and the reply to them play out
+        last_audio_ms = -1
+        last_progress = time.monotonic()
+        while not task.done():
+            if self.server is not None and self.server.audio_ms != last_audio_ms:
+                last_audio_ms = self.server.audio_ms
+                last_progress = time.monotonic()
+            waiting_for_stt = (self.server is not None and self.server.pending
+                               and time.monotonic() - last_progress < STALL_SECONDS)
+
+            if not waiting_for_stt and not self.tracker.active and not player.is_playing:
+                self.session.stop()
+                break
+            await asyncio.sleep(0.05)
+
+
+def print_report(report):
+    print("\n" + "=" * 60)
+    print(f"REPLAY ({report['mode']}, {report['pace']})")
+    print("=" * 60)
+    print(f"Caller audio:   {report['audio_ms'] / 1000:.1f} s")
+    print(f"Wall time:      {report['wall_ms'] / 1000:.1f} s ({report['speedup']}x)")
+    print(f"Caller turns:   {report['turns']}")
+    if any(report["misses"].values()):
+        print(f"Cassette misses: {report['misses']['llm']} LLM, {report['misses']['tts']} TTS")
+    if report["latency"]:
+        print("Latency (ms, p50/p95/p99):")
+        for stage, stats in report["latency"].items():
+            print(f"  {stage:<26} {stats['p50']:>7} {stats['p95']:>7} {stats['p99']:>7}  (n={stats['count']})")
+    print("=" * 60)
@@ -0,0 +1,29 @@
+import asyncio
+import time
+
+def spread(count, first_ms, total_ms):
+    """Offsets in ms for count pieces: the first at first_ms, the rest evenly up to total_ms."""
+    if count <= 0:
+        return []
+    if count == 1:
+        return [first_ms]
+    step = max(0.0, total_ms - first_ms) / (count - 1)
+    return [first_ms + i * step for i in range(count)]
+
+
+class Pacer:
+    """Waits until an offset from a start time, or not at all when running fast."""
+
+    def __init__(self, realtime):
+        self.realtime = realtime
+
+    def clock(self):
+        return time.monotonic()
+
+    async def wait_until(self, started, offset_ms):
+        if not self.realtime:
+            # Still yield so other tasks see every step in order
+            await asyncio.sleep(0)
+            return
+        delay = started + offset_ms / 1000 - time.monotonic()
+        await asyncio.sleep(max(0.0, delay))
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from voiceai import config
+from voiceai.services.tracing import Tracer
+
+class ReplayPlayer:
+    """Drop-in for StreamingPlayer that plays into nothing.
+
+    With ``realtime`` written audio takes as long to "play" as it would on a
+    speaker, so ``is_playing``, ``drain`` and barge-in behave as in a live
+    call; otherwise playback finishes instantly. Playback trace events are
+    emitted the same way StreamingPlayer does.
+    """
+
+    def __init__(self, sample_rate=None, realtime=False, tracer=None):
+        self.sample_rate = sample_rate or config.PLAYBACK_SAMPLE_RATE
+        self.bytes_per_ms = self.sample_rate * 2 // 1000
+        self.realtime = realtime
+        self.tracer = tracer or Tracer(enabled=False)
+
+        self._play_until = 0.0
+        self._playing = False
+        self._generation = 0
+
+        self.bytes_played = 0
+        self.utterances = 0
+
+    def start(self):
+        return True
+
+    async def write(self, audio_data):
+        if not audio_data:
+            return
+        now = time.monotonic()
+        if not self._playing:
+            self._playing = True
+            self._play_until = now
+            self.utterances += 1
+            self.tracer.event("playback.start", once=True)
+        if self.realtime:
+            self._play_until = max(self._play_until, now) + len(audio_data) / self.bytes_per_ms / 1000
+        self.bytes_played += len(audio_data)
+        await asyncio.sleep(0)
+
+    def flush(self):
+        pass
+
+    async def drain(self):
+        generation = self._generation
+        delay = self._play_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._playing and generation == self._generation:
+            self._playing = False
+            self.tracer.event("playback.end")
+
+    def clear(self):
+        self._generation += 1
+        self._play_until = 0.0
+        self._playing = False
+
+    @property
+    def is_playing(self):
+        return self._playing and time.monotonic() < self._play_until
+
+    def get_stats(self):
+        return {
+            "buffered_ms": max(0, int((self._play_until - time.monotonic()) * 1000)),
+            "played_ms": self.bytes_played // self.bytes_per_ms,
+            "utterances": self.utterances,
+            "underruns": 0,
+            "overruns": 0,
+        }
+
+    def close(self):
+        self.clear()
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from voiceai import config
+
+
+class AsyncCalendarService:
+    """Non-blocking facade over GoogleCalendarService.
+
+    googleapiclient only offers blocking ``execute()``, so every request runs
+    on a small bounded thread pool instead of the event loop. httplib2 is not
+    thread-safe, so each worker thread gets its own authorized connection.
+    The freebusy query and the events listing go out as one batch request.
+    """
+
+    def __init__(self, calendar_service, max_workers=None):
+        self.calendar_service = calendar_service
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or config.CALENDAR_MAX_WORKERS,
+            thread_name_prefix="calendar"
+        )
+        self._local = threading.local()
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _http(self):
+        credentials = self.calendar_service.credentials
+        if credentials is None:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None or self._local.credentials is not credentials:
+            import google_auth_httplib2
+            import httplib2
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+            self._local.http = http
+            self._local.credentials = credentials
+        return http
+
+    async def authenticate(self):
+        return await self._run(self.calendar_service.authenticate)
+
+    async def get_free_slots(self, days_ahead: int = 3, slot_duration_minutes: int = 30, fallback: bool = True):
+        """Free slots from the calendar; with fallback=False an API error raises instead of returning made-up slots."""
+        return await self._run(self._get_free_slots, days_ahead, slot_duration_minutes, fallback)
+
+    def _get_free_slots(self, days_ahead, slot_duration_minutes, fallback):
+        calendar = self.calendar_service
+        try:
+            now, end_time = calendar._free_slot_window(days_ahead)
+
+            results = {}
+            def collect(request_id, response, exception):
+                results[request_id] = (response, exception)
+
+            batch = calendar.service.new_batch_http_request(callback=collect)
+            batch.add(calendar._freebusy_request(now, end_time), request_id="freebusy")
+            batch.add(calendar._events_request(now, end_time), request_id="events")
+            batch.execute(http=self._http())
+
+            freebusy_result, freebusy_error = results["freebusy"]
+            if freebusy_error is not None:
+                raise freebusy_error
+            busy_times = calendar._busy_from_freebusy(freebusy_result)
+
+            events_result, events_error = results["events"]
+            if events_error is not None:
+                print(f"Error fetching existing events: {events_error}")
+                existing_events = []
+            else:
+                existing_events = calendar._events_from_list(events_result)
+
+            free_slots = calendar._find_free_slots(
+                now, end_time, busy_times, slot_duration_minutes, existing_events
+            )
+            return free_slots[:5]
+
+        except Exception as e:
+            print(f"Calendar freebusy query error: {e}")
+            if not fallback:
+                raise
+            return calendar._get_fallback_slots()
+
+    async def create_event(self, start_time, caller_purpose, caller_info=""):
+        return await self._run(self._create_event, start_time, caller_purpose, caller_info)
+
+    def _create_event(self, start_time, caller_purpose, caller_info):
+        return self.calendar_service.create_event(
+            start_time, caller_purpose, caller_info, http=self._http()
+        )
+
+    def format_time_slots(self, slots):
+        return self.calendar_service.format_time_slots(slots)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -1,21 +1,27 @@
-import pyaudio
-import webrtcvad
-import sounddevice as sd
-import numpy as np
 import asyncio
 from collections import deque
 from voiceai import config
+from voiceai.services.ring_buffer import AudioRingBuffer
+from voiceai.services.frame_pool import AudioFrame, FramePool
 
 class AudioHandler:
     """Microphone capture, simple Voice Activity Detection, and playback helpers."""
 
-    def __init__(self):
+    def __init__(self, pyaudio_instance=None):
+        # Imported on first construction: loading PyAudio initialises PortAudio and
+        # enumerates devices, and webrtcvad pulls in pkg_resources
+        import pyaudio
+        import webrtcvad
+        
         self.sample_rate = config.AUDIO_SAMPLE_RATE
         self.channels = config.AUDIO_CHANNELS
         self.chunk_size = config.AUDIO_CHUNK_SIZE
         self.format = pyaudio.paInt16
+        self._pa_continue = pyaudio.paContinue
         
-        self.pyaudio_instance = pyaudio.PyAudio()
+        # A shared PyAudio instance is owned (and terminated) by whoever created it
+        self.owns_pyaudio = pyaudio_instance is None
+        self.pyaudio_instance = pyaudio_instance or pyaudio.PyAudio()
         self.stream = None
         self.vad = webrtcvad.Vad(config.VAD_AGGRESSIVENESS)
         
@@ -25,16 +31,42 @@ class AudioHandler:
         self.frame_duration_ms = config.VAD_FRAME_DURATION_MS
         self.frame_size = int(self.sample_rate * self.frame_duration_ms / 1000)
         
+        self.use_callback = config.AUDIO_CAPTURE_MODE == "callback"
+        self.chunk_bytes = self.chunk_size * self.channels * 2
+        self.ring_buffer = None
+        self.loop = None
+        self._data_ready = None
+        self._waiting_bytes = 0
+        
+        # Pool frames hold a whole number of VAD frames so consumers can slice without copying
+        vad_frames_per_pool_frame = max(1, config.AUDIO_POOL_FRAME_MS // self.frame_duration_ms)
+        self.pool_frame_bytes = self.frame_size * vad_frames_per_pool_frame * self.channels * 2
+        self.frame_pool = FramePool(self.pool_frame_bytes, config.AUDIO_FRAME_POOL_SIZE)
+        
     def start_recording(self):
         try:
             self.is_recording = True
+            stream_callback = None
+            
+            if self.use_callback:
+                ring_bytes = int(self.sample_rate * config.AUDIO_RING_BUFFER_SECONDS) * self.channels * 2
+                self.ring_buffer = AudioRingBuffer(ring_bytes)
+                try:
+                    self._bind_loop()
+                except RuntimeError:
+                    # Started outside a loop: iter_frames binds to its own loop on first use,
+                    # and read_audio_chunk drains the ring without one
+                    self.loop = None
+                    self._data_ready = None
+                stream_callback = self._on_audio
+            
             self.stream = self.pyaudio_instance.open(
                 format=self.format,
                 channels=self.channels,
                 rate=self.sample_rate,
                 input=True,
                 frames_per_buffer=self.chunk_size,
-                stream_callback=None
+                stream_callback=stream_callback
             )
             print(f"Audio stream created: {self.sample_rate}Hz, {self.channels} channel(s)")
             return self.stream
@@ -42,7 +74,55 @@ class AudioHandler:
             print(f"Failed to create audio stream: {e}")
             return None
     
+    def _bind_loop(self):
+        # Called from the consumer's loop; the callback wakes that loop when a frame is ready
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop or self._data_ready is None:
+            self._data_ready = asyncio.Event()
+            self.loop = loop
+    
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: runs on the audio thread, must never block."""
+        self.ring_buffer.write(in_data)
+        
+        waiting = self._waiting_bytes
+        loop = self.loop
+        if waiting and loop is not None and self.ring_buffer.available() >= waiting:
+            self._waiting_bytes = 0
+            loop.call_soon_threadsafe(self._data_ready.set)
+        
+        return (None, self._pa_continue)
+    
+    async def iter_frames(self):
+        """Yield pooled AudioFrames as soon as each one is fully captured.
+        
+        The caller owns one reference to each frame and must release it.
+        """
+        frame_bytes = self.pool_frame_bytes
+        if self.ring_buffer is not None:
+            self._bind_loop()
+        
+        while self.is_recording and self.ring_buffer is not None:
+            if self.ring_buffer.available() >= frame_bytes:
+                frame = self.frame_pool.acquire()
+                self.ring_buffer.read_into(frame.view)
+                yield frame
+                continue
+            
+            self._data_ready.clear()
+            self._waiting_bytes = frame_bytes
+            # Re-check after registering so a write in between is not missed
+            if self.ring_buffer.available() >= frame_bytes:
+                self._waiting_bytes = 0
+                continue
+            await self._data_ready.wait()
+    
     def read_audio_chunk(self):
+        if self.use_callback:
+            if self.ring_buffer and self.ring_buffer.available() >= self.chunk_bytes:
+                return self.ring_buffer.read(self.chunk_bytes)
+            return None
+        
         if self.stream and self.is_recording:
             try:
                 data = self.stream.read(self.chunk_size, exception_on_overflow=False)
@@ -65,10 +145,19 @@ class AudioHandler:
             return False
     
     def buffer_audio(self, audio_data):
-        self.audio_buffer.append(audio_data)
+        if isinstance(audio_data, AudioFrame):
+            frame = audio_data.retain()
+        else:
+            frame = AudioFrame.wrap(audio_data)
+        
+        if len(self.audio_buffer) == self.audio_buffer.maxlen:
+            self.audio_buffer.popleft().release()
+        self.audio_buffer.append(frame)
     
     def get_buffered_audio(self):
-        buffered = b''.join(self.audio_buffer)
+        buffered = b''.join(frame.view for frame in self.audio_buffer)
+        for frame in self.audio_buffer:
+            frame.release()
         self.audio_buffer.clear()
         return buffered
     
@@ -76,6 +165,8 @@ class AudioHandler:
         if sample_rate is None:
             sample_rate = self.sample_rate
         
+        import numpy as np
+        import sounddevice as sd
         try:
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
             sd.play(audio_array, samplerate=sample_rate)
@@ -87,6 +178,8 @@ class AudioHandler:
         if sample_rate is None:
             sample_rate = self.sample_rate
         
+        import numpy as np
+        import sounddevice as sd
         try:
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
             sd.play(audio_array, samplerate=sample_rate)
@@ -96,8 +189,22 @@ class AudioHandler:
         except Exception as e:
             pass
     
+    def get_capture_stats(self):
+        if not self.ring_buffer:
+            return {}
+        return {
+            "buffered_bytes": self.ring_buffer.available(),
+            "overflows": self.ring_buffer.overflows,
+            "bytes_dropped": self.ring_buffer.bytes_dropped,
+            "frame_pool": self.frame_pool.get_stats(),
+        }
+    
     def stop_recording(self):
         self.is_recording = False
+        if self._data_ready is not None and self.loop is not None and not self.loop.is_closed():
+            # Release any consumer parked in iter_frames
+            self._waiting_bytes = 0
+            self.loop.call_soon_threadsafe(self._data_ready.set)
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
@@ -105,5 +212,6 @@ class AudioHandler:
     
     def cleanup(self):
         self.stop_recording()
-        self.pyaudio_instance.terminate()
+        if self.owns_pyaudio:
+            self.pyaudio_instance.terminate()
 
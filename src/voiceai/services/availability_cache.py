@@ -0,0 +1,142 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from voiceai import config
+
+def _aware(moment):
+    # Fallback slots are naive local times; treat them as local so they compare with API results
+    return moment if moment.tzinfo else moment.astimezone()
+
+
+class AvailabilityCache:
+    """In-memory calendar free slots so the scheduling turn never waits on Google.
+
+    Slots are filled once at startup, refreshed in the background, refreshed
+    again at the start of a call if they have gone stale, and updated locally
+    whenever a slot is booked. If a refresh fails, the last good slots are
+    served (stale) and the next read tries again.
+    """
+
+    def __init__(self, calendar_service, ttl_seconds=None, refresh_interval=None,
+                 days_ahead=3, slot_duration_minutes=30):
+        self.calendar_service = calendar_service
+        self.ttl_seconds = ttl_seconds or config.CALENDAR_CACHE_TTL_SECONDS
+        self.refresh_interval = refresh_interval or config.CALENDAR_REFRESH_INTERVAL_SECONDS
+        self.days_ahead = days_ahead
+        self.slot_duration_minutes = slot_duration_minutes
+
+        self._slots = []
+        self._fetched_at = None
+        self._inflight = None
+        self._refresher = None
+        # Bookings made locally, applied to refreshes that may have started before them
+        self._booked = []
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def is_fresh(self):
+        return self._fetched_at is not None and time.monotonic() - self._fetched_at < self.ttl_seconds
+
+    async def refresh(self):
+        """Fetch slots now, sharing a single request between concurrent callers."""
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._fetch())
+        inflight = self._inflight
+        try:
+            return await asyncio.shield(inflight)
+        finally:
+            if inflight.done() and self._inflight is inflight:
+                self._inflight = None
+
+    async def _fetch(self):
+        # Made-up fallback slots must never be cached as fresh, so failures raise here
+        slots = await self.calendar_service.get_free_slots(
+            days_ahead=self.days_ahead,
+            slot_duration_minutes=self.slot_duration_minutes,
+            fallback=False
+        )
+        self.refreshes += 1
+        self._slots = self._without_booked(slots)
+        self._fetched_at = time.monotonic()
+        return list(self._slots)
+
+    def prefetch(self):
+        """Refresh in the background if the cached slots are stale."""
+        if self.is_fresh() or self._inflight is not None:
+            return
+        self._inflight = asyncio.create_task(self._fetch())
+        self._inflight.add_done_callback(self._clear_inflight)
+
+    def _clear_inflight(self, task):
+        if self._inflight is task:
+            self._inflight = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Calendar prefetch error: {task.exception()}")
+
+    async def get_free_slots(self):
+        if self.is_fresh():
+            self.hits += 1
+            self._slots = self._without_booked(self._slots)
+            return list(self._slots)
+
+        self.misses += 1
+        try:
+            return await self.refresh()
+        except Exception as e:
+            print(f"Calendar refresh error: {e}")
+            return list(self._slots)
+
+    def invalidate(self, start_time, duration_minutes=None):
+        """Drop a slot that has just been booked so no other call offers it."""
+        duration = timedelta(minutes=duration_minutes or self.slot_duration_minutes)
+        start = _aware(start_time)
+        self._booked.append((start, start + duration))
+        self._slots = self._without_booked(self._slots)
+
+    def _without_booked(self, slots):
+        now = datetime.now().astimezone()
+        self._booked = [(start, end) for start, end in self._booked if end > now]
+
+        duration = timedelta(minutes=self.slot_duration_minutes)
+        free = []
+        for slot in slots:
+            slot_start = _aware(slot)
+            slot_end = slot_start + duration
+            if slot_start <= now:
+                continue
+            if any(slot_start < end and slot_end > start for start, end in self._booked):
+                continue
+            free.append(slot)
+        return free
+
+    def start(self):
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Calendar background refresh error: {e}")
+
+    async def stop(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    def get_stats(self):
+        return {
+            "slots": len(self._slots),
+            "fresh": self.is_fresh(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
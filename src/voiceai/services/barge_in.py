@@ -0,0 +1,48 @@
+from voiceai import config
+
+class BargeInDetector:
+    """Detects the caller talking over the agent.
+
+    While the agent's audio is playing, microphone frames are run through
+    VAD; once ``min_speech_ms`` of consecutive speech is heard the detector
+    fires, at most once per stretch of playback. Frames are not inspected
+    while nothing is playing, so this costs nothing between agent turns.
+    """
+
+    def __init__(self, is_speech, frame_bytes, frame_ms=None, min_speech_ms=None):
+        self.is_speech = is_speech
+        self.frame_bytes = frame_bytes
+        self.frame_ms = frame_ms or config.VAD_FRAME_DURATION_MS
+        min_speech_ms = min_speech_ms or config.BARGE_IN_MIN_SPEECH_MS
+        self.required_frames = max(1, min_speech_ms // self.frame_ms)
+
+        self._speech_run = 0
+        self._fired = False
+
+        self.triggers = 0
+
+    def observe(self, audio, playing):
+        """Inspect a chunk of microphone audio; return True when the caller barges in."""
+        if not playing:
+            self._speech_run = 0
+            self._fired = False
+            return False
+        if self._fired:
+            return False
+
+        view = memoryview(audio)
+        for offset in range(0, len(view) - self.frame_bytes + 1, self.frame_bytes):
+            if self.is_speech(view[offset:offset + self.frame_bytes]):
+                self._speech_run += 1
+                if self._speech_run >= self.required_frames:
+                    self._fired = True
+                    self._speech_run = 0
+                    self.triggers += 1
+                    return True
+            else:
+                self._speech_run = 0
+        return False
+
+    def reset(self):
+        self._speech_run = 0
+        self._fired = False
@@ -0,0 +1,231 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from voiceai import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    call_id TEXT PRIMARY KEY,
+    caller TEXT,
+    started_at TEXT,
+    ended_at TEXT,
+    classification TEXT,
+    outcome TEXT,
+    caller_intent TEXT,
+    scheduled_callback TEXT,
+    confidence REAL,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS turns (
+    call_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    at TEXT NOT NULL,
+    speaker TEXT NOT NULL,
+    text TEXT NOT NULL,
+    intent TEXT,
+    action TEXT,
+    PRIMARY KEY (call_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_calls_started_at ON calls (started_at);
+CREATE INDEX IF NOT EXISTS idx_calls_classification ON calls (classification, started_at);
+CREATE INDEX IF NOT EXISTS idx_calls_caller ON calls (caller, started_at);
+"""
+
+_CALL_COLUMNS = ("call_id", "caller", "started_at", "ended_at", "classification", "outcome",
+                 "caller_intent", "scheduled_callback", "confidence", "summary")
+
+def _timestamp(moment):
+    return moment.isoformat() if moment is not None else None
+
+
+def _column(value):
+    """SQLite only binds scalars; LLM summaries can hand back lists or dicts."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, default=str)
+
+
+class CallStore:
+    """Append-only SQLite store of calls and their turns.
+
+    The database runs in WAL mode so dashboards can read while calls are
+    being written. Calls only enqueue records; a background thread writes
+    them in batches, one transaction per batch, so disk I/O never runs on
+    the event loop.
+    """
+
+    def __init__(self, path=None, batch_size=None, flush_interval=None):
+        self.path = path or config.CALL_STORE_PATH
+        self.batch_size = batch_size or config.CALL_STORE_BATCH_SIZE
+        self.flush_interval = flush_interval or config.CALL_STORE_FLUSH_SECONDS
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._queue = queue.Queue()
+        self._seq = {}
+        self._closed = False
+
+        self.records_written = 0
+        self.batches_written = 0
+        self.write_errors = 0
+        self.dropped = 0
+
+        self._writer = threading.Thread(target=self._write_loop, name="call-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _accepting(self, kind, call_id):
+        if not self._closed:
+            return True
+        self.dropped += 1
+        print(f"Call store is closed; dropping {kind} for call {call_id}")
+        return False
+
+    def record_turn(self, call_id, speaker, text, intent=None, action=None, at=None):
+        if not self._accepting("turn", call_id):
+            return
+        seq = self._seq.get(call_id, 0)
+        self._seq[call_id] = seq + 1
+        self._queue.put(("turn", (
+            call_id, seq, _timestamp(at or datetime.now()), speaker, _column(text), _column(intent), _column(action)
+        )))
+
+    def record_call(self, call_id, started_at, ended_at, summary, caller=None):
+        if not self._accepting("call", call_id):
+            return
+        summary = summary or {}
+        self._seq.pop(call_id, None)
+        self._queue.put(("call", (
+            call_id,
+            caller,
+            _timestamp(started_at),
+            _timestamp(ended_at),
+            _column(summary.get("classification")),
+            _column(summary.get("outcome")),
+            _column(summary.get("caller_intent")),
+            _column(summary.get("scheduled_callback")),
+            _column(summary.get("confidence_score")),
+            json.dumps(summary, default=str)
+        )))
+
+    def _write_loop(self):
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Collect whatever else arrives shortly after so it shares one commit; the wait
+            # is bounded from the first record so a slow trickle cannot hold a batch open
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stopping = any(item is None for item in batch)
+            records = [item for item in batch if item is not None]
+            try:
+                if records:
+                    self._write_batch(conn, records)
+            except Exception as e:
+                self.write_errors += 1
+                print(f"Call store write error: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _write_batch(self, conn, records):
+        turns = [row for kind, row in records if kind == "turn"]
+        calls = [row for kind, row in records if kind == "call"]
+        with conn:
+            if turns:
+                conn.executemany("INSERT OR IGNORE INTO turns VALUES (?, ?, ?, ?, ?, ?, ?)", turns)
+            if calls:
+                conn.executemany("INSERT OR IGNORE INTO calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", calls)
+        self.records_written += len(records)
+        self.batches_written += 1
+
+    def flush(self):
+        """Block until everything queued so far has been written, or the writer has stopped."""
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks and self._writer.is_alive():
+                done.wait(0.1)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+    def query_calls(self, since=None, until=None, classification=None, caller=None, limit=100):
+        """Most recent calls first, filtered by start time, classification and caller."""
+        clauses = []
+        params = []
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("started_at < ?")
+            params.append(_timestamp(until))
+        if classification is not None:
+            clauses.append("classification = ?")
+            params.append(classification)
+        if caller is not None:
+            clauses.append("caller = ?")
+            params.append(caller)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {', '.join(_CALL_COLUMNS)} FROM calls {where} ORDER BY started_at DESC LIMIT ?"
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        finally:
+            conn.close()
+
+        calls = []
+        for row in rows:
+            call = dict(zip(_CALL_COLUMNS, row))
+            call["summary"] = json.loads(call["summary"]) if call["summary"] else {}
+            calls.append(call)
+        return calls
+
+    def get_turns(self, call_id):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT seq, at, speaker, text, intent, action FROM turns WHERE call_id = ? ORDER BY seq",
+                (call_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(zip(("seq", "at", "speaker", "text", "intent", "action"), row)) for row in rows]
+
+    def get_stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "records_written": self.records_written,
+            "batches_written": self.batches_written,
+            "write_errors": self.write_errors,
+            "dropped": self.dropped,
+        }
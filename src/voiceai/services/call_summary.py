@@ -0,0 +1,86 @@
+import re
+
+_HAS_DIGIT = re.compile(r"\d")
+
+def _clip(text, limit=120):
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 3].rstrip() + "..."
+
+
+class RollingSummary:
+    """Call summary kept up to date turn by turn from the agent's per-turn JSON.
+
+    Every committed turn already carries intent, action and confidence, so
+    the summary is assembled as the call goes and ``finalize`` only has to
+    format it; no extra LLM request is needed once the caller hangs up.
+    """
+
+    MAX_DETAILS = 6
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.classification = "unclear"
+        self.confidence = 0.0
+        self.outcome = None
+        self.scheduled_callback = None
+        self.key_details = []
+        self._first_line = None
+        self._legitimate_line = None
+        self._spam_matches = []
+
+    def record_turn(self, transcript, result, spam_matches=()):
+        intent = result.get("intent", "unclear")
+        action = result.get("action", "continue")
+
+        if self._first_line is None and transcript.strip():
+            self._first_line = _clip(transcript)
+
+        if intent in ("spam", "legitimate"):
+            self.classification = intent
+            self.confidence = result.get("confidence", self.confidence)
+        if intent == "legitimate" and self._legitimate_line is None:
+            self._legitimate_line = _clip(transcript)
+
+        for phrase in spam_matches:
+            if phrase not in self._spam_matches:
+                self._spam_matches.append(phrase)
+                self._add_detail(f"mentioned '{phrase}'")
+
+        # Numbers usually mean dates, times, amounts or call-back numbers
+        if _HAS_DIGIT.search(transcript):
+            self._add_detail(_clip(transcript, 80))
+
+        if action == "decline":
+            self.outcome = "declined"
+        elif action == "end_call":
+            self.outcome = "declined" if self.classification == "spam" else "ended"
+        elif action == "schedule" and self.outcome != "scheduled":
+            self.outcome = "callback offered"
+
+    def record_scheduled(self, when):
+        self.scheduled_callback = when.isoformat()
+        self.outcome = "scheduled"
+
+    def _add_detail(self, detail):
+        if detail not in self.key_details and len(self.key_details) < self.MAX_DETAILS:
+            self.key_details.append(detail)
+
+    def _caller_intent(self):
+        if self.classification == "spam" and self._spam_matches:
+            return "Unsolicited call about " + ", ".join(self._spam_matches[:3])
+        return self._legitimate_line or self._first_line or "Unknown"
+
+    def finalize(self):
+        """Return the summary with the same fields generate_summary produces."""
+        return {
+            "caller_intent": self._caller_intent(),
+            "classification": self.classification,
+            "outcome": self.outcome or "unclear",
+            "scheduled_callback": self.scheduled_callback,
+            "key_details": "; ".join(self.key_details),
+            "confidence_score": self.confidence
+        }
@@ -0,0 +1,85 @@
+class AudioFrame:
+    """Reference-counted view over one frame of PCM audio.
+
+    Every consumer that keeps a frame beyond the current call (pre-roll,
+    uplink queue, recorder) calls ``retain`` and later ``release``. When the
+    count drops to zero a pooled frame goes back to its pool and its view must
+    no longer be used.
+    """
+
+    __slots__ = ("view", "_pool", "_refs")
+
+    def __init__(self, view, pool=None):
+        self.view = view
+        self._pool = pool
+        self._refs = 0
+
+    @classmethod
+    def wrap(cls, audio_data):
+        """Wrap plain bytes in an unpooled frame so they can flow through the same consumers."""
+        frame = cls(memoryview(audio_data))
+        frame._refs = 1
+        return frame
+
+    def __len__(self):
+        return len(self.view)
+
+    @property
+    def refs(self):
+        return self._refs
+
+    def retain(self):
+        self._refs += 1
+        return self
+
+    def release(self):
+        self._refs -= 1
+        if self._refs == 0 and self._pool is not None:
+            self._pool._recycle(self)
+
+
+class FramePool:
+    """Fixed set of preallocated frame buffers carved out of a single slab.
+
+    Frames are handed out with a reference count of one. The pool is only
+    touched from the event loop, so no locking is needed. If every frame is
+    in use, an unpooled frame is allocated instead and counted as a miss.
+    """
+
+    def __init__(self, frame_bytes, capacity):
+        self.frame_bytes = frame_bytes
+        self.capacity = capacity
+        self._slab = bytearray(frame_bytes * capacity)
+        slab_view = memoryview(self._slab)
+        self._free = [
+            AudioFrame(slab_view[i * frame_bytes:(i + 1) * frame_bytes], self)
+            for i in range(capacity)
+        ]
+
+        self.acquired = 0
+        self.misses = 0
+
+    def acquire(self):
+        self.acquired += 1
+        if self._free:
+            frame = self._free.pop()
+        else:
+            self.misses += 1
+            frame = AudioFrame(memoryview(bytearray(self.frame_bytes)))
+        frame._refs = 1
+        return frame
+
+    def _recycle(self, frame):
+        self._free.append(frame)
+
+    @property
+    def in_use(self):
+        return self.capacity - len(self._free)
+
+    def get_stats(self):
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "acquired": self.acquired,
+            "misses": self.misses,
+        }
@@ -0,0 +1,134 @@
+import json
+import re
+from voiceai import config
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def count_tokens(text):
+    """Cheap local estimate of BPE tokens: ~4 characters per token per word piece."""
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        tokens += (len(piece) + 3) // 4
+    return tokens
+
+# Chat formatting adds a few tokens per message on top of the content
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class ConversationHistory:
+    """Token-budgeted chat history behind a byte-identical system prompt.
+
+    The system prompt is always the first message and never changes, so the
+    provider can keep serving it from its prompt cache. The last
+    ``keep_turns`` exchanges are kept verbatim; once the rest exceeds the
+    token budget, the oldest turns are folded into a short state note that
+    sits right after the system prompt.
+    """
+
+    def __init__(self, system_prompt, token_budget=None, keep_turns=None, max_note_lines=None):
+        self.system_message = {"role": "system", "content": system_prompt}
+        self.token_budget = token_budget or config.LLM_HISTORY_TOKEN_BUDGET
+        self.keep_turns = keep_turns if keep_turns is not None else config.LLM_HISTORY_KEEP_TURNS
+        self.max_note_lines = max_note_lines or config.LLM_HISTORY_MAX_NOTE_LINES
+
+        self.turns = []
+        self._turn_tokens = []
+        self._note_lines = []
+        self._note_message = None
+        self.compactions = 0
+
+    def reset(self):
+        self.turns = []
+        self._turn_tokens = []
+        self._note_lines = []
+        self._note_message = None
+
+    def add_user(self, content):
+        self._append({"role": "user", "content": content})
+
+    def add_assistant(self, content):
+        self._append({"role": "assistant", "content": content})
+
+    def _append(self, message):
+        self.turns.append(message)
+        self._turn_tokens.append(count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS)
+        self._compact()
+
+    def mark_interrupted(self):
+        """Flag the latest agent reply as cut off by the caller.
+
+        Only applies while that reply is still the last message. Returns
+        whether a reply was marked.
+        """
+        if not self.turns or self.turns[-1]["role"] != "assistant":
+            return False
+
+        content = self.turns[-1]["content"]
+        try:
+            data = json.loads(content)
+            data["interrupted_by_caller"] = True
+            content = json.dumps(data)
+        except (json.JSONDecodeError, TypeError):
+            content = f"{content} [interrupted by caller]"
+
+        self.turns[-1] = {"role": "assistant", "content": content}
+        self._turn_tokens[-1] = count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+        return True
+
+    def messages(self):
+        messages = [self.system_message]
+        if self._note_message is not None:
+            messages.append(self._note_message)
+        messages.extend(self.turns)
+        return messages
+
+    def token_count(self):
+        total = sum(self._turn_tokens)
+        if self._note_message is not None:
+            total += count_tokens(self._note_message["content"]) + MESSAGE_OVERHEAD_TOKENS
+        return total
+
+    def _compact(self):
+        # Two messages per exchange; everything older than keep_turns is foldable
+        keep_messages = self.keep_turns * 2
+        folded = False
+        while len(self.turns) > keep_messages and sum(self._turn_tokens) > self.token_budget:
+            message = self.turns.pop(0)
+            self._turn_tokens.pop(0)
+            self._note_lines.append(self._summarize(message))
+            folded = True
+
+        if folded:
+            self.compactions += 1
+            self._rebuild_note()
+
+    def _summarize(self, message):
+        content = message["content"]
+        if message["role"] == "user":
+            return f"Caller: {_clip(content)}"
+
+        try:
+            data = json.loads(content)
+            return (f"Agent ({data.get('intent', 'unclear')}, {data.get('action', 'continue')}): "
+                    f"{_clip(data.get('response', ''))}")
+        except (json.JSONDecodeError, AttributeError):
+            return f"Agent: {_clip(content)}"
+
+    def _rebuild_note(self):
+        lines = self._note_lines
+        if len(lines) > self.max_note_lines:
+            # The opening exchange usually carries the caller's purpose, so always keep it
+            lines = lines[:2] + ["..."] + lines[-(self.max_note_lines - 2):]
+            self._note_lines = lines
+
+        self._note_message = {
+            "role": "system",
+            "content": "Earlier in this call (condensed):\n" + "\n".join(lines)
+        }
+
+
+def _clip(text, limit=160):
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 3].rstrip() + "..."
@@ -0,0 +1,145 @@
+import asyncio
+import importlib.util
+import time
+from collections import deque
+from urllib.parse import urlsplit
+import httpx
+from voiceai import config
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def http2_available():
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpPool:
+    """One pooled httpx.AsyncClient shared by the OpenAI and ElevenLabs clients.
+
+    Connections are kept alive between requests (and between calls), so
+    only the first request to a host pays for DNS, TCP and TLS, and
+    ``warm`` moves that cost to startup. HTTP/2 is used when the ``h2``
+    package is installed. If HTTP_KEEPALIVE_PING_SECONDS is set, a background
+    task re-warms the pool so idle connections are not dropped between
+    calls; each ping is an unauthenticated HEAD to every warm-up URL.
+
+    Every request is traced, so ``get_stats`` can tell how many requests
+    reused a connection and how long new connections took to set up.
+    """
+
+    def __init__(self, max_connections=None, max_keepalive_connections=None, keepalive_expiry=None,
+                 http2=None, timeout=None, connect_timeout=None):
+        self.http2 = (config.HTTP2_ENABLED if http2 is None else http2) and http2_available()
+        self.limits = httpx.Limits(
+            max_connections=max_connections or config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=keepalive_expiry or config.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.client = httpx.AsyncClient(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=httpx.Timeout(timeout or config.HTTP_TIMEOUT_SECONDS,
+                                  connect=connect_timeout or config.HTTP_CONNECT_TIMEOUT_SECONDS),
+            event_hooks={"request": [self._on_request]},
+        )
+        self._pinger = None
+
+        self.requests = 0
+        self.new_connections = 0
+        self.warmups = 0
+        self.warmup_errors = 0
+        self._connect_ms = deque(maxlen=500)
+
+    async def _on_request(self, request):
+        self.requests += 1
+        # Only a request that has to open a connection sees the connect events
+        request.extensions["trace"] = self._trace_connection(request.url.scheme == "https")
+
+    def _trace_connection(self, tls):
+        ready_event = "connection.start_tls.complete" if tls else "connection.connect_tcp.complete"
+        started = None
+
+        async def trace(event_name, info):
+            nonlocal started
+            if event_name == "connection.connect_tcp.started":
+                started = time.monotonic()
+                self.new_connections += 1
+            elif event_name == ready_event and started is not None:
+                self._connect_ms.append((time.monotonic() - started) * 1000)
+        return trace
+
+    async def warm(self, urls=None, connections=None):
+        """Open connections to each host ahead of the first real request.
+
+        Any response, including 401 or 404, leaves a live connection in the pool.
+        Returns how many warm-up requests got a response.
+        """
+        urls = urls or config.HTTP_WARM_URLS
+        connections = 1 if self.http2 else (connections or config.HTTP_WARM_CONNECTIONS)
+
+        async def touch(url):
+            try:
+                await self.client.head(url)
+                return True
+            except httpx.HTTPError as e:
+                self.warmup_errors += 1
+                print(f"HTTP warm-up failed for {urlsplit(url).netloc}: {e}")
+                return False
+
+        # Concurrent requests to one host each get their own HTTP/1.1 connection
+        results = await asyncio.gather(*(touch(url) for url in urls for _ in range(connections)))
+        self.warmups += 1
+        return sum(results)
+
+    def start(self, interval=None):
+        interval = config.HTTP_KEEPALIVE_PING_SECONDS if interval is None else interval
+        if interval and self._pinger is None:
+            self._pinger = asyncio.create_task(self._keep_warm(interval))
+
+    async def _keep_warm(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.warm()
+            except Exception as e:
+                print(f"HTTP keep-alive error: {e}")
+
+    async def stop(self):
+        if self._pinger is not None:
+            self._pinger.cancel()
+            try:
+                await self._pinger
+            except asyncio.CancelledError:
+                pass
+            self._pinger = None
+
+    async def aclose(self):
+        await self.stop()
+        await self.client.aclose()
+
+    def _connections(self):
+        # httpx has no public pool introspection; fall back to nothing if its internals change
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+    def get_stats(self):
+        connections = self._connections()
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "http2": self.http2,
+            "connections": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "http2_connections": sum(1 for connection in connections if "HTTP/2" in connection.info()),
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused": max(0, self.requests - self.new_connections),
+            "connect_ms_p50": round(_percentile(self._connect_ms, 0.5), 1),
+            "connect_ms_p95": round(_percentile(self._connect_ms, 0.95), 1),
+            "warmups": self.warmups,
+            "warmup_errors": self.warmup_errors,
+        }
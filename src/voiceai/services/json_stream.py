@@ -0,0 +1,123 @@
+import re
+
+_ESCAPES = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+
+def _is_hex(text):
+    return len(text) == 4 and all(char in "0123456789abcdefABCDEF" for char in text)
+
+
+class ResponseFieldStream:
+    """Pulls one top-level string field out of a JSON object while it streams in.
+
+    ``feed`` takes raw deltas from the LLM and returns whatever new characters
+    of the field's decoded value became available, so speech can start before
+    the object is complete.
+    """
+
+    def __init__(self, field="response"):
+        self._key_pattern = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = 0
+        self._in_value = False
+        self.done = False
+
+    def feed(self, delta):
+        if self.done:
+            return ""
+        self._buffer += delta
+
+        if not self._in_value:
+            match = self._key_pattern.search(self._buffer, self._pos)
+            if match is None:
+                # Keep enough of the tail to match a key split across deltas
+                self._pos = max(self._pos, len(self._buffer) - 64)
+                return ""
+            self._in_value = True
+            self._pos = match.end()
+
+        out = []
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self.done = True
+                pos += 1
+                break
+            if char != '\\':
+                out.append(char)
+                pos += 1
+                continue
+
+            # Escape sequence: wait for the rest of it if the delta split it
+            if pos + 1 >= len(buffer):
+                break
+            code = buffer[pos + 1]
+            if code == 'u':
+                if pos + 6 > len(buffer):
+                    break
+                value = int(buffer[pos + 2:pos + 6], 16)
+                if not 0xD800 <= value <= 0xDFFF:
+                    out.append(chr(value))
+                    pos += 6
+                    continue
+                # Characters outside the BMP arrive as a \uD8xx\uDCxx pair
+                low = buffer[pos + 6:pos + 12]
+                if len(low) < 6 and "\\u".startswith(low[:2]):
+                    break
+                low_value = int(low[2:], 16) if low[:2] == "\\u" and _is_hex(low[2:]) else 0
+                if value < 0xDC00 and 0xDC00 <= low_value <= 0xDFFF:
+                    out.append(chr(0x10000 + ((value - 0xD800) << 10) + (low_value - 0xDC00)))
+                    pos += 12
+                else:
+                    # A lone surrogate cannot be encoded as UTF-8
+                    out.append('\ufffd')
+                    pos += 6
+            else:
+                out.append(_ESCAPES.get(code, code))
+                pos += 2
+
+        self._pos = pos
+        return "".join(out)
+
+
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "jr", "sr", "vs", "etc", "a.m", "p.m", "e.g", "i.e"}
+
+class SentenceChunker:
+    """Groups streamed text into complete sentences for TTS."""
+
+    def __init__(self, min_chars=None):
+        self.min_chars = min_chars if min_chars is not None else 12
+        self._pending = ""
+
+    def push(self, text):
+        self._pending += text
+        sentences = []
+        start = 0
+        i = 0
+        while i < len(self._pending) - 1:
+            char = self._pending[i]
+            if char in ".!?" and self._pending[i + 1].isspace():
+                candidate = self._pending[start:i + 1].strip()
+                last_word = candidate.rsplit(None, 1)[-1].rstrip(".!?").lower() if candidate else ""
+                if len(candidate) >= self.min_chars and last_word not in _ABBREVIATIONS:
+                    sentences.append(candidate)
+                    start = i + 1
+            i += 1
+
+        self._pending = self._pending[start:]
+        return sentences
+
+    def flush(self):
+        remainder = self._pending.strip()
+        self._pending = ""
+        return remainder
@@ -1,16 +1,35 @@
 import json
 import asyncio
-from openai import AsyncOpenAI
 from voiceai import config
+from voiceai.services.json_stream import ResponseFieldStream, SentenceChunker
+from voiceai.services.history import ConversationHistory
+from voiceai.services.spam_classifier import SpamClassifier, DECLINE_RESPONSE
+from voiceai.services.response_cache import ResponseCache
+from voiceai.services.call_summary import RollingSummary
+from voiceai.services.tracing import Tracer
+
+def _default_client():
+    # The OpenAI SDK takes a while to import, so it is only loaded when no client is passed in
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+
 
 class ConversationEngine:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
-        self.conversation_history = []
+    def __init__(self, client=None, response_cache=None, tracer=None):
+        self.client = client or _default_client()
+        self.tracer = tracer or Tracer(enabled=False)
         self.user_name = config.USER_NAME
         self.system_prompt = self._build_system_prompt()
+        self.history = ConversationHistory(self.system_prompt)
+        self.spam_classifier = SpamClassifier() if config.SPAM_FASTPATH_ENABLED else None
+        if response_cache is None and config.RESPONSE_CACHE_ENABLED:
+            response_cache = ResponseCache()
+        self.response_cache = response_cache
+        self.caller_turns = 0
+        self.history_version = 0
         self.current_intent = "unclear"
         self.confidence = 0.0
+        self.call_summary = RollingSummary()
         
     def _build_system_prompt(self):
         return f"""You are Hiya Guard, an assistant answering calls for {self.user_name}.
@@ -60,57 +79,230 @@ OUTPUT FORMAT (JSON):
 IMPORTANT: 
 - Use "confirm" action when user confirms a time slot
 - Use "end_call" action after confirmation to end the conversation
-- Don't repeat calendar information if already provided"""
+- Don't repeat calendar information if already provided
+- If your previous reply has "interrupted_by_caller": true, the caller talked over it and may not have heard all of it"""
+    
+    @property
+    def conversation_history(self):
+        return self.history.messages()
     
     def initialize_conversation(self):
-        self.conversation_history = [
-            {"role": "system", "content": self.system_prompt}
-        ]
+        self.history.reset()
+        self.call_summary.reset()
+        self.caller_turns = 0
+        self.history_version += 1
+    
+    def _conversation_stage(self):
+        # Scripts are only interchangeable at the same point of the same kind of call
+        return f"{min(self.caller_turns, 3)}:{self.current_intent}"
+    
+    def _plan_turn(self, transcript):
+        """Decide how to answer transcript without changing conversation state.
+        
+        Returns a draft. It is already finished when the spam screen or the
+        response cache can answer locally; otherwise it still needs an LLM
+        completion. Weaker spam matches are appended to the user message as a
+        hint so the system prompt prefix stays unchanged. Screening and cache
+        stats are only counted once the draft is committed.
+        """
+        draft = {
+            "transcript": transcript,
+            "stage": self._conversation_stage(),
+            "user_content": transcript,
+            "assistant_message": None,
+            "result": None,
+            "source": "llm",
+            "spam_matches": [],
+            "spam_verdict": None,
+            "cache_outcome": None,
+            "version": self.history_version
+        }
+        
+        verdict = None
+        if self.spam_classifier is not None:
+            verdict = self.spam_classifier.classify(transcript, record=False)
+            draft["spam_matches"] = verdict["matches"]
+            draft["spam_verdict"] = verdict
+        
+        if verdict and verdict["decision"] == "decline":
+            result = {
+                "response": DECLINE_RESPONSE,
+                "intent": "spam",
+                "action": "decline",
+                "confidence": verdict["score"]
+            }
+            draft.update(result=result, assistant_message=json.dumps(result), source="spam_screen")
+            return draft
+        
+        if self.response_cache is not None:
+            cached, draft["cache_outcome"] = self.response_cache.find(transcript, draft["stage"])
+            if cached is not None:
+                draft.update(result=cached, assistant_message=json.dumps(cached), source="response_cache")
+                return draft
+        
+        if verdict and verdict["decision"] == "hint":
+            draft["user_content"] = f"{transcript}\n\n{SpamClassifier.format_hint(verdict)}"
+        return draft
+    
+    def _draft_messages(self, draft):
+        return self.history.messages() + [{"role": "user", "content": draft["user_content"]}]
+    
+    def _finish_draft(self, draft, assistant_message):
+        draft["assistant_message"] = assistant_message
+        draft["result"] = self._parse_response(assistant_message)
+    
+    async def _complete_draft(self, draft):
+        if draft["result"] is not None:
+            return
+        
+        response = await self.client.chat.completions.create(
+            model=config.OPENAI_MODEL,
+            messages=self._draft_messages(draft),
+            temperature=config.OPENAI_TEMPERATURE,
+            response_format={"type": "json_object"}
+        )
+        self._finish_draft(draft, response.choices[0].message.content)
+    
+    async def draft_turn(self, transcript):
+        """Compute the reply to transcript without committing it to the conversation.
+        
+        Used for speculative turns: the draft is only applied via commit_turn,
+        and only while is_draft_current(draft) holds. Raises if the LLM
+        request fails.
+        """
+        draft = self._plan_turn(transcript)
+        await self._complete_draft(draft)
+        return draft
+    
+    def is_draft_current(self, draft):
+        return draft["version"] == self.history_version
+    
+    def _record_plan(self, draft):
+        # Speculative drafts that are never committed must not show up in these stats
+        if draft["spam_verdict"] is not None:
+            self.spam_classifier.record(draft["spam_verdict"])
+        if draft["cache_outcome"] is not None:
+            self.response_cache.record(draft["cache_outcome"])
+    
+    def commit_turn(self, draft):
+        """Apply a finished draft to the conversation and return its response."""
+        self._record_plan(draft)
+        self.caller_turns += 1
+        self.history_version += 1
+        self.history.add_user(draft["user_content"])
+        self.history.add_assistant(draft["assistant_message"])
+        
+        result = draft["result"]
+        self.current_intent = result["intent"]
+        self.confidence = result["confidence"]
+        self.call_summary.record_turn(draft["transcript"], result, draft["spam_matches"])
+        
+        if draft["source"] == "llm":
+            self._remember_response(draft["transcript"], draft["stage"], result)
+        return dict(result)
+    
+    def _fail_turn(self, draft):
+        # Keep the caller's words in the history even though no reply came back
+        self._record_plan(draft)
+        self.caller_turns += 1
+        self.history_version += 1
+        self.history.add_user(draft["user_content"])
+        return {
+            "response": "I apologize, could you repeat that?",
+            "intent": self.current_intent,
+            "action": "continue",
+            "confidence": 0.5,
+            "failed": True
+        }
+    
+    def mark_interrupted(self):
+        """Record that the caller talked over the last reply."""
+        if self.history.mark_interrupted():
+            self.history_version += 1
+    
+    def _remember_response(self, transcript, stage, result):
+        if self.response_cache is None:
+            return
+        if result["intent"] in config.RESPONSE_CACHE_INTENTS and result["action"] in config.RESPONSE_CACHE_ACTIONS:
+            self.response_cache.store(transcript, stage, result)
     
     async def process_transcript(self, transcript):
-        self.conversation_history.append({
-            "role": "user",
-            "content": transcript
-        })
+        with self.tracer.span("llm.process_transcript", streaming=False):
+            draft = self._plan_turn(transcript)
+            
+            try:
+                await self._complete_draft(draft)
+            except Exception as e:
+                return self._fail_turn(draft)
+            
+            return self.commit_turn(draft)
+    
+    async def process_transcript_stream(self, transcript, on_sentence):
+        """Like process_transcript, but streams the completion.
+        
+        Complete sentences of the "response" field are passed to on_sentence
+        as soon as they are generated; intent, action and confidence are
+        resolved once the JSON object closes.
+        """
+        with self.tracer.span("llm.process_transcript", streaming=True):
+            return await self._stream_turn(transcript, on_sentence)
+    
+    async def _stream_turn(self, transcript, on_sentence):
+        draft = self._plan_turn(transcript)
+        if draft["result"] is not None:
+            return self.commit_turn(draft)
         
         try:
-            response = await self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model=config.OPENAI_MODEL,
-                messages=self.conversation_history,
+                messages=self._draft_messages(draft),
                 temperature=config.OPENAI_TEMPERATURE,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                stream=True
             )
             
-            assistant_message = response.choices[0].message.content
+            response_field = ResponseFieldStream("response")
+            chunker = SentenceChunker()
+            parts = []
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                self.tracer.event("llm.first_token", once=True)
+                
+                parts.append(delta)
+                text = response_field.feed(delta)
+                if text:
+                    for sentence in chunker.push(text):
+                        on_sentence(sentence)
+                    if response_field.done:
+                        remainder = chunker.flush()
+                        if remainder:
+                            on_sentence(remainder)
             
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
+            remainder = chunker.flush()
+            if remainder:
+                on_sentence(remainder)
             
-            parsed = self._parse_response(assistant_message)
-            return parsed
+            self._finish_draft(draft, "".join(parts))
             
         except Exception as e:
-            return {
-                "response": "I apologize, could you repeat that?",
-                "intent": self.current_intent,
-                "action": "continue",
-                "confidence": 0.5
-            }
+            return self._fail_turn(draft)
+        
+        return self.commit_turn(draft)
     
     def _parse_response(self, response_text):
         try:
             data = json.loads(response_text)
             
-            self.current_intent = data.get("intent", "unclear")
-            self.confidence = float(data.get("confidence", 0.5))
-            
             return {
                 "response": data.get("response", ""),
-                "intent": self.current_intent,
+                "intent": data.get("intent", "unclear"),
                 "action": data.get("action", "continue"),
-                "confidence": self.confidence
+                "confidence": float(data.get("confidence", 0.5))
             }
         except json.JSONDecodeError:
             return {
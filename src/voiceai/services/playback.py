@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import threading
+from voiceai import config
+from voiceai.services.tracing import Tracer
+
+class StreamingPlayer:
+    """Persistent output stream fed from a bounded jitter buffer.
+
+    Audio is written as it arrives from TTS. Playback starts once
+    ``prebuffer_ms`` of audio is queued (or the utterance is flushed), and the
+    PortAudio callback pulls from the buffer so the event loop never blocks.
+    """
+
+    def __init__(self, sample_rate=None, prebuffer_ms=None, max_buffer_ms=None, block_size=None, tracer=None):
+        self.sample_rate = sample_rate or config.PLAYBACK_SAMPLE_RATE
+        self.bytes_per_ms = self.sample_rate * 2 // 1000
+        self.prebuffer_bytes = (prebuffer_ms or config.PLAYBACK_PREBUFFER_MS) * self.bytes_per_ms
+        self.max_buffer_bytes = (max_buffer_ms or config.PLAYBACK_MAX_BUFFER_MS) * self.bytes_per_ms
+        self.block_size = block_size or config.PLAYBACK_BLOCK_SIZE
+        self.tracer = tracer or Tracer(enabled=False)
+        # Context of the turn being played, so notifications from the audio thread trace to it
+        self._trace_context = None
+
+        self.stream = None
+        self.loop = None
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._primed = False
+        self._flushed = False
+        self._playing = False
+        # Bumped by clear() so writes that were waiting for space give up
+        self._generation = 0
+
+        self._space_available = None
+        self._drained = None
+        # Zero-filled once here so the audio callback never allocates to pad a block
+        self._silence = bytes(self.block_size * 2)
+
+        self.underruns = 0
+        self.overruns = 0
+
+    def start(self):
+        if self.stream is not None:
+            return True
+
+        try:
+            # Loaded here rather than at import time: PortAudio initialises on import
+            import sounddevice as sd
+            self.loop = asyncio.get_running_loop()
+            self._space_available = asyncio.Event()
+            self._space_available.set()
+            self._drained = asyncio.Event()
+            self._drained.set()
+
+            self.stream = sd.RawOutputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype="int16",
+                blocksize=self.block_size,
+                callback=self._callback
+            )
+            self.stream.start()
+            return True
+        except Exception as e:
+            print(f"Playback stream error: {e}")
+            self.stream = None
+            return False
+
+    def _callback(self, outdata, frames, time_info, status):
+        needed = len(outdata)
+
+        with self._lock:
+            if not self._primed:
+                if len(self._buffer) >= self.prebuffer_bytes or (self._flushed and self._buffer):
+                    self._primed = True
+                    if not self._playing:
+                        self.loop.call_soon_threadsafe(self._mark_started, context=self._trace_context)
+                    self._playing = True
+
+            if not self._primed:
+                outdata[:] = self._silence_view(needed)
+                return
+
+            available = min(needed, len(self._buffer))
+            outdata[:available] = self._buffer[:available]
+            del self._buffer[:available]
+
+            if available < needed:
+                outdata[available:] = self._silence_view(needed - available)
+                if self._flushed:
+                    self._primed = False
+                    self._playing = False
+                    self.loop.call_soon_threadsafe(self._mark_drained, context=self._trace_context)
+                else:
+                    # Ran dry mid-utterance: wait for the buffer to refill before resuming
+                    self.underruns += 1
+                    self._primed = False
+
+            if not self._space_available.is_set() and len(self._buffer) < self.max_buffer_bytes:
+                self.loop.call_soon_threadsafe(self._space_available.set)
+
+    def _silence_view(self, size):
+        if size > len(self._silence):
+            # PortAudio may ask for a bigger block than configured; grow once and reuse
+            self._silence = bytes(size)
+        return memoryview(self._silence)[:size]
+
+    def _mark_started(self):
+        self.tracer.event("playback.start", once=True)
+
+    def _mark_drained(self):
+        # Runs on the loop; a write may have landed after the callback scheduled this
+        with self._lock:
+            if self._flushed and not self._buffer:
+                self._drained.set()
+                self.tracer.event("playback.end")
+
+    async def write(self, audio_data):
+        """Queue audio for playback, waiting while the jitter buffer is full."""
+        if not audio_data:
+            return
+
+        if self.stream is None and not self.start():
+            return
+
+        generation = self._generation
+        self._trace_context = contextvars.copy_context()
+        view = memoryview(audio_data)
+        while len(view) > 0:
+            with self._lock:
+                if self._generation != generation:
+                    return
+                self._flushed = False
+                self._drained.clear()
+                room = self.max_buffer_bytes - len(self._buffer)
+                if room > 0:
+                    self._buffer += view[:room]
+                    view = view[room:]
+                if len(view) > 0:
+                    self.overruns += 1
+                    self._space_available.clear()
+
+            if len(view) > 0:
+                await self._space_available.wait()
+
+    def flush(self):
+        """Mark the end of the current utterance so short audio still plays."""
+        with self._lock:
+            self._flushed = True
+            if not self._buffer and not self._playing and self._drained is not None:
+                self._primed = False
+                self._drained.set()
+
+    async def drain(self):
+        """Wait until everything written so far has been played."""
+        self.flush()
+        if self._drained is not None:
+            await self._drained.wait()
+
+    def clear(self):
+        """Drop any queued audio immediately."""
+        with self._lock:
+            self._generation += 1
+            self._buffer.clear()
+            self._primed = False
+            self._playing = False
+            self._flushed = True
+            if self._drained is not None:
+                self._drained.set()
+                self._space_available.set()
+
+    @property
+    def is_playing(self):
+        return self._playing or len(self._buffer) > 0
+
+    def get_stats(self):
+        return {
+            "buffered_ms": len(self._buffer) // self.bytes_per_ms,
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+        }
+
+    def close(self):
+        self.clear()
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Playback stream close error: {e}")
+            self.stream = None
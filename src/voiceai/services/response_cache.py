@@ -0,0 +1,154 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from voiceai import config
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+def normalize_words(text):
+    return _WORD.findall(text.lower().replace("’", "'"))
+
+def simhash(words, shingle_size=2):
+    """64-bit SimHash over word shingles; near-identical scripts land a few bits apart."""
+    if len(words) <= shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            if value >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    fingerprint = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class ResponseCache:
+    """Near-duplicate cache of LLM replies, keyed by transcript SimHash and conversation stage.
+
+    Fingerprints are split into eight 8-bit bands; any two fingerprints within
+    seven bits of each other share at least one band, so lookups only compare
+    against those bands' candidates. Entries expire after ``ttl_seconds`` and
+    the least recently used entry is evicted past ``max_entries``.
+    """
+
+    BANDS = 8
+    BAND_BITS = 8
+
+    def __init__(self, max_entries=None, ttl_seconds=None, max_distance=None, min_words=None):
+        self.max_entries = max_entries or config.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or config.RESPONSE_CACHE_TTL_SECONDS
+        self.max_distance = max_distance if max_distance is not None else config.RESPONSE_CACHE_MAX_DISTANCE
+        # The band index can only guarantee candidates up to BANDS - 1 differing bits
+        self.max_distance = min(self.max_distance, self.BANDS - 1)
+        self.min_words = min_words or config.RESPONSE_CACHE_MIN_WORDS
+
+        self._entries = OrderedDict()
+        self._bands = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.evictions = 0
+
+    def _band_keys(self, stage, fingerprint):
+        mask = (1 << self.BAND_BITS) - 1
+        return [
+            (stage, band, fingerprint >> (band * self.BAND_BITS) & mask)
+            for band in range(self.BANDS)
+        ]
+
+    def _fingerprint(self, transcript):
+        words = normalize_words(transcript)
+        if len(words) < self.min_words:
+            return None
+        return simhash(words)
+
+    def lookup(self, transcript, stage):
+        result, outcome = self.find(transcript, stage)
+        self.record(outcome)
+        return result
+
+    def record(self, outcome):
+        """Count a lookup outcome from find: "hit", "miss" or "skipped"."""
+        if outcome == "hit":
+            self.hits += 1
+        elif outcome == "miss":
+            self.misses += 1
+        else:
+            self.skipped += 1
+
+    def find(self, transcript, stage):
+        """Like lookup, but returns (result, outcome) and leaves the hit/miss counters alone."""
+        fingerprint = self._fingerprint(transcript)
+        if fingerprint is None:
+            return None, "skipped"
+
+        now = time.monotonic()
+        best_key = None
+        best_distance = self.max_distance + 1
+        for band_key in self._band_keys(stage, fingerprint):
+            for key in self._bands.get(band_key, ()):
+                distance = hamming_distance(key[1], fingerprint)
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+
+        if best_key is not None:
+            result, stored_at = self._entries[best_key]
+            if now - stored_at <= self.ttl_seconds:
+                self._entries.move_to_end(best_key)
+                return dict(result), "hit"
+            self._remove(best_key)
+
+        return None, "miss"
+
+    def store(self, transcript, stage, result):
+        fingerprint = self._fingerprint(transcript)
+        if fingerprint is None:
+            return False
+
+        key = (stage, fingerprint)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        else:
+            for band_key in self._band_keys(stage, fingerprint):
+                self._bands.setdefault(band_key, set()).add(key)
+        self._entries[key] = (dict(result), time.monotonic())
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        for band_key in self._band_keys(key[0], key[1]):
+            bucket = self._bands.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._bands[band_key]
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
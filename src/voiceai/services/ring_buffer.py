@@ -0,0 +1,105 @@
+from collections import deque
+
+class AudioRingBuffer:
+    """Preallocated single-producer/single-consumer byte ring.
+
+    The PortAudio callback thread is the only writer and the event loop is the
+    only reader. Each side only advances its own position counter, and plain
+    int assignment is atomic under the GIL, so no lock is needed.
+    """
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes
+        self._data = bytearray(capacity_bytes)
+        self._view = memoryview(self._data)
+        self._write_pos = 0
+        self._read_pos = 0
+
+        self.overflows = 0
+        self.bytes_dropped = 0
+
+    def available(self):
+        return self._write_pos - self._read_pos
+
+    def free_space(self):
+        return self.capacity - self.available()
+
+    def write(self, data):
+        """Copy data into the ring. Drops the whole write if it does not fit."""
+        data = memoryview(data)
+        size = len(data)
+        if size > self.free_space():
+            self.overflows += 1
+            self.bytes_dropped += size
+            return False
+
+        start = self._write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = data[:first]
+        if first < size:
+            self._view[:size - first] = data[first:]
+
+        # Publish only after the bytes are in place
+        self._write_pos += size
+        return True
+
+    def read_into(self, dest):
+        """Fill dest (a writable buffer) from the ring. Returns bytes copied."""
+        size = min(len(dest), self.available())
+        if size == 0:
+            return 0
+
+        start = self._read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        dest[:first] = self._view[start:start + first]
+        if first < size:
+            dest[first:size] = self._view[:size - first]
+
+        self._read_pos += size
+        return size
+
+    def read(self, size):
+        """Return up to size bytes from the ring as a new bytes object."""
+        out = bytearray(min(size, self.available()))
+        self.read_into(memoryview(out))
+        return bytes(out)
+
+    def clear(self):
+        self._read_pos = self._write_pos
+
+
+class ReplayBuffer:
+    """Bounded queue of recent audio chunks that keeps the newest audio.
+
+    Used to hold caller audio while the STT connection is down. Once more
+    than ``capacity_bytes`` is held, the oldest chunks are dropped.
+    """
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes
+        self._chunks = deque()
+        self._size = 0
+
+        self.bytes_dropped = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, data):
+        # Callers may pass views of pooled frames, so keep a private copy
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        while self._size > self.capacity and self._chunks:
+            dropped = self._chunks.popleft()
+            self._size -= len(dropped)
+            self.bytes_dropped += len(dropped)
+
+    def popleft(self):
+        chunk = self._chunks.popleft()
+        self._size -= len(chunk)
+        return chunk
+
+    def clear(self):
+        self._chunks.clear()
+        self._size = 0
@@ -0,0 +1,119 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from voiceai import config
+
+def calendar_zone():
+    """The calendar's IANA zone; naive times are read as wall-clock times in it."""
+    return ZoneInfo(config.CALENDAR_TIMEZONE)
+
+def parse_time(value, tz):
+    """Parse a Google Calendar timestamp; date-only values mean local midnight in tz."""
+    if len(value) == 10:
+        return datetime.fromisoformat(value).replace(tzinfo=tz)
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(value)
+    # Google reports busy periods in UTC; slots must come out in the calendar's zone
+    return parsed.astimezone(tz) if parsed.tzinfo else parsed.replace(tzinfo=tz)
+
+def busy_intervals(busy_times, events, tz):
+    """Parse freebusy periods and calendar events once into (start, end) pairs."""
+    intervals = []
+    skipped = 0
+
+    for busy in busy_times:
+        try:
+            intervals.append((parse_time(busy['start'], tz), parse_time(busy['end'], tz)))
+        except (KeyError, TypeError, ValueError):
+            skipped += 1
+
+    for event in events:
+        try:
+            start_field = event['start']
+            end_field = event['end']
+            start = start_field.get('dateTime') or start_field.get('date')
+            end = end_field.get('dateTime') or end_field.get('date')
+            intervals.append((parse_time(start, tz), parse_time(end, tz)))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            skipped += 1
+
+    if skipped:
+        print(f"  Skipped {skipped} malformed busy periods or events")
+    return intervals
+
+def merge_intervals(intervals):
+    """Sort intervals and merge any that overlap or touch."""
+    merged = []
+    for start, end in sorted(interval for interval in intervals if interval[1] > interval[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class SlotFinder:
+    """Finds free slots inside business hours with one sweep over merged busy intervals.
+
+    Candidate slots start on ``granularity_minutes`` boundaries and must end
+    by the close of business. The busy intervals are walked with a single
+    pointer, so the cost is linear in slots plus intervals. Business hours
+    are taken in the zone of ``start``, so pass a zoneinfo zone rather than
+    a fixed offset if the search may cross a DST change.
+    """
+
+    def __init__(self, business_start_hour=None, business_end_hour=None, include_weekends=None,
+                 slot_minutes=30, granularity_minutes=None, max_results=None):
+        self.business_start = time(business_start_hour if business_start_hour is not None
+                                   else config.BUSINESS_HOURS_START)
+        self.business_end = time(business_end_hour if business_end_hour is not None
+                                 else config.BUSINESS_HOURS_END)
+        self.include_weekends = (include_weekends if include_weekends is not None
+                                 else config.SCHEDULE_WEEKENDS)
+        self.slot = timedelta(minutes=slot_minutes)
+        self.granularity = timedelta(minutes=granularity_minutes or config.SLOT_GRANULARITY_MINUTES)
+        self.max_results = max_results or config.SLOT_SEARCH_MAX_RESULTS
+
+    def _align(self, moment):
+        """Round up to the next granularity boundary within the hour grid of that day."""
+        midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        steps = -(-(moment - midnight) // self.granularity)
+        return midnight + steps * self.granularity
+
+    def _windows(self, start, end):
+        tz = start.tzinfo
+        day = start.date()
+        while day <= end.date():
+            if self.include_weekends or day.weekday() < 5:
+                window_start = max(datetime.combine(day, self.business_start, tzinfo=tz), start)
+                window_end = min(datetime.combine(day, self.business_end, tzinfo=tz), end)
+                if window_start < window_end:
+                    yield window_start, window_end
+            day += timedelta(days=1)
+
+    def find(self, start, end, intervals):
+        """Return up to max_results free slot start times between start and end."""
+        start = start if start.tzinfo else start.replace(tzinfo=calendar_zone())
+        end = end if end.tzinfo else end.replace(tzinfo=calendar_zone())
+        busy = merge_intervals(intervals)
+
+        slots = []
+        index = 0
+        for window_start, window_end in self._windows(start, end):
+            cursor = self._align(window_start)
+            while cursor + self.slot <= window_end:
+                # Busy intervals that finished before the cursor can never matter again
+                while index < len(busy) and busy[index][1] <= cursor:
+                    index += 1
+
+                if index < len(busy) and busy[index][0] < cursor + self.slot:
+                    # Align in the window's zone so slots keep local times and midnights
+                    cursor = self._align(busy[index][1].astimezone(window_start.tzinfo))
+                    continue
+
+                slots.append(cursor)
+                if len(slots) >= self.max_results:
+                    return slots
+                cursor += self.slot
+        return slots
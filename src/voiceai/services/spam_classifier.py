@@ -0,0 +1,171 @@
+import re
+from collections import deque
+from voiceai import config
+
+# Curated robocall/scam phrases and how strongly each one suggests spam.
+# Phrases are matched on whole words after normalization (lowercase, punctuation stripped).
+SCAM_PHRASES = {
+    # Warranty and sales robocalls
+    "car warranty": 0.6,
+    "auto warranty": 0.6,
+    "vehicle warranty": 0.6,
+    "extended warranty": 0.6,
+    "vehicle service contract": 0.6,
+    "lower your interest rate": 0.7,
+    "student loan forgiveness": 0.6,
+    "pre approved": 0.4,
+    "solar panels": 0.4,
+    "timeshare": 0.5,
+    "this is not a sales call": 0.5,
+    "limited time offer": 0.5,
+    "act now": 0.4,
+    "final notice": 0.5,
+    "last chance": 0.3,
+    "press 1": 0.7,
+    "press one": 0.7,
+    "to be removed from our list": 0.6,
+    # Prizes and sweepstakes
+    "congratulations": 0.3,
+    "you have won": 0.6,
+    "you ve won": 0.6,
+    # Recruiters say this too; with "congratulations" alone it should only be a hint
+    "you have been selected": 0.5,
+    "you ve been selected": 0.5,
+    "free cruise": 0.7,
+    "free vacation": 0.6,
+    "sweepstakes": 0.6,
+    "lottery": 0.6,
+    "prize": 0.4,
+    "claim your": 0.4,
+    "gift card": 0.5,
+    # Sensitive information and account threats
+    "social security number": 0.7,
+    "ssn": 0.6,
+    "social security": 0.4,
+    "credit card number": 0.7,
+    "routing number": 0.6,
+    "bank account": 0.4,
+    "verify your account": 0.6,
+    "verify your identity": 0.5,
+    "account has been suspended": 0.7,
+    "account will be suspended": 0.7,
+    "suspicious activity": 0.4,
+    "arrest warrant": 0.8,
+    "legal action": 0.4,
+    "irs": 0.3,
+    "wire transfer": 0.5,
+    "bitcoin": 0.4,
+}
+
+DECLINE_RESPONSE = "I appreciate you calling, but we're not interested. Have a great day."
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def normalize(text):
+    return " " + _NON_WORD.sub(" ", text.lower()).strip() + " "
+
+
+class AhoCorasick:
+    """Compiled multi-pattern matcher: one pass over the text finds every pattern."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """Return the set of pattern indices that occur in text."""
+        found = set()
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if self._output[state]:
+                found.update(self._output[state])
+        return found
+
+
+class SpamClassifier:
+    """Local fast-path screen that runs before any LLM round trip.
+
+    Each matched phrase adds its weight to the score (capped at 1.0); a
+    phrase that is part of a longer matched phrase ("social security" in
+    "social security number") is not counted again. Scores at or above
+    the decline threshold are declined locally; scores above the hint
+    threshold are passed to the LLM as a hint.
+    """
+
+    def __init__(self, phrases=None, decline_threshold=None, hint_threshold=None):
+        self.phrases = phrases or SCAM_PHRASES
+        self.decline_threshold = config.SPAM_DECLINE_THRESHOLD if decline_threshold is None else decline_threshold
+        self.hint_threshold = config.SPAM_HINT_THRESHOLD if hint_threshold is None else hint_threshold
+
+        self._names = list(self.phrases)
+        # Pad with spaces so patterns only match whole words of the normalized text
+        self._patterns = [normalize(phrase) for phrase in self._names]
+        self._matcher = AhoCorasick(self._patterns)
+
+        self.declined = 0
+        self.hinted = 0
+
+    def classify(self, transcript, record=True):
+        """Score transcript; with record=False the decline/hint counters are left for record()."""
+        found = self._matcher.find(normalize(transcript))
+        # Drop phrases contained in a longer match so one indicator is not scored twice
+        matched = sorted(
+            self._names[i] for i in found
+            if not any(j != i and self._patterns[i] in self._patterns[j] for j in found)
+        )
+        # Rounded so sums like 0.3 + 0.6 compare with the thresholds as written
+        score = round(min(1.0, sum(self.phrases[name] for name in matched)), 2)
+
+        if score >= self.decline_threshold:
+            decision = "decline"
+        elif score >= self.hint_threshold:
+            decision = "hint"
+        else:
+            decision = "none"
+
+        verdict = {"decision": decision, "score": score, "matches": matched}
+        if record:
+            self.record(verdict)
+        return verdict
+
+    def record(self, verdict):
+        if verdict["decision"] == "decline":
+            self.declined += 1
+        elif verdict["decision"] == "hint":
+            self.hinted += 1
+
+    @staticmethod
+    def format_hint(verdict):
+        phrases = ", ".join(f"'{name}'" for name in verdict["matches"])
+        return f"[Local screening: matched {phrases}; spam score {verdict['score']:.2f}]"
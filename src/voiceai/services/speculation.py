@@ -0,0 +1,133 @@
+import asyncio
+import re
+import time
+from voiceai import config
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+def normalize_transcript(text):
+    return " ".join(_WORD.findall(text.lower()))
+
+
+class SpeculativeTurnRunner:
+    """Starts LLM turns from partial transcripts before the caller's turn ends.
+
+    Once a partial transcript has not changed for ``stable_ms``, a draft
+    reply is requested in the background. When the final transcript arrives,
+    ``resolve`` hands back the draft if the words match, or cancels it and
+    returns None if the caller said something else.
+    """
+
+    def __init__(self, engine, stable_ms=None):
+        self.engine = engine
+        self.stable_seconds = (stable_ms or config.SPECULATION_STABLE_MS) / 1000
+
+        self._partial = ""
+        self._timer = None
+        self._task = None
+        self._task_text = ""
+        self._task_started = 0.0
+        self._task_duration = None
+
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+        self.saved_ms = 0.0
+
+    def on_partial(self, transcript):
+        text = normalize_transcript(transcript)
+        if not text or text == self._partial:
+            return
+
+        self._partial = text
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._task is not None and self._task_text != text:
+            self._cancel_task()
+            self.cancelled += 1
+
+        self._timer = asyncio.create_task(self._start_when_stable(transcript, text))
+
+    async def _start_when_stable(self, transcript, text):
+        await asyncio.sleep(self.stable_seconds)
+        self._timer = None
+        if self._task is not None:
+            return
+
+        self.started += 1
+        self._task_text = text
+        self._task_started = time.monotonic()
+        self._task_duration = None
+        self._task = asyncio.create_task(self._draft(transcript))
+
+    async def _draft(self, transcript):
+        try:
+            return await self.engine.draft_turn(transcript)
+        finally:
+            self._task_duration = time.monotonic() - self._task_started
+
+    async def resolve(self, final_transcript):
+        """Return the speculative draft for final_transcript, or None on a miss."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        task = self._task
+        text = normalize_transcript(final_transcript)
+        self._partial = ""
+
+        if task is None:
+            return None
+
+        if self._task_text != text:
+            self._cancel_task()
+            self.misses += 1
+            return None
+
+        head_start = time.monotonic() - self._task_started
+        self._task = None
+        try:
+            draft = await task
+        except Exception as e:
+            print(f"Speculative turn failed: {e}")
+            self.misses += 1
+            return None
+
+        if not self.engine.is_draft_current(draft):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.saved_ms += min(head_start, self._task_duration or head_start) * 1000
+        return draft
+
+    def _cancel_task(self):
+        if self._task is not None:
+            if self._task.done():
+                # Retrieve a failed draft's exception so asyncio does not log it as unhandled
+                if not self._task.cancelled():
+                    self._task.exception()
+            else:
+                self._task.cancel()
+        self._task = None
+        self._task_text = ""
+
+    def reset(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._cancel_task()
+        self._partial = ""
+
+    def get_stats(self):
+        resolved = self.hits + self.misses
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "cancelled": self.cancelled,
+            "hit_rate": self.hits / resolved if resolved else 0.0,
+            "saved_ms_total": round(self.saved_ms),
+            "saved_ms_avg": round(self.saved_ms / self.hits) if self.hits else 0,
+        }
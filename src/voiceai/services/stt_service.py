@@ -1,43 +1,71 @@
 import asyncio
+import random
+import time
 import websockets
 import json
 from voiceai import config
+from voiceai.services.ring_buffer import ReplayBuffer
+from voiceai.services.uplink import UplinkSender
 
 class AssemblyAISTTService:
-    """Real-time STT client for AssemblyAI Universal Streaming."""
-
+    """Real-time STT client for AssemblyAI Universal Streaming.
+    
+    If the WebSocket drops mid-call, the service reconnects with exponential
+    backoff and jitter. Audio sent while it is down is held in a bounded
+    replay buffer and sent to the new session once it is up, so callers keep
+    streaming (``is_streaming``) even while ``is_connected`` is False.
+    
+    Outgoing audio goes through an UplinkSender, which re-cuts it into
+    fixed-duration frames and drops the oldest ones if the network falls
+    behind.
+    """
+    
     def __init__(self, on_transcript_callback):
         self.api_key = config.ASSEMBLYAI_API_KEY
+        self.url = config.ASSEMBLYAI_STREAMING_URL
         self.on_transcript_callback = on_transcript_callback
         self.websocket = None
         self.is_connected = False
+        self.is_streaming = False
+        
+        replay_bytes = int(config.STT_REPLAY_BUFFER_SECONDS * config.AUDIO_SAMPLE_RATE * 2)
+        self.replay_buffer = ReplayBuffer(replay_bytes)
+        self.uplink = UplinkSender(self._send)
+        self._listener = None
+        self._reconnect_task = None
+        self._gap_started = None
         
+        self.reconnects = 0
+        self.failed_reconnects = 0
+        self.gaps_ms = []
+        self.replayed_bytes = 0
+    
     async def connect(self):
         try:
             print("Connecting to AssemblyAI Universal Streaming...")
-            
-            # Use the new Universal Streaming WebSocket endpoint
-            uri = f"wss://streaming.assemblyai.com/v3/ws?sample_rate={config.AUDIO_SAMPLE_RATE}"
-            headers = {"Authorization": self.api_key}
-            
-            self.websocket = await websockets.connect(uri, extra_headers=headers)
-            self.is_connected = True
-            
+            await self._open()
             print("AssemblyAI Universal Streaming WebSocket connected")
-            
-            # Start listening for responses in background
-            asyncio.create_task(self._listen_for_responses())
-            
             return True
         except Exception as e:
             print(f"AssemblyAI connection failed: {e}")
             self.is_connected = False
             return False
     
-    async def _listen_for_responses(self):
+    async def _open(self):
+        # Use the new Universal Streaming WebSocket endpoint
+        uri = f"{self.url}?sample_rate={config.AUDIO_SAMPLE_RATE}"
+        headers = {"Authorization": self.api_key}
+        
+        self.websocket = await websockets.connect(uri, extra_headers=headers)
+        self.is_connected = True
+        
+        # Start listening for responses in background
+        self._listener = asyncio.create_task(self._listen_for_responses(self.websocket))
+    
+    async def _listen_for_responses(self, websocket):
         """Listen for transcription responses and forward them to the callback."""
         try:
-            async for message in self.websocket:
+            async for message in websocket:
                 response = json.loads(message)
                 
                 if 'transcript' in response and response['transcript']:
@@ -47,37 +75,130 @@ class AssemblyAISTTService:
                     is_final = response.get('end_of_turn', False)
                     
                     await self.on_transcript_callback(transcript, is_final)
-                    
+            
+            print("[AssemblyAI] WebSocket connection closed")
         except websockets.exceptions.ConnectionClosed:
             print("[AssemblyAI] WebSocket connection closed")
-            self.is_connected = False
         except Exception as e:
             print(f"[AssemblyAI] Response error: {e}")
-            self.is_connected = False
+        
+        if websocket is self.websocket:
+            self._connection_lost()
+    
+    def _connection_lost(self):
+        self.is_connected = False
+        if not self.is_streaming or self._reconnect_task is not None:
+            return
+        self._gap_started = time.monotonic()
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+    
+    def _backoff_delay(self, attempt):
+        # The first retry is immediate; later ones back off exponentially with jitter
+        if attempt == 0:
+            return 0
+        delay = config.RECONNECT_BASE_DELAY * (2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
+    
+    async def _reconnect(self):
+        try:
+            for attempt in range(config.RECONNECT_MAX_RETRIES):
+                await asyncio.sleep(self._backoff_delay(attempt))
+                if not self.is_streaming:
+                    return
+                
+                old = self.websocket
+                self.websocket = None
+                if old is not None:
+                    try:
+                        await old.close()
+                    except Exception:
+                        pass
+                
+                try:
+                    print(f"[AssemblyAI] Reconnecting (attempt {attempt + 1}/{config.RECONNECT_MAX_RETRIES})...")
+                    await self._open()
+                    # Hold new audio back until the buffered audio has gone out in order
+                    self.is_connected = False
+                    await self._replay()
+                    self.is_connected = True
+                except Exception as e:
+                    print(f"[AssemblyAI] Reconnect failed: {e}")
+                    self.is_connected = False
+                    continue
+                
+                gap_ms = (time.monotonic() - self._gap_started) * 1000
+                self.gaps_ms.append(gap_ms)
+                self.reconnects += 1
+                print(f"[AssemblyAI] Reconnected after {gap_ms:.0f} ms")
+                return
+            
+            self.failed_reconnects += 1
+            self.is_streaming = False
+            self.replay_buffer.clear()
+            print("[AssemblyAI] Giving up on reconnecting; no more audio will be transcribed")
+        finally:
+            self._reconnect_task = None
+    
+    async def _replay(self):
+        while len(self.replay_buffer):
+            chunk = self.replay_buffer.popleft()
+            await self.websocket.send(chunk)
+            self.replayed_bytes += len(chunk)
     
     async def stream_audio(self, audio_data):
+        if self.is_streaming:
+            self.uplink.push(audio_data)
+    
+    async def _send(self, audio_data):
         if self.websocket and self.is_connected:
             try:
                 # Send raw audio data directly to WebSocket
                 await self.websocket.send(audio_data)
+                return
             except Exception as e:
                 print(f"[AssemblyAI] Stream error: {e}")
-                self.is_connected = False
+                self._connection_lost()
+        
+        if self.is_streaming:
+            self.replay_buffer.append(audio_data)
     
     async def start_streaming(self):
         """Start the Universal Streaming connection"""
         if self.is_connected:
+            self.is_streaming = True
+            self.uplink.start()
             print("AssemblyAI Universal Streaming ready")
             return True
         else:
             print("AssemblyAI not connected")
             return False
     
+    def get_stats(self):
+        return {
+            "connected": self.is_connected,
+            "reconnects": self.reconnects,
+            "failed_reconnects": self.failed_reconnects,
+            "gaps_ms": [round(gap) for gap in self.gaps_ms],
+            "max_gap_ms": round(max(self.gaps_ms)) if self.gaps_ms else 0,
+            "replayed_bytes": self.replayed_bytes,
+            "dropped_bytes": self.replay_buffer.bytes_dropped,
+            "uplink": self.uplink.get_stats(),
+        }
+    
     async def disconnect(self):
+        if self.is_streaming and self.is_connected:
+            self.uplink.flush()
+            await self.uplink.drain()
+        await self.uplink.stop()
+        self.is_streaming = False
         self.is_connected = False
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self.replay_buffer.clear()
         if self.websocket:
             try:
                 await self.websocket.close()
             except Exception as e:
                 print(f"[AssemblyAI] Disconnect error: {e}")
-        self.websocket = None
\ No newline at end of file
+        self.websocket = None
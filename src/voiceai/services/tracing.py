@@ -0,0 +1,175 @@
+import contextvars
+import itertools
+import json
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from voiceai import config
+
+_current_call = contextvars.ContextVar("trace_call_id", default=None)
+_current_turn = contextvars.ContextVar("trace_turn", default=None)
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class InMemoryExporter:
+    """Keeps the most recent trace records in a ring."""
+
+    def __init__(self, capacity=None):
+        self.records = deque(maxlen=capacity or config.TRACE_MEMORY_RECORDS)
+
+    def export(self, record):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+class JsonlExporter:
+    """Appends one JSON object per trace record to a file."""
+
+    def __init__(self, path=None):
+        self.path = path or config.TRACE_FILE
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Buffered; records reach disk in blocks rather than one write per span
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def export(self, record):
+        self._file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class _Turn:
+    def __init__(self, call_id, turn_id):
+        self.call_id = call_id
+        self.turn_id = turn_id
+        self.started = time.monotonic()
+        self.seen = set()
+
+
+class Tracer:
+    """Lightweight per-turn latency tracing.
+
+    Call and turn ids live in context variables, so any code running in the
+    turn's task (or tasks it spawns) is attributed to it without passing ids
+    around. Spans measure how long a stage took; events mark how long after
+    the caller's end of turn something happened. Records go to a pluggable
+    exporter, and ``report`` gives p50/p95/p99 per stage.
+    """
+
+    def __init__(self, exporter=None, enabled=True, max_samples=None):
+        self.exporter = exporter
+        self.enabled = enabled
+        self.max_samples = max_samples or config.TRACE_MAX_SAMPLES
+        self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._turn_ids = itertools.count(1)
+
+    def start_call(self, call_id):
+        _current_call.set(call_id)
+        _current_turn.set(None)
+
+    def start_turn(self):
+        """Begin a new turn in the current context and return its id."""
+        if not self.enabled:
+            return None
+        turn = _Turn(_current_call.get(), next(self._turn_ids))
+        _current_turn.set(turn)
+        return turn.turn_id
+
+    def current_ids(self):
+        turn = _current_turn.get()
+        return _current_call.get(), turn.turn_id if turn else None
+
+    def event(self, name, once=False, **attrs):
+        """Mark a point in the turn, measured from the turn start."""
+        if not self.enabled:
+            return
+        turn = _current_turn.get()
+        if turn is None:
+            return
+        if once:
+            if name in turn.seen:
+                return
+            turn.seen.add(name)
+
+        offset_ms = (time.monotonic() - turn.started) * 1000
+        self._emit(turn, name, "event", offset_ms, None, attrs)
+
+    def record_span(self, name, started, ended=None, **attrs):
+        """Record a stage that started at monotonic time started and ended at ended (default now)."""
+        if not self.enabled:
+            return
+        ended = ended if ended is not None else time.monotonic()
+        turn = _current_turn.get()
+        offset_ms = (started - turn.started) * 1000 if turn else None
+        self._emit(turn, name, "span", offset_ms, (ended - started) * 1000, attrs)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        if not self.enabled:
+            yield
+            return
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_span(name, started, **attrs)
+
+    def _emit(self, turn, name, kind, offset_ms, duration_ms, attrs):
+        call_id = turn.call_id if turn else _current_call.get()
+        value = duration_ms if kind == "span" else offset_ms
+        self._samples[name].append((call_id, value))
+
+        if self.exporter is not None:
+            record = {
+                "ts": time.time(),
+                "call_id": call_id,
+                "turn_id": turn.turn_id if turn else None,
+                "name": name,
+                "kind": kind,
+                "offset_ms": round(offset_ms, 2) if offset_ms is not None else None,
+                "duration_ms": round(duration_ms, 2) if duration_ms is not None else None,
+            }
+            if attrs:
+                record["attrs"] = attrs
+            try:
+                self.exporter.export(record)
+            except Exception as e:
+                print(f"Trace export error: {e}")
+
+    def report(self, call_id=None):
+        """p50/p95/p99 in ms per stage: span durations, or event times after end of turn."""
+        report = {}
+        for name, samples in sorted(self._samples.items()):
+            values = [value for cid, value in samples if call_id is None or cid == call_id]
+            if not values:
+                continue
+            report[name] = {
+                "count": len(values),
+                "p50": round(percentile(values, 0.50), 1),
+                "p95": round(percentile(values, 0.95), 1),
+                "p99": round(percentile(values, 0.99), 1),
+            }
+        return report
+
+    def close(self):
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+def build_exporter(kind=None):
+    kind = kind or config.TRACE_EXPORTER
+    if kind == "jsonl":
+        return JsonlExporter()
+    if kind == "memory":
+        return InMemoryExporter()
+    return None
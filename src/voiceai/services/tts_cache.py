@@ -0,0 +1,169 @@
+import hashlib
+import json
+import mmap
+import os
+from collections import OrderedDict
+from voiceai import config
+
+class TTSCache:
+    """Content-addressed TTS audio cache: in-memory LRU over raw PCM files on disk.
+
+    Entries are keyed by a hash of everything that affects the synthesized
+    audio. Hits are served as read-only memoryviews over an mmap of the PCM
+    file, so cached audio is never copied on the way to the player.
+
+    Both tiers are bounded: once the files on disk exceed ``max_disk_bytes``
+    the least recently used ones are deleted, so one-off replies do not
+    pile up across calls.
+    """
+
+    def __init__(self, cache_dir=None, max_memory_bytes=None, max_disk_bytes=None):
+        self.cache_dir = cache_dir or config.TTS_CACHE_DIR
+        self.max_memory_bytes = max_memory_bytes or config.TTS_CACHE_MEMORY_MB * 1024 * 1024
+        self.max_disk_bytes = max_disk_bytes or config.TTS_CACHE_DISK_MB * 1024 * 1024
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._files = self._scan_files()
+        self._disk_bytes = sum(self._files.values())
+
+    @staticmethod
+    def make_key(text, voice_id, model_id, output_format):
+        payload = json.dumps([text, voice_id, model_id, output_format], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pcm")
+
+    def _scan_files(self):
+        """Return {key: size} for the files already on disk, least recently used first."""
+        found = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".pcm"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, entry.name[:-len(".pcm")], stat.st_size))
+        found.sort()
+        return OrderedDict((key, size) for _, key, size in found)
+
+    def _touch(self, key):
+        if key in self._files:
+            self._files.move_to_end(key)
+            try:
+                # The mtime carries the LRU order over to the next process
+                os.utime(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key):
+        """Return cached audio as a memoryview, or None on a miss."""
+        view = self._entries.get(key)
+        if view is not None:
+            self._entries.move_to_end(key)
+            if key in self._files:
+                self._files.move_to_end(key)
+            self.hits += 1
+            return view
+
+        view = self._load(key)
+        if view is None:
+            self.misses += 1
+            return None
+
+        self._touch(key)
+        self._remember(key, view)
+        self.hits += 1
+        return view
+
+    def put(self, key, chunks):
+        """Write audio chunks to disk and return the cached memoryview."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(tmp_path, "wb") as f:
+                f.writelines(chunks)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"TTS cache write error: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        view = self._load(key)
+        if view is not None:
+            self._disk_bytes += len(view) - self._files.pop(key, 0)
+            self._files[key] = len(view)
+            self._evict_files(keep=key)
+            self._remember(key, view)
+        return view
+
+    def _evict_files(self, keep):
+        while self._disk_bytes > self.max_disk_bytes and len(self._files) > 1:
+            key, size = next(iter(self._files.items()))
+            if key == keep:
+                break
+            del self._files[key]
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+            # Views already handed out stay valid: the mmap outlives the file
+            evicted = self._entries.pop(key, None)
+            if evicted is not None:
+                self._memory_bytes -= len(evicted)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"TTS cache eviction error: {e}")
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                # The mapping stays valid after the file is closed and is
+                # released once the last view over it is dropped
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(mapped)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"TTS cache read error: {e}")
+            return None
+
+    def _remember(self, key, view):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+
+        self._entries[key] = view
+        self._memory_bytes += len(view)
+
+        while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_bytes": self._memory_bytes,
+            "files": len(self._files),
+            "disk_bytes": self._disk_bytes,
+            "disk_evictions": self.disk_evictions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,21 +1,36 @@
 import asyncio
-from elevenlabs.client import AsyncElevenLabs
+import time
 from voiceai import config
-import sounddevice as sd
-import numpy as np
+from voiceai.services.playback import StreamingPlayer
+from voiceai.services.tts_cache import TTSCache
+from voiceai.services.tracing import Tracer
+
+def _default_client(api_key):
+    # The ElevenLabs SDK takes a while to import, so it is only loaded when no client is passed in
+    from elevenlabs.client import AsyncElevenLabs
+    return AsyncElevenLabs(api_key=api_key)
+
 
 class ElevenLabsTTSService:
     """Text-to-speech via ElevenLabs streaming API."""
 
-    def __init__(self):
+    def __init__(self, client=None, cache=None, tracer=None, player=None):
         self.api_key = config.ELEVENLABS_API_KEY
         self.voice_id = config.ELEVENLABS_VOICE_ID
         self.model_id = config.ELEVENLABS_MODEL_ID
-        self.client = AsyncElevenLabs(api_key=self.api_key)
+        self.output_format = "pcm_16000"
+        self.client = client or _default_client(self.api_key)
         self.greeting_audio_cache = None
+        self.tracer = tracer or Tracer(enabled=False)
+        self.player = player or StreamingPlayer(sample_rate=16000, tracer=self.tracer)
+        self.cache = cache or TTSCache()
+        # Bumped on every interruption; speech started under an older epoch stops
+        self._epoch = 0
+        self.interruptions = 0
         
     async def connect(self):
         try:
+            self.player.start()
             return True
         except Exception as e:
             return False
@@ -25,67 +40,175 @@ class ElevenLabsTTSService:
             return self.greeting_audio_cache
         
         try:
-            audio_data = b""
-            async for chunk in self.stream_text(greeting_text):
-                audio_data += chunk
-            
+            audio_data = await self.synthesize(greeting_text)
             self.greeting_audio_cache = audio_data
             return audio_data
         except Exception as e:
             return None
     
+    def _cache_key(self, text):
+        return TTSCache.make_key(text, self.voice_id, self.model_id, self.output_format)
+    
+    async def synthesize(self, text):
+        """Return the full audio for text, from the cache when possible."""
+        key = self._cache_key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        audio_chunks = []
+        async for chunk in self.stream_text(text):
+            if not chunk:
+                # stream_text only yields an empty chunk when the request failed
+                return None
+            audio_chunks.append(chunk)
+        
+        if not audio_chunks:
+            return None
+        return self.cache.put(key, audio_chunks)
+    
     async def stream_text(self, text):
+        audio_stream = None
+        started = time.monotonic()
+        first_byte = None
         try:
             audio_stream = self.client.text_to_speech.convert_as_stream(
                 voice_id=self.voice_id,
                 text=text,
                 model_id=self.model_id,
-                output_format="pcm_16000"
+                output_format=self.output_format
             )
             
             chunk_count = 0
             async for chunk in audio_stream:
                 if chunk:
+                    if first_byte is None:
+                        first_byte = time.monotonic()
+                        self.tracer.event("tts.first_byte", once=True)
                     chunk_count += 1
                     yield chunk
             
+            self.tracer.event("tts.last_byte")
+            if first_byte is not None:
+                self.tracer.record_span("tts.stream", started, chars=len(text),
+                                        ttfb_ms=round((first_byte - started) * 1000, 1))
+            
             if chunk_count == 0:
                 print("Warning: ElevenLabs returned 0 audio chunks")
                     
         except Exception as e:
             print(f"ElevenLabs TTS error: {e}")
             yield b""
+        finally:
+            # Closes the HTTP stream right away when the caller stops early
+            if audio_stream is not None and hasattr(audio_stream, "aclose"):
+                await audio_stream.aclose()
+    
+    def interrupt(self):
+        """Stop speaking now: drop queued audio and abandon in-flight synthesis."""
+        self._epoch += 1
+        self.interruptions += 1
+        self.player.clear()
     
     async def speak_text(self, text):
+        """Speak text and wait for playback. Returns False if it was interrupted."""
+        epoch = self._epoch
         try:
-            audio_chunks = []
-            async for chunk in self.stream_text(text):
-                if chunk:
-                    audio_chunks.append(chunk)
+            if await self._queue_speech(text, epoch):
+                await self.player.drain()
+            elif self._epoch == epoch:
+                print("Warning: No audio data generated")
+                
+        except Exception as e:
+            print(f"TTS speak error: {e}")
+        return self._epoch == epoch
+    
+    async def speak_queue(self, queue):
+        """Speak sentences from an asyncio.Queue until a None sentinel arrives.
+        
+        Each sentence is synthesized as soon as it is queued, so synthesis of
+        one sentence overlaps playback of the previous one. Returns False if
+        it was interrupted; later sentences are then discarded unspoken.
+        """
+        epoch = self._epoch
+        spoke = False
+        try:
+            while True:
+                sentence = await queue.get()
+                if sentence is None:
+                    break
+                if self._epoch != epoch:
+                    continue
+                # One sentence failing to synthesize should not silence the rest of the turn
+                try:
+                    if await self._queue_speech(sentence, epoch):
+                        spoke = True
+                except Exception as e:
+                    print(f"TTS speak error: {e}")
             
-            if audio_chunks:
-                full_audio = b"".join(audio_chunks)
-                if len(full_audio) > 0:
-                    await self._play_audio(full_audio, sample_rate=16000)
-                else:
-                    print("Warning: No audio data generated")
+            if spoke and self._epoch == epoch:
+                await self.player.drain()
                 
         except Exception as e:
             print(f"TTS speak error: {e}")
+        return self._epoch == epoch
+    
+    async def _queue_speech(self, text, epoch=None):
+        """Write the audio for text into the player without waiting for playback."""
+        if epoch is None:
+            epoch = self._epoch
+        
+        key = self._cache_key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            await self.player.write(cached)
+            return True
+        
+        audio_chunks = []
+        failed = False
+        stream = self.stream_text(text)
+        try:
+            async for chunk in stream:
+                if self._epoch != epoch:
+                    # Interrupted: a partial clip must not end up in the cache
+                    failed = True
+                    break
+                if not chunk:
+                    # stream_text only yields an empty chunk when the request failed
+                    failed = True
+                    continue
+                await self.player.write(chunk)
+                audio_chunks.append(chunk)
+        finally:
+            await stream.aclose()
+        
+        if audio_chunks and not failed:
+            self.cache.put(key, audio_chunks)
+        return bool(audio_chunks)
     
     async def _play_audio(self, audio_data, sample_rate=16000):
         try:
             if len(audio_data) == 0:
                 return
-                
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            sd.play(audio_array, samplerate=sample_rate, blocking=False)
-            sd.wait()
+            
+            await self.player.write(audio_data)
+            await self.player.drain()
                 
         except Exception as e:
             print(f"Audio playback error: {e}")
     
+    def get_playback_stats(self):
+        return self.player.get_stats()
+    
+    def get_cache_stats(self):
+        return self.cache.get_stats()
+    
+    def close(self):
+        self.player.close()
+    
     def play_audio_sync(self, audio_data, sample_rate=16000):
+        import numpy as np
+        import sounddevice as sd
         try:
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
             sd.play(audio_array, samplerate=sample_rate)
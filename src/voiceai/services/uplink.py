@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import deque
+from voiceai import config
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class UplinkSender:
+    """Coalesces caller audio into fixed-duration frames and sends them in order.
+
+    Audio is re-cut into ``frame_ms`` messages (AssemblyAI wants 50-1000 ms
+    per message) and queued for a single sender task. The queue holds at
+    most ``max_queue_ms`` of audio; when the network falls behind, the oldest
+    frames are dropped so STT latency stays bounded instead of growing with
+    the backlog.
+    """
+
+    def __init__(self, send, frame_ms=None, max_queue_ms=None, sample_rate=None):
+        self.send = send
+        self.frame_ms = frame_ms or config.UPLINK_FRAME_MS
+        sample_rate = sample_rate or config.AUDIO_SAMPLE_RATE
+        self.frame_bytes = sample_rate * 2 * self.frame_ms // 1000
+        max_queue_ms = max_queue_ms or config.UPLINK_MAX_QUEUE_MS
+        self.max_queue_frames = max(1, max_queue_ms // self.frame_ms)
+
+        self._pending = bytearray()
+        self._queue = deque()
+        self._ready = asyncio.Event()
+        self._task = None
+
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.max_depth = 0
+        self._send_latency = deque(maxlen=500)
+        self._queue_delay = deque(maxlen=500)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def push(self, audio_data):
+        """Add captured audio; never blocks."""
+        self._pending += audio_data
+        while len(self._pending) >= self.frame_bytes:
+            self._enqueue(bytes(self._pending[:self.frame_bytes]))
+            del self._pending[:self.frame_bytes]
+
+    def flush(self):
+        """Queue any leftover partial frame, e.g. at the end of a call."""
+        if self._pending:
+            self._enqueue(bytes(self._pending))
+            self._pending.clear()
+
+    def _enqueue(self, frame):
+        if len(self._queue) >= self.max_queue_frames:
+            self._queue.popleft()
+            self.frames_dropped += 1
+        self._queue.append((frame, time.monotonic()))
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._ready.set()
+
+    async def _run(self):
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            frame, queued_at = self._queue.popleft()
+            started = time.monotonic()
+            try:
+                await self.send(frame)
+            except Exception as e:
+                print(f"Uplink send error: {e}")
+            finished = time.monotonic()
+            self.frames_sent += 1
+            self._queue_delay.append((started - queued_at) * 1000)
+            self._send_latency.append((finished - started) * 1000)
+
+    async def drain(self, timeout=1.0):
+        """Wait briefly for queued frames to go out."""
+        deadline = time.monotonic() + timeout
+        while self._queue and time.monotonic() < deadline:
+            await asyncio.sleep(self.frame_ms / 1000)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._queue.clear()
+        self._pending.clear()
+
+    def get_stats(self):
+        return {
+            "queue_depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "send_ms_p50": round(_percentile(self._send_latency, 0.5), 1),
+            "send_ms_p95": round(_percentile(self._send_latency, 0.95), 1),
+            "queue_ms_p95": round(_percentile(self._queue_delay, 0.95), 1),
+        }
@@ -0,0 +1,172 @@
+from collections import deque
+from voiceai import config
+from voiceai.services.frame_pool import AudioFrame
+
+class VADFramer:
+    """Re-slices arbitrary capture chunks into fixed-size VAD frames."""
+
+    def __init__(self, frame_bytes):
+        self.frame_bytes = frame_bytes
+        self._pending = bytearray()
+
+    def push(self, audio_data):
+        self._pending += audio_data
+        frame_count = len(self._pending) // self.frame_bytes
+        if frame_count == 0:
+            return []
+
+        end = frame_count * self.frame_bytes
+        frames = [
+            bytes(self._pending[i:i + self.frame_bytes])
+            for i in range(0, end, self.frame_bytes)
+        ]
+        del self._pending[:end]
+        return frames
+
+    def reset(self):
+        self._pending.clear()
+
+
+class VADGate:
+    """Decides which audio frames are worth sending to STT.
+
+    Frames are ``AudioFrame`` views holding one or more VAD frames; a frame
+    counts as speech if any of its VAD frames does. Speech passes through
+    together with a short pre-roll of the audio just before speech started.
+    After speech ends the gate stays open for a hangover period so the STT
+    service still hears the silence it needs to detect end of turn. During
+    longer silences only a short keep-alive burst is sent every
+    ``keepalive_interval_ms``.
+
+    Frames returned by ``process`` are retained for the caller, who releases
+    them once they have been sent.
+    """
+
+    def __init__(self, is_speech, frame_bytes, frame_ms=None, preroll_ms=None,
+                 hangover_ms=None, keepalive_interval_ms=None, keepalive_ms=None):
+        self.is_speech = is_speech
+        self.frame_bytes = frame_bytes
+        self.frame_ms = frame_ms or config.VAD_FRAME_DURATION_MS
+
+        self.preroll_ms = preroll_ms if preroll_ms is not None else config.VAD_PREROLL_MS
+        self.hangover_ms = hangover_ms if hangover_ms is not None else config.VAD_HANGOVER_MS
+        self.keepalive_interval_ms = keepalive_interval_ms or config.VAD_KEEPALIVE_INTERVAL_MS
+        self.keepalive_ms = keepalive_ms if keepalive_ms is not None else config.VAD_KEEPALIVE_MS
+
+        self.framer = VADFramer(frame_bytes)
+        self._preroll = deque()
+        self._preroll_held_ms = 0
+        self._active = False
+        self._hangover_left_ms = 0
+        self._silent_ms = 0
+
+        self.frames_sent = 0
+        self.frames_suppressed = 0
+        self.speech_frames = 0
+
+    def process(self, frame):
+        """Classify one frame and return the list of frames to send."""
+        view = frame.view
+        units = len(view) // self.frame_bytes
+        duration_ms = units * self.frame_ms
+
+        speech_units = 0
+        for i in range(units):
+            offset = i * self.frame_bytes
+            if self.is_speech(view[offset:offset + self.frame_bytes]):
+                speech_units += 1
+
+        if speech_units:
+            self.speech_frames += speech_units
+            self._hangover_left_ms = self.hangover_ms
+            self._silent_ms = 0
+            if self._active:
+                out = [frame.retain()]
+            else:
+                self._active = True
+                # Pre-roll frames were counted as suppressed when they were held back
+                out = list(self._preroll)
+                for held in out:
+                    self.frames_suppressed -= len(held) // self.frame_bytes
+                self._preroll.clear()
+                self._preroll_held_ms = 0
+                out.append(frame.retain())
+        elif self._active and self._hangover_left_ms > 0:
+            self._hangover_left_ms -= duration_ms
+            if self._hangover_left_ms <= 0:
+                self._active = False
+            out = [frame.retain()]
+        else:
+            self._active = False
+            self._silent_ms += duration_ms
+            position = self._silent_ms % self.keepalive_interval_ms
+            if position >= self.keepalive_interval_ms - self.keepalive_ms:
+                out = [frame.retain()]
+            else:
+                out = []
+                self._hold_preroll(frame, duration_ms)
+                self.frames_suppressed += units
+
+        for sent in out:
+            self.frames_sent += len(sent) // self.frame_bytes
+        return out
+
+    def _hold_preroll(self, frame, duration_ms):
+        if self.preroll_ms <= 0:
+            return
+        self._preroll.append(frame.retain())
+        self._preroll_held_ms += duration_ms
+        # Keep the shortest run of recent frames that still covers preroll_ms
+        while len(self._preroll) > 1:
+            oldest_ms = len(self._preroll[0]) // self.frame_bytes * self.frame_ms
+            if self._preroll_held_ms - oldest_ms < self.preroll_ms:
+                break
+            self._preroll.popleft().release()
+            self._preroll_held_ms -= oldest_ms
+
+    def hold(self, frame):
+        """Keep frame as pre-roll without sending anything, e.g. while the greeting plays."""
+        units = len(frame.view) // self.frame_bytes
+        self._hold_preroll(frame, units * self.frame_ms)
+        self.frames_suppressed += units
+
+    def hold_bytes(self, audio_data):
+        """Like hold, for a plain bytes capture chunk."""
+        for chunk in self.framer.push(audio_data):
+            frame = AudioFrame.wrap(chunk)
+            self.hold(frame)
+            frame.release()
+
+    def filter(self, audio_data):
+        """Run a plain bytes capture chunk through the gate and return the bytes to send."""
+        out = []
+        for chunk in self.framer.push(audio_data):
+            frame = AudioFrame.wrap(chunk)
+            out.extend(self.process(frame))
+            frame.release()
+        payload = b"".join(sent.view for sent in out)
+        for sent in out:
+            sent.release()
+        return payload
+
+    def reset(self):
+        self.framer.reset()
+        for held in self._preroll:
+            held.release()
+        self._preroll.clear()
+        self._preroll_held_ms = 0
+        self._active = False
+        self._hangover_left_ms = 0
+        self._silent_ms = 0
+        self.frames_sent = 0
+        self.frames_suppressed = 0
+        self.speech_frames = 0
+
+    def get_stats(self):
+        total = self.frames_sent + self.frames_suppressed
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_suppressed": self.frames_suppressed,
+            "speech_frames": self.speech_frames,
+            "suppressed_ratio": self.frames_suppressed / total if total else 0.0,
+        }
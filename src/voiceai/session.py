@@ -0,0 +1,635 @@
+import asyncio
+import uuid
+from datetime import datetime
+from src.voiceai.services.audio_handler import AudioHandler
+from src.voiceai.services.stt_service import AssemblyAISTTService
+from src.voiceai.services.llm_service import ConversationEngine
+from src.voiceai.services.tts_service import ElevenLabsTTSService
+from src.voiceai.services.vad_gate import VADGate
+from src.voiceai.services.speculation import SpeculativeTurnRunner
+from src.voiceai.services.barge_in import BargeInDetector
+from src.voiceai.services.tracing import Tracer
+from src.voiceai import config
+
+class CallSession:
+    """State and conversation flow for a single call.
+
+    Sessions are created by CallManager, which passes in the clients shared
+    across calls. Everything that belongs to one conversation lives here.
+    """
+
+    def __init__(self, session_id, calendar_service, availability_cache=None, llm_client=None,
+                 tts_client=None, tts_cache=None, response_cache=None, pyaudio_instance=None,
+                 greeting_text=None, call_store=None, caller=None, tracer=None,
+                 audio_handler=None, stt_factory=None, player=None):
+        self.session_id = session_id
+        # Session ids are short and reused across runs; the store needs a unique key
+        self.call_id = uuid.uuid4().hex
+        self.caller = caller
+        self.call_store = call_store
+        self.tracer = tracer or Tracer(enabled=False)
+        self.greeting_text = greeting_text or config.GREETING_TEXT
+        
+        # audio_handler, stt_factory and player stand in for the devices and STT in offline replays
+        self.audio_handler = audio_handler or AudioHandler(pyaudio_instance=pyaudio_instance)
+        self.stt_factory = stt_factory or AssemblyAISTTService
+        self.llm_engine = ConversationEngine(client=llm_client, response_cache=response_cache, tracer=self.tracer)
+        self.tts_service = ElevenLabsTTSService(client=tts_client, cache=tts_cache, tracer=self.tracer, player=player)
+        self.calendar_service = calendar_service
+        self.availability_cache = availability_cache
+        self.speculator = SpeculativeTurnRunner(self.llm_engine) if config.SPECULATION_ENABLED else None
+        
+        self.vad_gate = VADGate(
+            self.audio_handler.apply_vad,
+            self.audio_handler.frame_size * 2
+        )
+        self.barge_in = None
+        if config.BARGE_IN_ENABLED:
+            self.barge_in = BargeInDetector(
+                self.audio_handler.apply_vad,
+                self.audio_handler.frame_size * 2
+            )
+        self.turn_interrupted = False
+        # Agent lines are logged once playback ends, so a reply cut short can be marked as such
+        self._agent_turns = []
+        
+        self.stt_service = None
+        # False while the greeting plays: the microphone is open but nothing goes to STT yet
+        self.listening = False
+        self.audio_chunks_sent = 0
+        self.is_call_active = False
+        self.started_at = None
+        self.ended_at = None
+        self.summary = None
+        self.full_transcript = []
+        self.silence_counter = 0
+        self.last_speech_time = None
+        
+        self.pending_action = None
+        self.scheduled_time = None
+        self.caller_purpose = ""
+        self.available_slots = []
+        self.confirmation_received = False
+    
+    async def run(self):
+        """Answer the call, hold the conversation, then summarize it."""
+        # Everything this call's tasks trace is tagged with its id
+        self.tracer.start_call(self.call_id)
+        try:
+            await self.tts_service.connect()
+            self.llm_engine.initialize_conversation()
+            await self.start_call()
+            await self.end_call()
+        finally:
+            if self.ended_at is None:
+                self.ended_at = datetime.now()
+            self.is_call_active = False
+            self.cleanup()
+    
+    def stop(self):
+        self.is_call_active = False
+    
+    @property
+    def state(self):
+        if self.is_call_active:
+            return "active"
+        if self.ended_at:
+            return "ended"
+        return "pending"
+    
+    def get_info(self):
+        return {
+            "session_id": self.session_id,
+            "call_id": self.call_id,
+            "caller": self.caller,
+            "state": self.state,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "turns": len(self.full_transcript),
+            "scheduled_time": self.scheduled_time,
+        }
+    
+    async def on_transcript(self, transcript, is_final):
+        if not is_final:
+            if self.speculator is not None:
+                self.speculator.on_partial(transcript)
+            return
+        
+        self.tracer.start_turn()
+        self.tracer.event("stt.end_of_turn")
+        print(f"\nCaller: {transcript}")
+        self.turn_interrupted = False
+        self._log_turn("Caller", transcript)
+        
+        response_data, already_spoken = await self._run_llm_turn(transcript)
+        
+        agent_response = response_data.get("response", "")
+        intent = response_data.get("intent", "unclear")
+        action = response_data.get("action", "continue")
+        confidence = response_data.get("confidence", 0.5)
+        
+        print(f"Agent: {agent_response}")
+        self._log_turn("Agent", agent_response, intent, action)
+        
+        self.llm_engine.update_conversation_state(intent, confidence)
+        
+        if action == "schedule":
+            # Extract caller purpose from transcript for calendar event
+            self.caller_purpose = self._extract_caller_purpose(transcript)
+            await self.handle_scheduling(agent_response, already_spoken)
+        elif action == "decline" or action == "end_call":
+            self.pending_action = action
+            await self._say(agent_response, already_spoken)
+            self.is_call_active = False
+        elif action == "confirm":
+            await self.handle_confirmation(agent_response, already_spoken)
+        else:
+            await self._say(agent_response, already_spoken)
+        
+        self._finish_agent_turn()
+        self.last_speech_time = datetime.now()
+    
+    def _log_turn(self, speaker, text, intent=None, action=None):
+        if speaker == "Agent":
+            self._agent_turns.append((text, intent, action))
+            return
+        self._write_turn(speaker, text, intent, action)
+    
+    def _write_turn(self, speaker, text, intent=None, action=None):
+        self.full_transcript.append(f"{speaker}: {text}")
+        if self.call_store is not None:
+            self.call_store.record_turn(self.call_id, speaker, text, intent, action)
+    
+    def _finish_agent_turn(self, interrupted=None):
+        interrupted = self.turn_interrupted if interrupted is None else interrupted
+        for text, intent, action in self._agent_turns:
+            # The caller did not hear all of it; the text is what the agent meant to say
+            self._write_turn("Agent", f"{text} [interrupted by caller]" if interrupted else text, intent, action)
+        self._agent_turns.clear()
+    
+    async def _run_llm_turn(self, transcript):
+        """Get the agent's reply, speaking it sentence by sentence when streaming.
+        
+        Returns the parsed response and whether it has already been spoken.
+        """
+        if self.speculator is not None:
+            draft = await self.speculator.resolve(transcript)
+            if draft is not None:
+                return self.llm_engine.commit_turn(draft), False
+        
+        if not config.LLM_STREAMING:
+            return await self.llm_engine.process_transcript(transcript), False
+        
+        sentences = asyncio.Queue()
+        speaker = asyncio.create_task(self.tts_service.speak_queue(sentences))
+        spoken = []
+        
+        def on_sentence(sentence):
+            spoken.append(sentence)
+            sentences.put_nowait(sentence)
+        
+        try:
+            response_data = await self.llm_engine.process_transcript_stream(transcript, on_sentence)
+        finally:
+            sentences.put_nowait(None)
+        
+        if not await speaker:
+            self._on_interrupted()
+        # A failed turn's fallback reply still needs speaking, even if part of the stream was
+        return response_data, bool(spoken) and not response_data.get("failed")
+    
+    async def _say(self, text, already_spoken=False):
+        if not already_spoken:
+            await self._speak(text)
+    
+    async def _speak(self, text):
+        # Once the caller has talked over this turn, the rest of it is not spoken
+        if self.turn_interrupted:
+            return
+        if not await self.tts_service.speak_text(text):
+            self._on_interrupted()
+    
+    def _on_interrupted(self):
+        self.turn_interrupted = True
+        self.llm_engine.mark_interrupted()
+    
+    def _check_barge_in(self, audio_data):
+        if self.barge_in is None:
+            return
+        if self.barge_in.observe(audio_data, self.tts_service.player.is_playing):
+            print("\n[Caller barged in - stopping playback]")
+            self.tts_service.interrupt()
+    
+    async def _get_free_slots(self):
+        if self.availability_cache is not None:
+            return await self.availability_cache.get_free_slots()
+        return await self.calendar_service.get_free_slots()
+    
+    async def handle_scheduling(self, agent_response, already_spoken=False):
+        try:
+            free_slots = await self._get_free_slots()
+            
+            if free_slots:
+                formatted_slots = self.calendar_service.format_time_slots(free_slots[:3])
+                
+                slots_text = ", ".join(formatted_slots[:2])
+                slots_message = f"Available times are {slots_text}. Which works for you?"
+                scheduling_message = f"{agent_response} {slots_message}"
+                
+                print(f"Agent (with calendar): {scheduling_message}")
+                self._log_turn("Agent", scheduling_message, action="schedule")
+                
+                if already_spoken:
+                    await self._speak(slots_message)
+                else:
+                    await self._speak(scheduling_message)
+                
+                # Store available slots for later use
+                self.available_slots = free_slots[:3]
+            else:
+                await self._say(agent_response, already_spoken)
+                
+        except Exception as e:
+            await self._say(agent_response, already_spoken)
+    
+    async def handle_confirmation(self, agent_response, already_spoken=False):
+        """Handle when user confirms a time slot"""
+        try:
+            if self.available_slots and not self.confirmation_received:
+                # Parse user's requested time from the transcript
+                user_requested_time = self._parse_user_time_request()
+                
+                if user_requested_time:
+                    # Find the closest matching slot
+                    self.scheduled_time = self._find_matching_slot(user_requested_time)
+                else:
+                    # Fallback to first available slot
+                    self.scheduled_time = self.available_slots[0]
+                
+                self.confirmation_received = True
+                
+                # Create the calendar event immediately
+                if self.scheduled_time:
+                    event_link = await self.calendar_service.create_event(
+                        self.scheduled_time,
+                        self.caller_purpose or "Callback Request",
+                        "Scheduled via Hiya Guard"
+                    )
+                    
+                    if event_link:
+                        print(f"Calendar event created: {event_link}")
+                        self.llm_engine.call_summary.record_scheduled(self.scheduled_time)
+                        if self.availability_cache is not None:
+                            self.availability_cache.invalidate(self.scheduled_time)
+                
+                slot_text = self.calendar_service.format_time_slots([self.scheduled_time])[0]
+                confirmation_message = f"Perfect! I've scheduled your callback for {slot_text}. Thank you for calling!"
+                
+                print(f"Agent (confirmed): {confirmation_message}")
+                self._log_turn("Agent", confirmation_message, action="confirm")
+                
+                if already_spoken:
+                    # The model's own confirmation has been heard; just add the booked time
+                    await self._speak(f"Your callback is booked for {slot_text}.")
+                else:
+                    await self._speak(confirmation_message)
+                
+                # End the call after confirmation
+                self.is_call_active = False
+            else:
+                await self._say(agent_response, already_spoken)
+                
+        except Exception as e:
+            print(f"Confirmation error: {e}")
+            await self._say(agent_response, already_spoken)
+    
+    def _parse_user_time_request(self):
+        """Parse user's time request from the transcript"""
+        if not self.full_transcript:
+            return None
+        
+        # Get the last caller message
+        last_caller_message = ""
+        for message in reversed(self.full_transcript):
+            if message.startswith("Caller:"):
+                last_caller_message = message.replace("Caller:", "").strip().lower()
+                break
+        
+        # Simple parsing for common time patterns
+        import re
+        
+        # Look for day patterns
+        day_patterns = {
+            'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4,
+            'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4
+        }
+        
+        # Look for time patterns
+        time_patterns = [
+            r'(\d{1,2}):?(\d{0,2})\s*(am|pm)',
+            r'(\d{1,2})\s*(am|pm)',
+            r'(\d{1,2}):(\d{2})',
+        ]
+        
+        requested_day = None
+        requested_hour = None
+        requested_minute = 0
+        
+        # Find day
+        for day_name, day_num in day_patterns.items():
+            if day_name in last_caller_message:
+                requested_day = day_num
+                break
+        
+        # Find time
+        for pattern in time_patterns:
+            match = re.search(pattern, last_caller_message)
+            if match:
+                groups = match.groups()
+                if len(groups) >= 2:
+                    hour = int(groups[0])
+                    if len(groups) > 2 and groups[2]:
+                        ampm = groups[2].lower()
+                        if ampm == 'pm' and hour != 12:
+                            hour += 12
+                        elif ampm == 'am' and hour == 12:
+                            hour = 0
+                    elif len(groups) > 1 and groups[1]:
+                        ampm = groups[1].lower()
+                        if ampm == 'pm' and hour != 12:
+                            hour += 12
+                        elif ampm == 'am' and hour == 12:
+                            hour = 0
+                    
+                    requested_hour = hour
+                    if len(groups) > 1 and groups[1] and groups[1].isdigit():
+                        requested_minute = int(groups[1])
+                break
+        
+        if requested_day is not None and requested_hour is not None:
+            from datetime import datetime, timedelta
+            now = datetime.now()
+            
+            # Find the next occurrence of the requested day
+            days_ahead = requested_day - now.weekday()
+            if days_ahead <= 0:
+                days_ahead += 7
+            
+            target_date = now + timedelta(days=days_ahead)
+            target_datetime = target_date.replace(
+                hour=requested_hour, 
+                minute=requested_minute, 
+                second=0, 
+                microsecond=0
+            )
+            
+            return target_datetime
+        
+        return None
+    
+    def _find_matching_slot(self, requested_time):
+        """Find the closest matching slot to the user's request"""
+        if not self.available_slots or not requested_time:
+            return self.available_slots[0] if self.available_slots else None
+        
+        # Find the slot closest to the requested time
+        best_slot = None
+        min_diff = float('inf')
+        
+        for slot in self.available_slots:
+            diff = abs((slot - requested_time).total_seconds())
+            if diff < min_diff:
+                min_diff = diff
+                best_slot = slot
+        
+        return best_slot or self.available_slots[0]
+    
+    def _extract_caller_purpose(self, transcript):
+        """Extract the caller's purpose from the transcript"""
+        # Simple extraction - look for common patterns
+        purpose_keywords = [
+            'blood test', 'appointment', 'meeting', 'call', 'callback',
+            'discussion', 'consultation', 'follow up', 'check up'
+        ]
+        
+        transcript_lower = transcript.lower()
+        for keyword in purpose_keywords:
+            if keyword in transcript_lower:
+                return keyword.title()
+        
+        # Fallback to first few words
+        words = transcript.split()[:3]
+        return ' '.join(words) if words else "Callback Request"
+    
+    async def start_call(self):
+        self.is_call_active = True
+        self.started_at = datetime.now()
+        self.full_transcript = []
+        self._agent_turns = []
+        self.silence_counter = 0
+        self.audio_chunks_sent = 0
+        self.listening = False
+        self.vad_gate.reset()
+        if self.barge_in is not None:
+            self.barge_in.reset()
+        
+        if self.availability_cache is not None:
+            # Refresh stale slots while the greeting plays, before anyone asks to schedule
+            self.availability_cache.prefetch()
+        
+        print("\n" + "="*60)
+        print(f"CALL STARTED ({self.session_id})")
+        print("="*60)
+        
+        print(f"Agent: {self.greeting_text}")
+        self._log_turn("Agent", self.greeting_text)
+        
+        # The greeting (cached at startup) plays while STT and the microphone
+        # open, so the caller can answer the moment it ends
+        print("Playing greeting...")
+        greeting = asyncio.create_task(self.tts_service.speak_text(self.greeting_text))
+        
+        if not await self._open_stt():
+            await greeting
+            return
+        
+        await self.conversation_loop(greeting)
+    
+    async def _open_stt(self):
+        self.stt_service = self.stt_factory(self.on_transcript)
+        connected = await self.stt_service.connect()
+        
+        if not connected:
+            print("Warning: STT connection failed")
+            return False
+        
+        # Start AssemblyAI real-time streaming
+        streaming_started = await self.stt_service.start_streaming()
+        if not streaming_started:
+            print("Warning: AssemblyAI streaming failed")
+            return False
+        return True
+    
+    async def conversation_loop(self, greeting=None):
+        print("Starting microphone recording...")
+        stream = self.audio_handler.start_recording()
+        
+        if not stream:
+            print("Failed to start microphone recording")
+            self.is_call_active = False
+            if greeting is not None:
+                await greeting
+            return
+        
+        print("Microphone recording started")
+        
+        # Capture runs during the greeting so a barge-in can cut it short
+        audio_task = asyncio.create_task(self.stream_audio())
+        if greeting is not None:
+            completed = await greeting
+            self._finish_agent_turn(interrupted=not completed)
+            print("Greeting complete. Listening for caller...")
+        self.listening = True
+        self.last_speech_time = datetime.now()
+        
+        monitor_task = asyncio.create_task(self.monitor_silence())
+        
+        await asyncio.gather(audio_task, monitor_task)
+    
+    async def stream_audio(self):
+        if self.audio_handler.use_callback:
+            async for frame in self.audio_handler.iter_frames():
+                try:
+                    if not self.is_call_active:
+                        break
+                    await self._send_frame(frame)
+                finally:
+                    frame.release()
+            return
+        
+        while self.is_call_active:
+            audio_data = self.audio_handler.read_audio_chunk()
+            if audio_data:
+                self._check_barge_in(audio_data)
+            
+            if audio_data and self._stt_ready():
+                if config.VAD_GATE_ENABLED:
+                    audio_data = self.vad_gate.filter(audio_data)
+                if audio_data:
+                    await self._send_audio(audio_data)
+            elif audio_data and config.VAD_GATE_ENABLED:
+                self.vad_gate.hold_bytes(audio_data)
+            
+            await asyncio.sleep(0.01)
+    
+    def _stt_ready(self):
+        # While STT reconnects it buffers audio, so keep sending
+        return self.listening and self.stt_service is not None and self.stt_service.is_streaming
+    
+    async def _send_frame(self, frame):
+        self._check_barge_in(frame.view)
+        if not self._stt_ready():
+            # Not sent yet, but kept as pre-roll so words started right as the greeting ends are not clipped
+            if config.VAD_GATE_ENABLED:
+                self.vad_gate.hold(frame)
+            return
+        
+        if not config.VAD_GATE_ENABLED:
+            await self._send_audio(frame.view)
+            return
+        
+        for out in self.vad_gate.process(frame):
+            try:
+                await self._send_audio(out.view)
+            finally:
+                out.release()
+    
+    async def _send_audio(self, audio_data):
+        await self.stt_service.stream_audio(audio_data)
+        self.audio_chunks_sent += 1
+        
+        if self.audio_chunks_sent == 1:
+            print("Audio streaming to AssemblyAI started")
+        elif self.audio_chunks_sent % 100 == 0:
+            print(f"  Sent {self.audio_chunks_sent} audio chunks to AssemblyAI")
+    
+    async def monitor_silence(self):
+        while self.is_call_active:
+            if self.last_speech_time:
+                elapsed = (datetime.now() - self.last_speech_time).total_seconds()
+                
+                if elapsed > config.SILENCE_TIMEOUT_SECONDS:
+                    print("\n[Silence detected - ending call]")
+                    self.is_call_active = False
+                    break
+            
+            await asyncio.sleep(1)
+    
+    async def end_call(self):
+        self.is_call_active = False
+        self.ended_at = datetime.now()
+        
+        print("\n" + "="*60)
+        print(f"CALL ENDED ({self.session_id})")
+        print("="*60)
+        
+        self.audio_handler.stop_recording()
+        
+        if self.speculator is not None:
+            self.speculator.reset()
+            spec_stats = self.speculator.get_stats()
+            print(f"Speculation: {spec_stats['hits']} hits, {spec_stats['misses']} misses, "
+                  f"~{spec_stats['saved_ms_total']} ms saved")
+        
+        if config.VAD_GATE_ENABLED:
+            vad_stats = self.vad_gate.get_stats()
+            print(f"VAD gate: {vad_stats['frames_sent']} frames sent, "
+                  f"{vad_stats['frames_suppressed']} suppressed")
+        
+        latency = self.tracer.report(self.call_id)
+        if latency:
+            print("Latency (ms, p50/p95/p99):")
+            for stage, stats in latency.items():
+                print(f"  {stage:<26} {stats['p50']:>7} {stats['p95']:>7} {stats['p99']:>7}  (n={stats['count']})")
+        
+        if self.barge_in is not None and self.barge_in.triggers:
+            print(f"Barge-in: caller interrupted the agent {self.barge_in.triggers} times")
+        
+        if self.stt_service:
+            stt_stats = self.stt_service.get_stats()
+            if stt_stats["reconnects"] or stt_stats["failed_reconnects"]:
+                print(f"STT: {stt_stats['reconnects']} reconnects, longest gap {stt_stats['max_gap_ms']} ms, "
+                      f"{stt_stats['dropped_bytes']} bytes of audio dropped")
+            await self.stt_service.disconnect()
+        
+        self._finish_agent_turn()
+        
+        if config.LLM_CALL_SUMMARY:
+            print("\nGenerating call summary...")
+            transcript_text = "\n".join(self.full_transcript)
+            summary = await self.llm_engine.generate_summary(transcript_text)
+        else:
+            # Built up turn by turn during the call, so there is nothing left to wait for
+            summary = self.llm_engine.call_summary.finalize()
+        self.summary = summary
+        
+        if self.call_store is not None:
+            self.call_store.record_call(self.call_id, self.started_at, self.ended_at, summary, caller=self.caller)
+        
+        self.display_summary(summary)
+    
+    def display_summary(self, summary):
+        print("\n" + "="*60)
+        print("CALL SUMMARY")
+        print("="*60)
+        print(f"Caller Intent:     {summary.get('caller_intent', 'Unknown')}")
+        print(f"Classification:    {summary.get('classification', 'Unknown')}")
+        print(f"Outcome:           {summary.get('outcome', 'Unknown')}")
+        print(f"Scheduled:         {summary.get('scheduled_callback', 'None')}")
+        print(f"Key Details:       {summary.get('key_details', 'None')}")
+        print(f"Confidence:        {summary.get('confidence_score', 0.0):.2f}")
+        print("="*60)
+    
+    def cleanup(self):
+        self.audio_handler.cleanup()
+        self.tts_service.close()
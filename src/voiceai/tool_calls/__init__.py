@@ -1,6 +1,16 @@
-from .calendar import calendar
-from .llm import llm
-from .tts import tts
-from .stt import stt
-from .audio import audio
+import importlib
 
+# Each tool is a singleton wrapping a service; importing the package builds none of them
+__all__ = ["calendar", "llm", "tts", "stt", "audio"]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    tool = getattr(importlib.import_module(f".{name}", __name__), name)
+    globals()[name] = tool
+    return tool
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
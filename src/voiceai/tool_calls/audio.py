@@ -1,10 +1,17 @@
 from typing import Optional
-from src.voiceai.services.audio_handler import AudioHandler
 
 
 class _AudioTools:
     def __init__(self):
-        self._svc = AudioHandler()
+        self._handler = None
+
+    @property
+    def _svc(self):
+        # Opening PyAudio enumerates devices, so wait until audio is actually used
+        if self._handler is None:
+            from src.voiceai.services.audio_handler import AudioHandler
+            self._handler = AudioHandler()
+        return self._handler
 
     def start(self):
         return self._svc.start_recording()
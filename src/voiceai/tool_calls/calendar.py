@@ -1,12 +1,18 @@
 from datetime import datetime
-from src.voiceai.services.calendar_service import GoogleCalendarService
 
 
 class _CalendarTools:
     def __init__(self):
-        self._svc = GoogleCalendarService()
+        self._service = None
         self._authed = False
 
+    @property
+    def _svc(self):
+        if self._service is None:
+            from src.voiceai.services.calendar_service import GoogleCalendarService
+            self._service = GoogleCalendarService()
+        return self._service
+
     def authenticate(self):
         if not self._authed:
             self._authed = bool(self._svc.authenticate())
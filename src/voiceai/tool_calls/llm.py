@@ -1,11 +1,15 @@
-from src.voiceai.services.llm_service import ConversationEngine
-
-
 class _LLMTools:
     def __init__(self):
-        self._engine = ConversationEngine()
+        self._conversation = None
         self._initialized = False
 
+    @property
+    def _engine(self):
+        if self._conversation is None:
+            from src.voiceai.services.llm_service import ConversationEngine
+            self._conversation = ConversationEngine()
+        return self._conversation
+
     def initialize(self):
         if not self._initialized:
             self._engine.initialize_conversation()
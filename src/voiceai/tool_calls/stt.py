@@ -1,12 +1,15 @@
-from typing import Callable, Optional
-from src.voiceai.services.stt_service import AssemblyAISTTService
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from src.voiceai.services.stt_service import AssemblyAISTTService
 
 
 class _STTTools:
     def __init__(self):
-        self._svc: Optional[AssemblyAISTTService] = None
+        self._svc: Optional["AssemblyAISTTService"] = None
 
     def init(self, on_transcript: Callable[[str, bool], None]):
+        from src.voiceai.services.stt_service import AssemblyAISTTService
         self._svc = AssemblyAISTTService(on_transcript)
 
     async def connect(self):
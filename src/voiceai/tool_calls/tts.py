@@ -1,11 +1,15 @@
-from src.voiceai.services.tts_service import ElevenLabsTTSService
-
-
 class _TTSTools:
     def __init__(self):
-        self._svc = ElevenLabsTTSService()
+        self._service = None
         self._connected = False
 
+    @property
+    def _svc(self):
+        if self._service is None:
+            from src.voiceai.services.tts_service import ElevenLabsTTSService
+            self._service = ElevenLabsTTSService()
+        return self._service
+
     async def connect(self):
         if not self._connected:
             self._connected = bool(await self._svc.connect())
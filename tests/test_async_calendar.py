@@ -0,0 +1,63 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from src.voiceai.services.async_calendar import AsyncCalendarService
+from src.voiceai.services.calendar_service import GoogleCalendarService
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        self.service.batches.append([request_id for request_id, _ in self.requests])
+        self.service.threads.append(threading.current_thread().name)
+        for request_id, request in self.requests:
+            self.callback(request_id, request.response, None)
+
+
+class _FakeGoogleService:
+    def __init__(self, busy, events):
+        self.busy = busy
+        self.events_items = events
+        self.batches = []
+        self.threads = []
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+    def freebusy(self):
+        return SimpleNamespace(query=lambda body: SimpleNamespace(
+            response={"calendars": {"primary": {"busy": self.busy}}}))
+
+    def events(self):
+        return SimpleNamespace(list=lambda **kwargs: SimpleNamespace(
+            response={"items": self.events_items}))
+
+
+def test_freebusy_and_events_go_out_as_one_batch_off_loop():
+    calendar = GoogleCalendarService()
+    calendar.service = _FakeGoogleService(busy=[], events=[])
+    facade = AsyncCalendarService(calendar, max_workers=1)
+
+    slots = asyncio.run(facade.get_free_slots(days_ahead=7))
+    facade.close()
+
+    assert calendar.service.batches == [["freebusy", "events"]]
+    assert calendar.service.threads[0].startswith("calendar")
+    assert 0 < len(slots) <= 5
+
+
+def test_unauthenticated_calendar_falls_back_to_default_slots():
+    facade = AsyncCalendarService(GoogleCalendarService(), max_workers=1)
+
+    slots = asyncio.run(facade.get_free_slots())
+    facade.close()
+
+    assert slots == GoogleCalendarService()._get_fallback_slots()
@@ -0,0 +1,51 @@
+import asyncio
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.voiceai.services import audio_handler as audio_handler_module
+from src.voiceai.services.audio_handler import AudioHandler
+
+
+class _PyAudio:
+    def open(self, **options):
+        return SimpleNamespace(stop_stream=lambda: None, close=lambda: None)
+
+    def terminate(self):
+        pass
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    # Stand-ins for the device libraries; the callback is driven by hand below
+    monkeypatch.setitem(sys.modules, "pyaudio", SimpleNamespace(paInt16=8, paContinue=0, PyAudio=_PyAudio))
+    monkeypatch.setitem(sys.modules, "webrtcvad", SimpleNamespace(Vad=lambda mode: None))
+    monkeypatch.setattr(audio_handler_module.config, "AUDIO_CAPTURE_MODE", "callback")
+    return AudioHandler()
+
+
+def test_frames_flow_when_recording_starts_outside_a_loop(handler):
+    handler.start_recording()
+    assert handler.loop is None
+    # Audio arriving before anyone listens is buffered rather than crashing the callback
+    handler._on_audio(bytes(handler.pool_frame_bytes // 2), 0, None, 0)
+
+    async def scenario():
+        frames = handler.iter_frames()
+        first = asyncio.ensure_future(frames.__anext__())
+        await asyncio.sleep(0.01)
+        assert not first.done()
+
+        feeder = threading.Thread(target=handler._on_audio, args=(bytes(handler.pool_frame_bytes), 0, None, 0))
+        feeder.start()
+        frame = await asyncio.wait_for(first, 1)
+        feeder.join()
+        await frames.aclose()
+        return frame
+
+    frame = asyncio.run(scenario())
+    assert len(frame.view) == handler.pool_frame_bytes
+    frame.release()
+    handler.cleanup()
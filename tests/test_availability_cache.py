@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from src.voiceai.services.availability_cache import AvailabilityCache
+
+
+class _FakeCalendar:
+    def __init__(self, slots):
+        self.slots = slots
+        self.calls = 0
+        self.failing = False
+
+    async def get_free_slots(self, days_ahead=3, slot_duration_minutes=30, fallback=True):
+        self.calls += 1
+        if self.failing:
+            if fallback:
+                return ["made-up slot"]
+            raise RuntimeError("calendar unavailable")
+        return list(self.slots)
+
+
+def _slots(count):
+    start = datetime.now().astimezone().replace(second=0, microsecond=0) + timedelta(days=1)
+    return [start + timedelta(minutes=30 * i) for i in range(count)]
+
+
+def test_reads_are_served_from_memory_until_ttl():
+    async def scenario():
+        calendar = _FakeCalendar(_slots(3))
+        cache = AvailabilityCache(calendar, ttl_seconds=60)
+        await cache.refresh()
+        first = await cache.get_free_slots()
+        second = await cache.get_free_slots()
+        return calendar, cache, first, second
+
+    calendar, cache, first, second = asyncio.run(scenario())
+
+    assert calendar.calls == 1
+    assert first == second == calendar.slots
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_concurrent_refreshes_share_one_request():
+    async def scenario():
+        calendar = _FakeCalendar(_slots(2))
+        cache = AvailabilityCache(calendar, ttl_seconds=60)
+        cache.prefetch()
+        results = await asyncio.gather(cache.get_free_slots(), cache.get_free_slots())
+        return calendar, results
+
+    calendar, results = asyncio.run(scenario())
+
+    assert calendar.calls == 1
+    assert results[0] == results[1] == calendar.slots
+
+
+def test_booked_slot_is_dropped_and_stays_dropped_after_refresh():
+    async def scenario():
+        slots = _slots(3)
+        calendar = _FakeCalendar(slots)
+        cache = AvailabilityCache(calendar, ttl_seconds=60)
+        await cache.refresh()
+        cache.invalidate(slots[1])
+        after_booking = await cache.get_free_slots()
+        # A refresh that raced the booking still returns the old slot
+        after_refresh = await cache.refresh()
+        return slots, after_booking, after_refresh
+
+    slots, after_booking, after_refresh = asyncio.run(scenario())
+
+    assert after_booking == [slots[0], slots[2]]
+    assert after_refresh == [slots[0], slots[2]]
+
+
+def test_naive_fallback_slots_can_be_invalidated():
+    async def scenario():
+        slots = [slot.replace(tzinfo=None) for slot in _slots(2)]
+        cache = AvailabilityCache(_FakeCalendar(slots), ttl_seconds=60)
+        await cache.refresh()
+        cache.invalidate(slots[0].astimezone())
+        return slots, await cache.get_free_slots()
+
+    slots, remaining = asyncio.run(scenario())
+
+    assert remaining == [slots[1]]
+
+
+def test_failed_refresh_keeps_last_good_slots_and_retries():
+    async def scenario():
+        good = _slots(2)
+        calendar = _FakeCalendar(good)
+        cache = AvailabilityCache(calendar, ttl_seconds=60)
+        await cache.refresh()
+
+        calendar.failing = True
+        cache._fetched_at -= 120
+        during_outage = await cache.get_free_slots()
+        fresh_after_failure = cache.is_fresh()
+
+        calendar.failing = False
+        calendar.slots = _slots(3)
+        after_recovery = await cache.get_free_slots()
+        return calendar, good, during_outage, fresh_after_failure, after_recovery
+
+    calendar, good, during_outage, fresh_after_failure, after_recovery = asyncio.run(scenario())
+
+    assert during_outage == good
+    assert not fresh_after_failure
+    # The next read goes back to the calendar instead of waiting out the TTL
+    assert after_recovery == calendar.slots
+    assert calendar.calls == 3
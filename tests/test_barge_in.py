@@ -0,0 +1,45 @@
+import json
+
+from src.voiceai.services.barge_in import BargeInDetector
+from src.voiceai.services.history import ConversationHistory
+
+FRAME = 640
+SPEECH = b"\x01" * FRAME
+SILENCE = b"\x00" * FRAME
+
+
+def _detector(min_speech_ms=60):
+    return BargeInDetector(lambda frame: frame[0] == 1, FRAME, frame_ms=20, min_speech_ms=min_speech_ms)
+
+
+def test_fires_after_consecutive_speech_while_playing():
+    detector = _detector()
+
+    assert not detector.observe(SPEECH * 2 + SILENCE, playing=True)
+    assert not detector.observe(SPEECH * 2, playing=True)
+    assert detector.observe(SPEECH, playing=True)
+    # Only once per stretch of playback
+    assert not detector.observe(SPEECH * 3, playing=True)
+    assert detector.triggers == 1
+
+
+def test_ignores_speech_when_nothing_is_playing():
+    detector = _detector()
+
+    assert not detector.observe(SPEECH * 5, playing=False)
+    detector.observe(SILENCE, playing=False)
+    assert detector.observe(SPEECH * 3, playing=True)
+
+
+def test_history_marks_only_a_trailing_agent_reply():
+    history = ConversationHistory("system")
+    history.add_user("Hi")
+    assert not history.mark_interrupted()
+
+    history.add_assistant(json.dumps({"response": "Let me check the calendar", "intent": "legitimate"}))
+    assert history.mark_interrupted()
+
+    data = json.loads(history.messages()[-1]["content"])
+    assert data["interrupted_by_caller"] is True
+    assert data["response"] == "Let me check the calendar"
+
@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.voiceai import call_manager
+from src.voiceai.call_manager import CallManager
+
+
+class _Session:
+    """Stands in for CallSession: runs until stopped, then reports itself ended."""
+
+    def __init__(self, session_id, calendar_service, **options):
+        self.session_id = session_id
+        self.audio_handler = options["audio_handler"]
+        self.player = options["player"]
+        self.pyaudio_instance = options["pyaudio_instance"]
+        self.state = "pending"
+        self._stopped = asyncio.Event()
+
+    async def run(self):
+        self.state = "active"
+        await self._stopped.wait()
+        self.state = "ended"
+
+    def stop(self):
+        self._stopped.set()
+
+    def get_info(self):
+        return {"session_id": self.session_id, "state": self.state}
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(call_manager, "CallSession", _Session)
+    monkeypatch.setattr(call_manager.config, "CALL_STORE_ENABLED", False)
+    manager = CallManager(max_calls=2)
+    # No SDK clients and no PortAudio: the stub sessions never use them
+    manager._llm_client = SimpleNamespace()
+    manager._tts_client = SimpleNamespace()
+    manager.pyaudio_instance = SimpleNamespace(terminate=lambda: None)
+    return manager
+
+
+def _audio():
+    return SimpleNamespace(name="source"), SimpleNamespace(name="sink")
+
+
+def test_calls_start_list_and_stop(manager):
+    async def scenario():
+        source, sink = _audio()
+        first = manager.start_call("a", audio_source=source, audio_sink=sink)
+        second = manager.start_call("b", audio_source=source, audio_sink=sink)
+        await asyncio.sleep(0)
+        listed = manager.list_calls()
+
+        assert await manager.stop_call(first)
+        assert not await manager.stop_call("missing")
+        states = {info["session_id"]: info["state"] for info in manager.list_calls()}
+        manager.remove_ended_calls()
+        remaining = list(manager.sessions)
+        await manager.stop_call(second)
+        return listed, states, remaining
+
+    listed, states, remaining = asyncio.run(scenario())
+    assert listed == [{"session_id": "a", "state": "active"}, {"session_id": "b", "state": "active"}]
+    assert states == {"a": "ended", "b": "active"}
+    assert remaining == ["b"]
+
+
+def test_limit_and_duplicate_ids_are_refused(manager):
+    async def scenario():
+        source, sink = _audio()
+        manager.start_call("a", audio_source=source, audio_sink=sink)
+        with pytest.raises(ValueError):
+            manager.start_call("a", audio_source=source, audio_sink=sink)
+        manager.start_call("b", audio_source=source, audio_sink=sink)
+        with pytest.raises(RuntimeError, match="limit 2"):
+            manager.start_call("c", audio_source=source, audio_sink=sink)
+
+        await manager.stop_call("a")
+        # An ended call frees its slot
+        manager.start_call("c", audio_source=source, audio_sink=sink)
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_only_one_call_uses_the_local_audio_device(manager):
+    async def scenario():
+        manager.start_call("local")
+        with pytest.raises(RuntimeError, match="local microphone"):
+            manager.start_call("second")
+
+        source, sink = _audio()
+        manager.start_call("remote", audio_source=source, audio_sink=sink)
+        remote = manager.sessions["remote"]
+
+        local = manager.sessions["local"]
+        await manager.stop_call("local")
+        manager.remove_ended_calls()
+        # The device is free again once the local call has ended
+        manager.start_call("next")
+        await manager.shutdown()
+        return local, remote
+
+    local, remote = asyncio.run(scenario())
+    assert local.audio_handler is None and local.pyaudio_instance is not None
+    assert remote.audio_handler.name == "source" and remote.player.name == "sink"
+    assert remote.pyaudio_instance is None
@@ -0,0 +1,111 @@
+import time
+from datetime import datetime
+
+from src.voiceai.services.call_store import CallStore
+
+
+def _store(tmp_path):
+    return CallStore(path=str(tmp_path / "calls.db"), batch_size=50, flush_interval=0.01)
+
+
+def test_turns_and_summary_round_trip(tmp_path):
+    store = _store(tmp_path)
+    store.record_turn("c1", "Agent", "Hello, who's calling?")
+    store.record_turn("c1", "Caller", "It's the dentist", at=datetime(2024, 6, 3, 9, 0, 5))
+    store.record_turn("c1", "Agent", "Let me find a time", "legitimate", "schedule")
+    store.record_call("c1", datetime(2024, 6, 3, 9), datetime(2024, 6, 3, 9, 2), {
+        "caller_intent": "Dentist appointment",
+        "classification": "legitimate",
+        "outcome": "scheduled",
+        "scheduled_callback": "2024-06-04T10:00:00",
+        "key_details": "",
+        "confidence_score": 0.9
+    }, caller="+15550100")
+    store.flush()
+
+    [call] = store.query_calls()
+    turns = store.get_turns("c1")
+    store.close()
+
+    assert call["caller"] == "+15550100"
+    assert call["scheduled_callback"] == "2024-06-04T10:00:00"
+    assert call["summary"]["outcome"] == "scheduled"
+    assert [turn["speaker"] for turn in turns] == ["Agent", "Caller", "Agent"]
+    assert turns[1]["at"] == "2024-06-03T09:00:05"
+    assert turns[2]["action"] == "schedule"
+
+
+def test_queries_filter_by_time_classification_and_caller(tmp_path):
+    store = _store(tmp_path)
+    for day, classification, caller in [(1, "spam", "a"), (2, "legitimate", "b"), (3, "spam", "b")]:
+        started = datetime(2024, 6, day, 12)
+        store.record_call(f"c{day}", started, started, {"classification": classification}, caller=caller)
+    store.close()
+
+    assert [c["call_id"] for c in store.query_calls(classification="spam")] == ["c3", "c1"]
+    assert [c["call_id"] for c in store.query_calls(caller="b")] == ["c3", "c2"]
+    assert [c["call_id"] for c in store.query_calls(since=datetime(2024, 6, 2), until=datetime(2024, 6, 3))] == ["c2"]
+
+
+def test_writes_are_batched_and_wal_is_enabled(tmp_path):
+    store = _store(tmp_path)
+    for i in range(40):
+        store.record_turn("c1", "Caller", f"line {i}")
+    store.flush()
+    stats = store.get_stats()
+
+    conn = store._connect()
+    mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    store.close()
+
+    assert stats["records_written"] == 40
+    assert stats["batches_written"] < 40
+    assert mode == "wal"
+
+
+def test_slow_trickle_is_committed_within_the_flush_interval(tmp_path):
+    store = CallStore(path=str(tmp_path / "calls.db"), batch_size=50, flush_interval=0.2)
+    for i in range(12):
+        store.record_turn("c1", "Caller", f"line {i}")
+        time.sleep(0.05)
+    # Records keep arriving faster than the interval, but the first batch is already written
+    written_during_trickle = store.get_stats()["batches_written"]
+    store.close()
+
+    assert written_during_trickle >= 1
+
+
+def test_list_summary_fields_do_not_lose_the_batch(tmp_path):
+    store = _store(tmp_path)
+    store.record_turn("c1", "Caller", "I need two things")
+    store.record_call("c1", datetime(2024, 6, 3, 9), datetime(2024, 6, 3, 9, 2), {
+        "caller_intent": ["reschedule", "billing question"],
+        "classification": "legitimate",
+        "scheduled_callback": {"start": "2024-06-04T10:00:00"}
+    })
+    store.flush()
+
+    [call] = store.query_calls()
+    turns = store.get_turns("c1")
+    stats = store.get_stats()
+    store.close()
+
+    assert stats["write_errors"] == 0
+    assert len(turns) == 1
+    assert call["caller_intent"] == '["reschedule", "billing question"]'
+    assert call["summary"]["caller_intent"] == ["reschedule", "billing question"]
+
+
+def test_writes_after_close_are_dropped_and_flush_returns(tmp_path):
+    store = _store(tmp_path)
+    store.record_turn("c1", "Caller", "Hello")
+    store.close()
+
+    store.record_turn("c1", "Caller", "Still there?")
+    store.record_call("c1", datetime(2024, 6, 3, 9), datetime(2024, 6, 3, 9, 2), {})
+    store.flush()
+
+    assert store.get_stats()["dropped"] == 2
+    assert len(store.get_turns("c1")) == 1
+    assert store.query_calls() == []
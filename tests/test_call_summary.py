@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from src.voiceai.services.call_summary import RollingSummary
+
+
+def _result(intent, action, confidence=0.9):
+    return {"response": "", "intent": intent, "action": action, "confidence": confidence}
+
+
+def test_spam_call_summarizes_matched_phrases_and_decline():
+    summary = RollingSummary()
+    summary.record_turn("We've been trying to reach you about your car warranty",
+                        _result("spam", "continue", 0.7), ["car warranty"])
+    summary.record_turn("Press 1 now", _result("spam", "decline", 0.95), ["press 1"])
+
+    final = summary.finalize()
+
+    assert final["classification"] == "spam"
+    assert final["outcome"] == "declined"
+    assert final["caller_intent"] == "Unsolicited call about car warranty, press 1"
+    assert "mentioned 'car warranty'" in final["key_details"]
+    assert final["confidence_score"] == 0.95
+
+
+def test_legitimate_call_tracks_purpose_details_and_booking():
+    summary = RollingSummary()
+    summary.record_turn("Hi, this is Dr. Lee's office about your blood test results",
+                        _result("legitimate", "schedule"))
+    summary.record_turn("Tomorrow at 2 works", _result("unclear", "confirm", 0.4))
+    summary.record_scheduled(datetime(2024, 6, 4, 14, 0))
+
+    final = summary.finalize()
+
+    assert final["caller_intent"].startswith("Hi, this is Dr. Lee's office")
+    assert final["classification"] == "legitimate"
+    assert final["confidence_score"] == 0.9
+    assert final["outcome"] == "scheduled"
+    assert final["scheduled_callback"] == "2024-06-04T14:00:00"
+    assert "Tomorrow at 2 works" in final["key_details"]
+
+
+def test_finalize_matches_generate_summary_fields_before_any_turn():
+    final = RollingSummary().finalize()
+
+    assert set(final) == {"caller_intent", "classification", "outcome",
+                          "scheduled_callback", "key_details", "confidence_score"}
+    assert final["outcome"] == "unclear"
@@ -0,0 +1,44 @@
+import json
+
+from src.voiceai.services.history import ConversationHistory, count_tokens
+
+
+def _reply(text, intent="unclear", action="continue"):
+    return json.dumps({"response": text, "intent": intent, "action": action, "confidence": 0.5})
+
+
+def test_count_tokens_grows_with_text():
+    assert count_tokens("") == 0
+    assert count_tokens("hello") == 2
+    assert count_tokens("hello, world") < count_tokens("hello, world, and everyone else")
+
+
+def test_short_history_is_sent_verbatim():
+    history = ConversationHistory("SYSTEM", token_budget=1000, keep_turns=2)
+    history.add_user("Hi there")
+    history.add_assistant(_reply("Hello!"))
+
+    assert history.messages() == [
+        {"role": "system", "content": "SYSTEM"},
+        {"role": "user", "content": "Hi there"},
+        {"role": "assistant", "content": _reply("Hello!")},
+    ]
+
+
+def test_old_turns_fold_into_note_and_prefix_stays_identical():
+    history = ConversationHistory("SYSTEM", token_budget=60, keep_turns=2)
+    first_system = history.messages()[0]
+
+    for i in range(6):
+        history.add_user(f"Caller message number {i} about the car warranty offer")
+        history.add_assistant(_reply(f"Reply {i}", intent="spam"))
+
+    messages = history.messages()
+    assert messages[0] is first_system
+    assert messages[1]["role"] == "system"
+    assert "Caller message number 0" in messages[1]["content"]
+    assert "Agent (spam, continue): Reply 0" in messages[1]["content"]
+    # The most recent turns are untouched
+    assert messages[-2]["content"] == "Caller message number 5 about the car warranty offer"
+    assert len(history.turns) >= 4
+    assert history.compactions > 0
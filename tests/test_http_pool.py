@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.voiceai.services.http_pool import HttpPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(401)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_warm_connections_are_reused(server_url):
+    async def scenario():
+        pool = HttpPool(http2=False)
+        try:
+            answered = await pool.warm(urls=[server_url + "/v1/models"], connections=2)
+            warmed = pool.get_stats()
+
+            for _ in range(3):
+                response = await pool.client.get(server_url + "/v1/chat")
+                assert response.text == "ok"
+            return answered, warmed, pool.get_stats()
+        finally:
+            await pool.aclose()
+
+    answered, warmed, stats = asyncio.run(scenario())
+    assert answered == 2
+    assert warmed["new_connections"] == 2
+    assert warmed["idle"] == 2
+    # Later requests ride the warmed connections instead of opening new ones
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 2
+    assert stats["reused"] == 3
+    assert stats["connect_ms_p50"] >= 0
+
+
+def test_warm_survives_unreachable_hosts():
+    async def scenario():
+        pool = HttpPool(http2=False, connect_timeout=0.5)
+        try:
+            return await pool.warm(urls=["http://127.0.0.1:9/"], connections=1), pool.get_stats()
+        finally:
+            await pool.aclose()
+
+    answered, stats = asyncio.run(scenario())
+    assert answered == 0
+    assert stats["warmup_errors"] == 1
+
+
+def test_elevenlabs_client_keeps_the_request_timeout(monkeypatch):
+    pytest.importorskip("elevenlabs")
+    from src.voiceai import call_manager
+    from src.voiceai.call_manager import CallManager
+
+    monkeypatch.setattr(call_manager.config, "HTTP_TIMEOUT_SECONDS", 42)
+    manager = CallManager.__new__(CallManager)
+    manager._http_pool = HttpPool(http2=False)
+    manager._tts_client = None
+
+    wrapper = manager.tts_client._client_wrapper
+    assert wrapper.httpx_client.httpx_client is manager.http_pool.client
+    assert wrapper.httpx_client.base_timeout == 42
+    asyncio.run(manager.http_pool.aclose())
+
+
+def test_keep_warm_pings_are_opt_in(monkeypatch):
+    from src.voiceai.services import http_pool
+
+    monkeypatch.setattr(http_pool.config, "HTTP_KEEPALIVE_PING_SECONDS", 0)
+
+    async def scenario():
+        pool = HttpPool(http2=False)
+        pool.start()
+        started = pool._pinger is not None
+        await pool.aclose()
+        return started
+
+    assert not asyncio.run(scenario())
@@ -0,0 +1,50 @@
+import json
+
+from src.voiceai.services.json_stream import ResponseFieldStream, SentenceChunker
+
+
+def _feed_in_pieces(text, size):
+    stream = ResponseFieldStream("response")
+    return "".join(stream.feed(text[i:i + size]) for i in range(0, len(text), size)), stream
+
+
+def test_extracts_response_field_across_arbitrary_splits():
+    payload = json.dumps({
+        "response": 'Hi "there"\nI\'m here — ok.',
+        "intent": "unclear",
+        "action": "continue",
+        "confidence": 0.5,
+    })
+
+    for size in (1, 2, 3, 7, len(payload)):
+        value, stream = _feed_in_pieces(payload, size)
+        assert value == 'Hi "there"\nI\'m here — ok.'
+        assert stream.done
+
+
+def test_ignores_fields_before_response():
+    payload = '{"intent": "spam", "response": "No thanks.", "action": "decline"}'
+
+    value, _ = _feed_in_pieces(payload, 4)
+
+    assert value == "No thanks."
+
+
+def test_sentence_chunker_waits_for_boundary_and_skips_abbreviations():
+    chunker = SentenceChunker()
+
+    assert chunker.push("Let me check Dr. Smith's calendar") == []
+    assert chunker.push(". One moment please! Then") == [
+        "Let me check Dr. Smith's calendar.",
+        "One moment please!",
+    ]
+    assert chunker.flush() == "Then"
+
+
+def test_surrogate_pairs_decode_to_one_character():
+    payload = json.dumps({"response": "Thanks \U0001F44D see you \ud83d then", "action": "continue"})
+
+    for size in (1, 5, len(payload)):
+        value, _ = _feed_in_pieces(payload, size)
+        assert value == "Thanks \U0001F44D see you � then"
+        value.encode("utf-8")
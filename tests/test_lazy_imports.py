@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_PACKAGES = ("pyaudio", "sounddevice", "numpy", "webrtcvad", "openai", "elevenlabs",
+                 "googleapiclient", "google_auth_oauthlib", "httplib2")
+
+
+def _imported_after(code):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "src")]))
+    check = f"import sys; {code}; print(' '.join(p for p in {LAZY_PACKAGES!r} if p in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def test_startup_imports_no_heavy_packages():
+    assert _imported_after("import src.voiceai.main") == []
+
+
+def test_tool_calls_are_built_on_first_access():
+    assert _imported_after("from src.voiceai import tool_calls; tool_calls.stt; tool_calls.calendar") == []
+
+
+def test_replay_runs_without_the_vendor_sdks():
+    imported = _imported_after("import src.voiceai.replay.harness")
+    assert "openai" not in imported and "elevenlabs" not in imported
+
+
+def test_tool_calls_rejects_unknown_names():
+    from src.voiceai import tool_calls
+
+    with pytest.raises(AttributeError):
+        tool_calls.telephony
@@ -0,0 +1,147 @@
+import asyncio
+
+from src.voiceai.services.playback import StreamingPlayer
+
+BLOCK = 320  # bytes per callback: 10 ms at 16 kHz
+
+
+def _player(prebuffer_ms=20, max_buffer_ms=40):
+    player = StreamingPlayer(sample_rate=16000, prebuffer_ms=prebuffer_ms, max_buffer_ms=max_buffer_ms, block_size=160)
+    # Stands in for start(): no device is opened, the tests call _callback themselves
+    player.loop = asyncio.get_running_loop()
+    player._space_available = asyncio.Event()
+    player._space_available.set()
+    player._drained = asyncio.Event()
+    player._drained.set()
+    player.stream = object()
+    return player
+
+
+def _pull(player, size=BLOCK):
+    outdata = bytearray(size)
+    player._callback(outdata, size // 2, None, None)
+    return bytes(outdata)
+
+
+async def _settle():
+    # Lets the callbacks the audio thread scheduled with call_soon_threadsafe run
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_playback_waits_for_the_prebuffer():
+    async def scenario():
+        player = _player(prebuffer_ms=20)
+        await player.write(b"\x01" * 320)
+        silent = _pull(player)
+        playing_early = player._playing
+
+        await player.write(b"\x02" * 320)
+        first, second = _pull(player), _pull(player)
+        return silent, playing_early, first, second, player
+
+    silent, playing_early, first, second, player = asyncio.run(scenario())
+    assert silent == bytes(BLOCK)
+    assert not playing_early
+    assert first == b"\x01" * 320
+    assert second == b"\x02" * 320
+    assert player.get_stats()["underruns"] == 0
+
+
+def test_short_utterance_plays_once_flushed_and_drains():
+    async def scenario():
+        player = _player(prebuffer_ms=20)
+        await player.write(b"\x03" * 100)
+        assert _pull(player) == bytes(BLOCK)
+
+        drain = asyncio.ensure_future(player.drain())
+        await _settle()
+        assert not drain.done()
+
+        out = _pull(player)
+        await _settle()
+        return out, drain.done(), player
+
+    out, drained, player = asyncio.run(scenario())
+    assert out == b"\x03" * 100 + bytes(BLOCK - 100)
+    assert drained
+    assert not player.is_playing
+
+
+def test_underrun_rebuffers_before_resuming():
+    async def scenario():
+        player = _player(prebuffer_ms=20)
+        await player.write(b"\x04" * 640)
+        _pull(player)
+        _pull(player)
+        # Ran dry mid-utterance: silence, counted, and not primed again until refilled
+        dry = _pull(player)
+        await player.write(b"\x05" * 320)
+        waiting = _pull(player)
+        await player.write(b"\x06" * 320)
+        resumed = _pull(player)
+        return dry, waiting, resumed, player
+
+    dry, waiting, resumed, player = asyncio.run(scenario())
+    assert dry == bytes(BLOCK)
+    assert waiting == bytes(BLOCK)
+    assert resumed == b"\x05" * 320
+    assert player.get_stats()["underruns"] == 1
+
+
+def test_full_buffer_holds_the_writer_until_space_frees():
+    async def scenario():
+        player = _player(prebuffer_ms=20, max_buffer_ms=40)
+        writer = asyncio.ensure_future(player.write(b"\x07" * 1280 + b"\x08" * 640))
+        await _settle()
+        blocked = not writer.done()
+        buffered = player.get_stats()["buffered_ms"]
+
+        for _ in range(2):
+            _pull(player)
+        await _settle()
+        await asyncio.wait_for(writer, 1)
+        rest = b"".join(_pull(player) for _ in range(4))
+        return blocked, buffered, rest, player
+
+    blocked, buffered, rest, player = asyncio.run(scenario())
+    assert blocked
+    assert buffered == 40
+    assert player.get_stats()["overruns"] >= 1
+    assert rest == b"\x07" * 640 + b"\x08" * 640
+
+
+def test_clear_drops_audio_and_releases_a_waiting_writer():
+    async def scenario():
+        player = _player(prebuffer_ms=20, max_buffer_ms=40)
+        writer = asyncio.ensure_future(player.write(b"\x09" * 2560))
+        await _settle()
+        player.clear()
+        await asyncio.wait_for(writer, 1)
+        after_clear = _pull(player), player.is_playing
+
+        # The next utterance starts from an empty buffer
+        await player.write(b"\x0a" * 640)
+        return after_clear, _pull(player), player
+
+    (silence, playing), fresh, player = asyncio.run(scenario())
+    assert silence == bytes(BLOCK)
+    assert not playing
+    assert fresh == b"\x0a" * 320
+    assert player.get_stats()["buffered_ms"] == 10
+
+
+def test_silence_padding_reuses_one_buffer():
+    async def scenario():
+        player = _player(prebuffer_ms=20)
+        silence = player._silence
+        assert _pull(player) == bytes(BLOCK)
+        assert player._silence is silence
+
+        # A block larger than configured grows the buffer once
+        assert _pull(player, 1000) == bytes(1000)
+        grown = player._silence
+        assert _pull(player, 1000) == bytes(1000)
+        return grown is player._silence
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,182 @@
+import asyncio
+import wave
+
+from src.voiceai.replay.audio_source import WavAudioSource
+from src.voiceai.replay.cassette import Cassette
+from src.voiceai.replay.fake_llm import FakeOpenAI, RecordingOpenAI
+from src.voiceai.replay.fake_stt import FakeAssemblyAIServer
+from src.voiceai.replay.fake_tts import FakeElevenLabs
+from src.voiceai.replay.player import ReplayPlayer
+from src.voiceai.services.stt_service import AssemblyAISTTService
+
+
+def _write_wav(path, seconds):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(bytes(int(32000 * seconds)))
+
+
+def test_cassette_round_trip_and_repeats(tmp_path):
+    cassette = Cassette(str(tmp_path / "call.json"))
+    cassette.add_stt(1200, "hello", True)
+    cassette.add_llm("hello", "first", 300, 700)
+    cassette.add_llm("hello", "second", 200, 500)
+    cassette.add_tts("Hi there", b"\x01\x02" * 10, 150, 400)
+    cassette.save()
+
+    loaded = Cassette.load(str(tmp_path / "call.json"))
+    assert loaded.stt == [{"audio_ms": 1200, "transcript": "hello", "end_of_turn": True}]
+    assert [loaded.next_llm("hello")["content"] for _ in range(3)] == ["first", "second", "second"]
+    assert loaded.next_tts("Hi there")["audio"] == b"\x01\x02" * 10
+    assert loaded.next_llm("unknown") is None
+    assert loaded.misses == {"llm": 1, "tts": 0}
+
+
+def test_fake_openai_replays_streams_and_records():
+    recorded = Cassette()
+    content = '{"response": "Sure, when works for you?", "action": "continue"}'
+
+    async def scenario():
+        llm = FakeOpenAI(Cassette(data={"llm": {"hi": [{"content": content, "first_token_ms": 0, "total_ms": 0}]}}))
+        recorder = RecordingOpenAI(llm, recorded)
+        stream = await recorder.chat.completions.create(
+            model="m", messages=[{"role": "system", "content": "x"}, {"role": "user", "content": "hi"}], stream=True
+        )
+        return [chunk.choices[0].delta.content async for chunk in stream]
+
+    pieces = asyncio.run(scenario())
+    assert len(pieces) > 1
+    assert "".join(pieces) == content
+    assert recorded.next_llm("hi")["content"] == content
+
+
+def test_fake_elevenlabs_streams_recorded_audio_or_silence():
+    cassette = Cassette()
+    cassette.add_tts("Hello", b"\x05" * 10000, 0, 0)
+
+    async def scenario():
+        tts = FakeElevenLabs(cassette)
+        recorded = [chunk async for chunk in tts.text_to_speech.convert_as_stream(text="Hello", voice_id="v")]
+        missing = [chunk async for chunk in tts.text_to_speech.convert_as_stream(text="Bye", voice_id="v")]
+        return recorded, missing
+
+    recorded, missing = asyncio.run(scenario())
+    assert b"".join(recorded) == b"\x05" * 10000
+    assert missing and not any(b"".join(missing))
+    assert cassette.misses["tts"] == 1
+
+
+def test_fake_server_releases_turns_on_the_audio_timeline():
+    events = [
+        {"audio_ms": 100, "transcript": "book a", "end_of_turn": False},
+        {"audio_ms": 200, "transcript": "Book a callback", "end_of_turn": True},
+    ]
+    received = []
+
+    async def on_transcript(transcript, is_final):
+        received.append((transcript, is_final))
+
+    async def scenario():
+        server = FakeAssemblyAIServer(events)
+        await server.start()
+        stt = AssemblyAISTTService(on_transcript)
+        stt.url = server.url
+        try:
+            assert await stt.connect()
+            await stt.start_streaming()
+            await stt.stream_audio(bytes(3200))
+            for _ in range(50):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+            assert received == [("book a", False)]
+
+            await stt.stream_audio(bytes(3200))
+            for _ in range(50):
+                if not server.pending:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+        finally:
+            await stt.disconnect()
+            await server.stop()
+        return server
+
+    server = asyncio.run(scenario())
+    assert received == [("book a", False), ("Book a callback", True)]
+    assert server.audio_ms == 200
+
+
+def test_wav_source_yields_every_frame_then_finishes(tmp_path):
+    _write_wav(tmp_path / "a.wav", 0.5)
+    _write_wav(tmp_path / "b.wav", 0.25)
+
+    async def scenario():
+        source = WavAudioSource([str(tmp_path / "a.wav"), str(tmp_path / "b.wav")],
+                                realtime=False, gap_ms=250, tail_ms=0)
+        source.start_recording()
+        total = 0
+        async for frame in source.iter_frames():
+            assert len(frame.view) == source.pool_frame_bytes
+            total += len(frame.view)
+            frame.release()
+        return source, total
+
+    source, total = asyncio.run(scenario())
+    assert source.duration_ms == 1000
+    assert source.finished.is_set()
+    assert total >= 32000
+
+
+def test_replay_player_tracks_playback_time():
+    async def scenario():
+        player = ReplayPlayer(sample_rate=16000, realtime=True)
+        await player.write(bytes(3200))
+        assert player.is_playing
+        await player.drain()
+        assert not player.is_playing
+
+        await player.write(bytes(32000))
+        player.clear()
+        return player
+
+    player = asyncio.run(scenario())
+    assert not player.is_playing
+    assert player.get_stats()["played_ms"] == 1100
+
+
+def test_fake_server_releases_turns_on_the_caller_timeline():
+    events = [{"audio_ms": 5000, "caller_ms": 300, "transcript": "Hello", "end_of_turn": True}]
+    clock = {"ms": 0}
+    received = []
+
+    async def on_transcript(transcript, is_final):
+        received.append(transcript)
+
+    async def scenario():
+        server = FakeAssemblyAIServer(events, caller_clock=lambda: clock["ms"])
+        await server.start()
+        stt = AssemblyAISTTService(on_transcript)
+        stt.url = server.url
+        try:
+            assert await stt.connect()
+            await stt.start_streaming()
+            await asyncio.sleep(0.1)
+            early = list(received)
+
+            # Less audio was sent than when recording, but the caller is past the recorded point
+            clock["ms"] = 320
+            for _ in range(50):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await stt.disconnect()
+            await server.stop()
+        return early
+
+    early = asyncio.run(scenario())
+    assert early == []
+    assert received == ["Hello"]
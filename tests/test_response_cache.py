@@ -0,0 +1,59 @@
+from src.voiceai.services.response_cache import ResponseCache, hamming_distance, normalize_words, simhash
+
+SCRIPT = ("We've been trying to reach you concerning your car's extended warranty. "
+          "You should have received a notice in the mail about your car's extended warranty eligibility.")
+RESULT = {"response": "Not interested, goodbye.", "intent": "spam", "action": "decline", "confidence": 0.9}
+
+
+def _cache(**overrides):
+    options = dict(max_entries=10, ttl_seconds=60, max_distance=7, min_words=6)
+    options.update(overrides)
+    return ResponseCache(**options)
+
+
+def test_near_duplicate_transcripts_have_close_fingerprints():
+    variant = SCRIPT.replace("You should", "you should").replace("mail", "mail,")
+
+    assert hamming_distance(simhash(normalize_words(SCRIPT)), simhash(normalize_words(variant))) == 0
+
+
+def test_single_word_change_still_hits():
+    cache = _cache()
+    cache.store(SCRIPT, "0:unclear", RESULT)
+
+    assert cache.lookup(SCRIPT.replace("car's", "vehicle's", 1), "0:unclear") == RESULT
+    assert cache.lookup("Hi, this is Sarah from TechCorp calling about the partnership proposal.", "0:unclear") is None
+
+
+def test_hit_is_scoped_by_stage():
+    cache = _cache()
+    cache.store(SCRIPT, "0:unclear", RESULT)
+
+    assert cache.lookup(SCRIPT.upper(), "0:unclear") == RESULT
+    assert cache.lookup(SCRIPT, "1:spam") is None
+    assert cache.get_stats()["hit_rate"] == 0.5
+
+
+def test_short_transcripts_are_not_cached():
+    cache = _cache()
+
+    assert not cache.store("yes please", "1:legitimate", RESULT)
+    assert cache.lookup("yes please", "1:legitimate") is None
+    assert cache.get_stats()["skipped"] == 1
+
+
+def test_entries_expire_and_evict_lru(monkeypatch):
+    cache = _cache(max_entries=2, ttl_seconds=10)
+    clock = [100.0]
+    monkeypatch.setattr("src.voiceai.services.response_cache.time.monotonic", lambda: clock[0])
+
+    cache.store(SCRIPT, "a", RESULT)
+    cache.store(SCRIPT, "b", RESULT)
+    cache.lookup(SCRIPT, "a")
+    cache.store(SCRIPT, "c", RESULT)
+    assert cache.lookup(SCRIPT, "b") is None
+    assert cache.get_stats()["evictions"] == 1
+
+    clock[0] += 11
+    assert cache.lookup(SCRIPT, "a") is None
+    assert cache.get_stats()["entries"] == 1
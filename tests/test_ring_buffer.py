@@ -0,0 +1,33 @@
+from src.voiceai.services.ring_buffer import AudioRingBuffer
+
+
+def test_reads_preserve_order_across_wraparound():
+    ring = AudioRingBuffer(8)
+
+    assert ring.write(b"abcdef")
+    assert ring.read(4) == b"abcd"
+    assert ring.write(b"ghijk")
+    assert ring.available() == 7
+    assert ring.read(7) == b"efghijk"
+    assert ring.available() == 0
+
+
+def test_write_that_does_not_fit_is_dropped_and_counted():
+    ring = AudioRingBuffer(4)
+
+    assert ring.write(b"abc")
+    assert not ring.write(b"de")
+    assert ring.overflows == 1
+    assert ring.bytes_dropped == 2
+    assert ring.read(10) == b"abc"
+
+
+def test_read_into_fills_caller_buffer():
+    ring = AudioRingBuffer(6)
+    ring.write(b"1234")
+    ring.read(3)
+    ring.write(b"56789")
+
+    dest = bytearray(6)
+    assert ring.read_into(memoryview(dest)) == 6
+    assert bytes(dest) == b"456789"
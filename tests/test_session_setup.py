@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.voiceai import session as session_module
+from src.voiceai.services.frame_pool import AudioFrame
+from src.voiceai.session import CallSession
+
+
+class _Microphone:
+    use_callback = True
+    frame_size = 320
+
+    def __init__(self, events, frames=6):
+        self.events = events
+        self.frames = frames
+
+    def apply_vad(self, audio):
+        return False
+
+    def start_recording(self):
+        self.events.append("mic open")
+        return True
+
+    async def iter_frames(self):
+        for _ in range(self.frames):
+            await asyncio.sleep(0.02)
+            yield AudioFrame.wrap(bytes(1920))
+
+    def stop_recording(self):
+        pass
+
+    def cleanup(self):
+        pass
+
+
+class _STT:
+    def __init__(self, events):
+        self.events = events
+        self.is_streaming = False
+        self.sent = []
+
+    async def connect(self):
+        self.events.append("stt connected")
+        return True
+
+    async def start_streaming(self):
+        self.is_streaming = True
+        return True
+
+    async def stream_audio(self, audio):
+        self.sent.append(bytes(audio))
+        if len(self.sent) == 1:
+            self.events.append("audio sent")
+
+
+def test_stt_and_microphone_open_while_the_greeting_plays(monkeypatch):
+    monkeypatch.setattr(session_module.config, "VAD_GATE_ENABLED", False)
+    events = []
+    stt = _STT(events)
+
+    async def speak_text(text):
+        events.append("greeting start")
+        await asyncio.sleep(0.05)
+        events.append("greeting end")
+        return True
+
+    async def scenario():
+        session = CallSession("t", calendar_service=None, llm_client=SimpleNamespace(),
+                              tts_client=SimpleNamespace(), tts_cache=SimpleNamespace(),
+                              audio_handler=_Microphone(events), stt_factory=lambda callback: stt)
+        session.tts_service.speak_text = speak_text
+        session.monitor_silence = lambda: asyncio.sleep(0)
+        await session.start_call()
+        return session
+
+    session = asyncio.run(scenario())
+    assert sorted(events[:3]) == ["greeting start", "mic open", "stt connected"]
+    assert events[3:] == ["greeting end", "audio sent"]
+    # Frames captured during the greeting are not sent to STT
+    assert 0 < len(stt.sent) < 6
+    assert session.listening
+
+
+def test_audio_from_the_greeting_is_kept_as_preroll(monkeypatch):
+    monkeypatch.setattr(session_module.config, "VAD_GATE_ENABLED", True)
+    monkeypatch.setattr(session_module.config, "BARGE_IN_ENABLED", False)
+    stt = _STT([])
+    microphone = _Microphone([])
+    microphone.apply_vad = lambda audio: audio[0] == 1
+
+    async def scenario():
+        session = CallSession("t", calendar_service=None, llm_client=SimpleNamespace(),
+                              tts_client=SimpleNamespace(), tts_cache=SimpleNamespace(),
+                              audio_handler=microphone, stt_factory=lambda callback: stt)
+        session.stt_service = stt
+        session.vad_gate.preroll_ms = 100
+        await stt.start_streaming()
+
+        # The greeting is still playing: nothing is sent, but the tail is held back
+        for marker in range(10, 20):
+            await session._send_frame(AudioFrame.wrap(bytes([marker]) * 640))
+        assert stt.sent == []
+
+        session.listening = True
+        await session._send_frame(AudioFrame.wrap(bytes([1]) * 640))
+
+    asyncio.run(scenario())
+    # 100 ms of pre-roll is the last five 20 ms frames captured during the greeting
+    assert [chunk[0] for chunk in stt.sent] == [15, 16, 17, 18, 19, 1]
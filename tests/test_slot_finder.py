@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from src.voiceai.services.calendar_service import GoogleCalendarService
+from src.voiceai.services.slot_finder import SlotFinder, busy_intervals, merge_intervals, parse_time
+
+TZ = timezone(timedelta(hours=-5))
+
+
+def _at(day, hour, minute=0):
+    # 2024-06-03 is a Monday
+    return datetime(2024, 6, day, hour, minute, tzinfo=TZ)
+
+
+def test_parse_time_handles_utc_offsets_and_all_day_dates():
+    assert parse_time("2024-06-03T15:00:00Z", TZ) == _at(3, 10)
+    assert parse_time("2024-06-03T10:00:00-05:00", TZ) == _at(3, 10)
+    assert parse_time("2024-06-04", TZ) == _at(4, 0)
+
+
+def test_merge_intervals_joins_overlapping_and_touching_periods():
+    merged = merge_intervals([
+        (_at(3, 11), _at(3, 12)),
+        (_at(3, 9), _at(3, 10)),
+        (_at(3, 10), _at(3, 10, 30)),
+        (_at(3, 11, 30), _at(3, 13)),
+    ])
+
+    assert merged == [(_at(3, 9), _at(3, 10, 30)), (_at(3, 11), _at(3, 13))]
+
+
+def test_slots_skip_busy_periods_and_snap_to_half_hours():
+    intervals = busy_intervals(
+        [{"start": "2024-06-03T14:00:00Z", "end": "2024-06-03T15:10:00Z"}],
+        [{"start": {"dateTime": "2024-06-03T10:30:00-05:00"}, "end": {"dateTime": "2024-06-03T11:00:00-05:00"}}],
+        TZ,
+    )
+    finder = SlotFinder(slot_minutes=30, max_results=4)
+
+    slots = finder.find(_at(3, 8, 40), _at(3, 23), intervals)
+
+    assert slots == [_at(3, 11), _at(3, 11, 30), _at(3, 12), _at(3, 12, 30)]
+
+
+def test_all_day_events_and_weekends_are_skipped():
+    # Friday is blocked by an all-day event, the weekend is closed
+    intervals = busy_intervals([], [{"start": {"date": "2024-06-07"}, "end": {"date": "2024-06-08"}}], TZ)
+    finder = SlotFinder(slot_minutes=60, max_results=1)
+
+    assert finder.find(_at(7, 8), _at(11, 0), intervals) == [_at(10, 9)]
+    assert SlotFinder(slot_minutes=60, max_results=1, include_weekends=True).find(
+        _at(7, 8), _at(11, 0), intervals) == [_at(8, 9)]
+
+
+def test_slots_end_by_close_of_business():
+    finder = SlotFinder(slot_minutes=45)
+
+    slots = finder.find(_at(3, 15, 50), _at(4, 0), [])
+
+    assert slots == [_at(3, 16)]
+
+
+def test_malformed_entries_are_ignored():
+    intervals = busy_intervals([{"start": "not a time", "end": "2024-06-03T10:00:00Z"}], [{"summary": "no times"}], TZ)
+
+    assert intervals == []
+
+
+def test_slots_after_utc_busy_periods_stay_in_local_time():
+    intervals = busy_intervals([{"start": "2024-06-03T14:00:00Z", "end": "2024-06-03T15:10:00Z"}], [], TZ)
+    assert all(start.tzinfo == TZ and end.tzinfo == TZ for start, end in intervals)
+
+    slots = SlotFinder(slot_minutes=30, max_results=3).find(_at(3, 9), _at(3, 17), intervals)
+
+    # The busy period is 09:00-10:10 local, so the first slot is 10:30 local, not 15:30 UTC
+    assert slots == [_at(3, 10, 30), _at(3, 11), _at(3, 11, 30)]
+    assert all(slot.tzinfo == TZ for slot in slots)
+    assert [slot.hour for slot in slots] == [10, 11, 11]
+
+
+def test_slots_stay_local_when_intervals_come_in_another_zone():
+    utc = timezone.utc
+    intervals = [(datetime(2024, 6, 3, 14, tzinfo=utc), datetime(2024, 6, 3, 15, 10, tzinfo=utc))]
+
+    slots = SlotFinder(slot_minutes=30, max_results=1).find(_at(3, 9), _at(3, 17), intervals)
+
+    assert slots[0].tzinfo == TZ
+    assert (slots[0].hour, slots[0].minute) == (10, 30)
+
+
+def test_business_hours_follow_a_dst_change():
+    new_york = ZoneInfo("America/New_York")
+    # Clocks go forward on Sunday 2024-03-10; the search starts on the Friday before, in EST
+    start = datetime(2024, 3, 8, 16, 0, tzinfo=new_york)
+    busy = busy_intervals([{"start": "2024-03-11T13:00:00Z", "end": "2024-03-11T14:00:00Z"}], [], new_york)
+    slots = SlotFinder(max_results=3).find(start, start + timedelta(days=4), busy)
+
+    assert [slot.replace(tzinfo=None) for slot in slots] == [
+        datetime(2024, 3, 8, 16, 0), datetime(2024, 3, 8, 16, 30), datetime(2024, 3, 11, 10, 0)
+    ]
+    assert slots[0].utcoffset() == timedelta(hours=-5)
+    assert slots[2].utcoffset() == timedelta(hours=-4)
+
+
+def test_calendar_searches_in_its_own_zone():
+    calendar = GoogleCalendarService()
+    now, _ = calendar._free_slot_window(1)
+    naive = SlotFinder().find(datetime(2024, 6, 3, 8), datetime(2024, 6, 3, 10), [])
+
+    assert str(now.tzinfo) == "America/New_York"
+    assert naive[0] == datetime(2024, 6, 3, 9, tzinfo=ZoneInfo("America/New_York"))
+    assert all(str(slot.tzinfo) == "America/New_York" for slot in calendar._get_fallback_slots())
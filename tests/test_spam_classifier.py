@@ -0,0 +1,84 @@
+from src.voiceai.services.spam_classifier import AhoCorasick, SpamClassifier
+
+
+def test_matcher_finds_overlapping_patterns_in_one_pass():
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+
+    assert matcher.find("ushers") == {0, 1, 3}
+    assert matcher.find("nothing") == set()
+
+
+def test_obvious_robocall_is_declined_locally():
+    classifier = SpamClassifier(decline_threshold=0.9, hint_threshold=0.3)
+
+    verdict = classifier.classify("Congratulations! You've won a FREE cruise to the Bahamas!")
+
+    assert verdict["decision"] == "decline"
+    assert verdict["score"] == 1.0
+    assert "free cruise" in verdict["matches"]
+
+
+def test_single_indicator_only_produces_a_hint():
+    classifier = SpamClassifier(decline_threshold=0.9, hint_threshold=0.3)
+
+    verdict = classifier.classify("I'm calling about the car warranty on your Honda.")
+
+    assert verdict["decision"] == "hint"
+    assert verdict["matches"] == ["car warranty"]
+    assert "car warranty" in SpamClassifier.format_hint(verdict)
+
+
+def test_phrases_match_whole_words_only():
+    classifier = SpamClassifier(decline_threshold=0.9, hint_threshold=0.3)
+
+    verdict = classifier.classify("Hi, this is Sarah from TechCorp about the first partnership draft.")
+
+    assert verdict["decision"] == "none"
+    assert verdict["matches"] == []
+
+
+def test_phrase_inside_a_longer_match_is_not_counted_twice():
+    classifier = SpamClassifier(decline_threshold=0.9, hint_threshold=0.3)
+
+    verdict = classifier.classify("Please have your social security number ready.")
+
+    assert verdict["matches"] == ["social security number"]
+    assert verdict["score"] == 0.7
+    assert verdict["decision"] == "hint"
+
+
+def test_legitimate_benefits_and_bank_calls_are_not_declined():
+    classifier = SpamClassifier(decline_threshold=0.9, hint_threshold=0.3)
+
+    transcripts = [
+        "I'm calling from the Social Security office about your benefits, "
+        "please have your social security number ready when you call back.",
+        "Hi, this is Chase calling about suspicious activity on your bank account. "
+        "Can you confirm a recent purchase?",
+        "This is Dana from Miller Tax, the IRS letter mentions legal action so we should talk this week.",
+    ]
+
+    for transcript in transcripts:
+        assert classifier.classify(transcript)["decision"] != "decline", transcript
+
+
+def test_explicit_zero_thresholds_are_respected():
+    classifier = SpamClassifier(decline_threshold=0, hint_threshold=0)
+
+    assert classifier.decline_threshold == 0
+    assert classifier.hint_threshold == 0
+    assert classifier.classify("Hello there")["decision"] == "decline"
+
+
+def test_scores_are_rounded_before_the_threshold_checks():
+    classifier = SpamClassifier(decline_threshold=0.9, hint_threshold=0.3)
+
+    # 0.3 + 0.6 is 0.8999999999999999 as floats
+    exact = SpamClassifier(phrases={"prize": 0.3, "lottery": 0.6}, decline_threshold=0.9, hint_threshold=0.3)
+    assert exact.classify("prize lottery")["decision"] == "decline"
+
+    verdict = classifier.classify("Congratulations, you have been selected for a second interview.")
+
+    assert verdict["matches"] == ["congratulations", "you have been selected"]
+    assert verdict["score"] == 0.8
+    assert verdict["decision"] == "hint"
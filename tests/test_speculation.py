@@ -0,0 +1,117 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+
+from src.voiceai.services.llm_service import ConversationEngine
+from src.voiceai.services.response_cache import ResponseCache
+from src.voiceai.services.speculation import SpeculativeTurnRunner, normalize_transcript
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.version = 0
+        self.requests = []
+
+    async def draft_turn(self, transcript):
+        self.requests.append(transcript)
+        await asyncio.sleep(0.01)
+        return {"transcript": transcript, "version": self.version}
+
+    def is_draft_current(self, draft):
+        return draft["version"] == self.version
+
+
+def test_normalize_ignores_case_and_punctuation():
+    assert normalize_transcript("Hi, it's Sarah!") == normalize_transcript("hi it's sarah")
+
+
+def test_stable_partial_is_used_when_final_matches():
+    async def scenario():
+        engine = _FakeEngine()
+        runner = SpeculativeTurnRunner(engine, stable_ms=5)
+        runner.on_partial("I'd like a callback")
+        await asyncio.sleep(0.03)
+        draft = await runner.resolve("I'd like a callback.")
+        return engine, runner, draft
+
+    engine, runner, draft = asyncio.run(scenario())
+
+    assert draft == {"transcript": "I'd like a callback", "version": 0}
+    assert engine.requests == ["I'd like a callback"]
+    assert runner.get_stats()["hits"] == 1
+    assert runner.get_stats()["saved_ms_total"] > 0
+
+
+def test_diverging_final_discards_speculation():
+    async def scenario():
+        engine = _FakeEngine()
+        runner = SpeculativeTurnRunner(engine, stable_ms=5)
+        runner.on_partial("I'd like a callback")
+        await asyncio.sleep(0.008)
+        draft = await runner.resolve("I'd like a callback on Friday")
+        return runner, draft
+
+    runner, draft = asyncio.run(scenario())
+
+    assert draft is None
+    assert runner.get_stats()["misses"] == 1
+
+
+def test_unstable_partials_never_start_a_request():
+    async def scenario():
+        engine = _FakeEngine()
+        runner = SpeculativeTurnRunner(engine, stable_ms=20)
+        for words in ("I'd", "I'd like", "I'd like a", "I'd like a callback"):
+            runner.on_partial(words)
+            await asyncio.sleep(0.005)
+        draft = await runner.resolve("I'd like a callback")
+        return engine, draft
+
+    engine, draft = asyncio.run(scenario())
+
+    assert draft is None
+    assert engine.requests == []
+
+
+def test_failed_draft_is_retrieved_when_discarded():
+    class _FailingEngine(_FakeEngine):
+        async def draft_turn(self, transcript):
+            raise RuntimeError("LLM unavailable")
+
+    unhandled = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        runner = SpeculativeTurnRunner(_FailingEngine(), stable_ms=5)
+        runner.on_partial("I'd like a callback")
+        await asyncio.sleep(0.03)
+        runner.on_partial("I'd like a callback on Friday")
+        runner.reset()
+        gc.collect()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert unhandled == []
+
+
+def test_drafts_only_count_screening_and_cache_stats_when_committed():
+    script = "Congratulations, you have won a free cruise, press 1 to claim your prize now"
+    cached = "Hi there, I am calling about the quarterly report we discussed last week"
+    cache = ResponseCache(max_entries=10, ttl_seconds=60, max_distance=7, min_words=6)
+
+    async def scenario():
+        engine = ConversationEngine(client=SimpleNamespace(), response_cache=cache)
+        cache.store(cached, engine._conversation_stage(), {"response": "Sure.", "intent": "legitimate",
+                                                           "action": "continue", "confidence": 0.8})
+        spam_draft = await engine.draft_turn(script)
+        cache_draft = await engine.draft_turn(cached)
+        before = engine.spam_classifier.declined, cache.hits
+
+        engine.commit_turn(spam_draft)
+        return engine, cache_draft, before
+
+    engine, cache_draft, before = asyncio.run(scenario())
+    assert cache_draft["source"] == "response_cache"
+    assert before == (0, 0)
+    assert engine.spam_classifier.declined == 1
+    assert cache.hits == 0
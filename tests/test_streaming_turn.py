@@ -0,0 +1,114 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.voiceai import session as session_module
+from src.voiceai.services.tts_service import ElevenLabsTTSService
+from src.voiceai.session import CallSession
+
+
+class _Player:
+    def __init__(self):
+        self.written = []
+
+    async def write(self, audio):
+        self.written.append(audio)
+
+    async def drain(self):
+        pass
+
+    def clear(self):
+        pass
+
+
+class _Cache:
+    def get(self, key):
+        return None
+
+    def put(self, key, chunks):
+        return b"".join(chunks)
+
+
+def _tts(player):
+    return ElevenLabsTTSService(client=SimpleNamespace(), cache=_Cache(), player=player)
+
+
+def test_speak_queue_keeps_going_after_a_sentence_fails():
+    player = _Player()
+    tts = _tts(player)
+
+    async def stream_text(text):
+        if text == "bad":
+            raise RuntimeError("synthesis failed")
+        yield text.encode()
+
+    tts.stream_text = stream_text
+
+    async def scenario():
+        queue = asyncio.Queue()
+        for sentence in ("first", "bad", "last", None):
+            queue.put_nowait(sentence)
+        return await tts.speak_queue(queue)
+
+    assert asyncio.run(scenario())
+    assert player.written == [b"first", b"last"]
+
+
+def test_fallback_is_spoken_when_the_stream_fails_midway(monkeypatch):
+    monkeypatch.setattr(session_module.config, "SPECULATION_ENABLED", False)
+    monkeypatch.setattr(session_module.config, "LLM_STREAMING", True)
+    spoken = []
+
+    async def process_transcript_stream(transcript, on_sentence):
+        on_sentence("Let me check that for you.")
+        return {"response": "I apologize, could you repeat that?", "intent": "unclear",
+                "action": "continue", "confidence": 0.5, "failed": True}
+
+    async def speak_queue(queue):
+        while (sentence := await queue.get()) is not None:
+            spoken.append(sentence)
+        return True
+
+    async def speak_text(text):
+        spoken.append(text)
+        return True
+
+    async def scenario():
+        session = CallSession("t", calendar_service=None, llm_client=SimpleNamespace(),
+                              tts_client=SimpleNamespace(), tts_cache=SimpleNamespace(), player=_Player(),
+                              audio_handler=SimpleNamespace(apply_vad=lambda audio: False, frame_size=320))
+        session.llm_engine.process_transcript_stream = process_transcript_stream
+        session.tts_service.speak_queue = speak_queue
+        session.tts_service.speak_text = speak_text
+        await session.on_transcript("Hello?", True)
+
+    asyncio.run(scenario())
+    assert spoken == ["Let me check that for you.", "I apologize, could you repeat that?"]
+
+
+def test_reply_cut_short_is_marked_in_the_transcript(monkeypatch):
+    monkeypatch.setattr(session_module.config, "SPECULATION_ENABLED", False)
+    monkeypatch.setattr(session_module.config, "LLM_STREAMING", False)
+    recorded = []
+
+    async def process_transcript(transcript):
+        return {"response": "Let me tell you all about it.", "intent": "legitimate",
+                "action": "continue", "confidence": 0.8}
+
+    async def speak_text(text):
+        # The caller talked over the reply
+        return False
+
+    async def scenario():
+        session = CallSession("t", calendar_service=None, llm_client=SimpleNamespace(),
+                              tts_client=SimpleNamespace(), tts_cache=SimpleNamespace(), player=_Player(),
+                              audio_handler=SimpleNamespace(apply_vad=lambda audio: False, frame_size=320),
+                              call_store=SimpleNamespace(record_turn=lambda *args: recorded.append(args)))
+        session.llm_engine.process_transcript = process_transcript
+        session.tts_service.speak_text = speak_text
+        await session.on_transcript("Hello?", True)
+        return session
+
+    session = asyncio.run(scenario())
+    assert session.full_transcript == ["Caller: Hello?",
+                                       "Agent: Let me tell you all about it. [interrupted by caller]"]
+    assert recorded[-1][2] == "Let me tell you all about it. [interrupted by caller]"
@@ -0,0 +1,105 @@
+import asyncio
+
+import websockets
+
+from src.voiceai.services import stt_service
+from src.voiceai.services.ring_buffer import ReplayBuffer
+from src.voiceai.services.stt_service import AssemblyAISTTService
+
+# One 50 ms uplink frame of 16 kHz 16-bit audio
+FRAME_BYTES = 1600
+FRAMES = [bytes([i]) * FRAME_BYTES for i in range(4)]
+
+
+class _FakeSocket:
+    def __init__(self, fail_after=None):
+        self.sent = []
+        self.fail_after = fail_after
+        self._closed = asyncio.Event()
+
+    async def send(self, data):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            self._closed.set()
+            raise websockets.exceptions.ConnectionClosedError(None, None)
+        self.sent.append(bytes(data))
+
+    async def close(self):
+        self._closed.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self._closed.wait()
+        raise StopAsyncIteration
+
+
+def test_replay_buffer_keeps_the_newest_audio():
+    buffer = ReplayBuffer(6)
+    for chunk in (b"aa", b"bb", b"cc", b"dd"):
+        buffer.append(memoryview(chunk))
+
+    assert [buffer.popleft() for _ in range(3)] == [b"bb", b"cc", b"dd"]
+    assert buffer.bytes_dropped == 2
+
+
+def test_audio_sent_during_an_outage_is_replayed_in_order(monkeypatch):
+    sockets = [_FakeSocket(fail_after=1), _FakeSocket()]
+
+    async def fake_connect(uri, extra_headers=None):
+        if not sockets:
+            raise OSError("network down")
+        return sockets.pop(0)
+
+    monkeypatch.setattr(stt_service.websockets, "connect", fake_connect)
+
+    async def scenario():
+        first, second = sockets
+        stt = AssemblyAISTTService(lambda transcript, is_final: None)
+        await stt.connect()
+        await stt.start_streaming()
+
+        await stt.stream_audio(FRAMES[0])
+        await asyncio.sleep(0.01)
+        # The connection drops while these two are on their way out
+        await stt.stream_audio(FRAMES[1])
+        await stt.stream_audio(FRAMES[2])
+        await asyncio.sleep(0.01)
+        await stt.stream_audio(FRAMES[3])
+        await asyncio.sleep(0.01)
+        stats = stt.get_stats()
+        await stt.disconnect()
+        return first, second, stt, stats
+
+    first, second, stt, stats = asyncio.run(scenario())
+
+    assert first.sent == FRAMES[:1]
+    assert second.sent == FRAMES[1:]
+    assert stats["reconnects"] == 1
+    assert stats["replayed_bytes"] == 2 * FRAME_BYTES
+    assert len(stats["gaps_ms"]) == 1
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    sockets = [_FakeSocket(fail_after=0)]
+
+    async def fake_connect(uri, extra_headers=None):
+        if not sockets:
+            raise OSError("network down")
+        return sockets.pop(0)
+
+    monkeypatch.setattr(stt_service.websockets, "connect", fake_connect)
+    monkeypatch.setattr(stt_service.config, "RECONNECT_BASE_DELAY", 0.001)
+
+    async def scenario():
+        stt = AssemblyAISTTService(lambda transcript, is_final: None)
+        await stt.connect()
+        await stt.start_streaming()
+        await stt.stream_audio(FRAMES[0])
+        await asyncio.sleep(0.05)
+        return stt
+
+    stt = asyncio.run(scenario())
+
+    assert not stt.is_streaming
+    assert stt.get_stats()["failed_reconnects"] == 1
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from src.voiceai.services.tracing import InMemoryExporter, JsonlExporter, Tracer, percentile
+
+
+def test_spans_and_events_are_tagged_with_call_and_turn():
+    async def call(tracer, call_id):
+        tracer.start_call(call_id)
+        tracer.start_turn()
+        tracer.event("stt.end_of_turn")
+        with tracer.span("llm.process_transcript"):
+            await asyncio.sleep(0.01)
+
+        async def speak():
+            # Tasks spawned during the turn inherit its ids
+            tracer.event("tts.first_byte", once=True)
+            tracer.event("tts.first_byte", once=True)
+        await asyncio.create_task(speak())
+
+    async def scenario():
+        tracer = Tracer(exporter=InMemoryExporter(capacity=100))
+        await asyncio.gather(call(tracer, "a"), call(tracer, "b"))
+        return tracer
+
+    tracer = asyncio.run(scenario())
+    records = list(tracer.exporter.records)
+
+    assert len(records) == 6
+    for call_id in ("a", "b"):
+        mine = [r for r in records if r["call_id"] == call_id]
+        assert [r["name"] for r in mine] == ["stt.end_of_turn", "llm.process_transcript", "tts.first_byte"]
+        assert len({r["turn_id"] for r in mine}) == 1
+    span = next(r for r in records if r["kind"] == "span")
+    assert span["duration_ms"] >= 10
+
+
+def test_report_gives_percentiles_per_stage_and_call():
+    tracer = Tracer()
+    tracer.start_call("a")
+    for _ in range(3):
+        tracer.start_turn()
+        tracer.event("playback.start")
+
+    report = tracer.report()
+
+    assert report["playback.start"]["count"] == 3
+    assert set(report["playback.start"]) == {"count", "p50", "p95", "p99"}
+    assert tracer.report(call_id="other") == {}
+    assert percentile([5, 1, 4, 2, 3], 0.5) == 3
+
+
+def test_events_outside_a_turn_and_disabled_tracers_record_nothing():
+    tracer = Tracer(exporter=InMemoryExporter())
+    tracer.start_call("a")
+    tracer.event("stt.end_of_turn")
+    disabled = Tracer(exporter=InMemoryExporter(), enabled=False)
+    disabled.start_turn()
+    with disabled.span("llm.process_transcript"):
+        pass
+
+    assert not tracer.exporter.records
+    assert not disabled.exporter.records
+
+
+def test_jsonl_exporter_writes_one_record_per_line(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(exporter=JsonlExporter(str(path)))
+    tracer.start_turn()
+    tracer.event("stt.end_of_turn")
+    tracer.event("playback.end")
+    tracer.close()
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["stt.end_of_turn", "playback.end"]
@@ -0,0 +1,66 @@
+import os
+
+from src.voiceai.services.tts_cache import TTSCache
+
+
+def test_key_depends_on_every_synthesis_parameter():
+    base = TTSCache.make_key("Hello", "voice", "model", "pcm_16000")
+
+    assert base == TTSCache.make_key("Hello", "voice", "model", "pcm_16000")
+    assert base != TTSCache.make_key("Hello!", "voice", "model", "pcm_16000")
+    assert base != TTSCache.make_key("Hello", "other", "model", "pcm_16000")
+    assert base != TTSCache.make_key("Hello", "voice", "other", "pcm_16000")
+    assert base != TTSCache.make_key("Hello", "voice", "model", "pcm_22050")
+
+
+def test_put_then_get_survives_restart(tmp_path):
+    cache = TTSCache(cache_dir=str(tmp_path))
+    key = TTSCache.make_key("Hello", "voice", "model", "pcm_16000")
+
+    assert cache.get(key) is None
+    stored = cache.put(key, [b"\x01\x00", b"\x02\x00"])
+    assert bytes(stored) == b"\x01\x00\x02\x00"
+
+    reopened = TTSCache(cache_dir=str(tmp_path))
+    view = reopened.get(key)
+    assert isinstance(view, memoryview)
+    assert bytes(view) == b"\x01\x00\x02\x00"
+    assert reopened.get_stats()["hits"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = TTSCache(cache_dir=str(tmp_path), max_memory_bytes=8)
+    cache.put("a", [b"1234"])
+    cache.put("b", [b"5678"])
+    cache.get("a")
+    cache.put("c", [b"9999"])
+
+    assert list(cache._entries) == ["a", "c"]
+    # Evicted entries are still served from disk
+    assert bytes(cache.get("b")) == b"5678"
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path):
+    cache = TTSCache(cache_dir=str(tmp_path), max_memory_bytes=4, max_disk_bytes=8)
+    cache.put("a", [b"1234"])
+    cache.put("b", [b"5678"])
+    cache.get("a")
+    cache.put("c", [b"9999"])
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.pcm", "c.pcm"]
+    assert cache.get("b") is None
+    stats = cache.get_stats()
+    assert stats["disk_bytes"] == 8
+    assert stats["disk_evictions"] == 1
+
+
+def test_disk_budget_applies_to_files_from_earlier_runs(tmp_path):
+    first = TTSCache(cache_dir=str(tmp_path), max_disk_bytes=100)
+    first.put("old", [b"1234"])
+    first.put("new", [b"5678"])
+    os.utime(tmp_path / "old.pcm", (1, 1))
+
+    reopened = TTSCache(cache_dir=str(tmp_path), max_disk_bytes=8)
+    reopened.put("next", [b"0000"])
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["new.pcm", "next.pcm"]
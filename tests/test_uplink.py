@@ -0,0 +1,58 @@
+import asyncio
+
+from src.voiceai.services.uplink import UplinkSender
+
+
+def test_audio_is_recut_into_aligned_frames():
+    async def scenario():
+        sent = []
+
+        async def send(frame):
+            sent.append(frame)
+
+        uplink = UplinkSender(send, frame_ms=50, max_queue_ms=1000, sample_rate=16000)
+        uplink.start()
+        # 60 ms capture chunks in, 50 ms (1600 byte) frames out
+        for i in range(5):
+            uplink.push(bytes([i]) * 1920)
+        await asyncio.sleep(0.01)
+        uplink.flush()
+        await uplink.drain()
+        await uplink.stop()
+        return sent, uplink
+
+    sent, uplink = asyncio.run(scenario())
+
+    assert [len(frame) for frame in sent] == [1600] * 6
+    assert b"".join(sent) == b"".join(bytes([i]) * 1920 for i in range(5))
+    assert uplink.get_stats()["frames_sent"] == 6
+
+
+def test_oldest_frames_are_dropped_when_the_network_falls_behind():
+    async def scenario():
+        sent = []
+        release = asyncio.Event()
+
+        async def slow_send(frame):
+            await release.wait()
+            sent.append(frame[0])
+
+        uplink = UplinkSender(slow_send, frame_ms=50, max_queue_ms=150, sample_rate=16000)
+        uplink.start()
+        uplink.push(bytes([0]) * 1600)
+        await asyncio.sleep(0)
+        # Frame 0 is stuck in send; only the newest three frames fit in the queue
+        for i in range(1, 7):
+            uplink.push(bytes([i]) * 1600)
+        depth = uplink.get_stats()["queue_depth"]
+        release.set()
+        await uplink.drain()
+        await uplink.stop()
+        return sent, depth, uplink.get_stats()
+
+    sent, depth, stats = asyncio.run(scenario())
+
+    assert depth == 3
+    assert sent == [0, 4, 5, 6]
+    assert stats["frames_dropped"] == 3
+    assert stats["max_depth"] == 3
@@ -0,0 +1,89 @@
+from src.voiceai.services.frame_pool import AudioFrame, FramePool
+from src.voiceai.services.vad_gate import VADFramer, VADGate
+
+SPEECH = b"\x01\x00"
+SILENCE = b"\x00\x00"
+
+
+def _gate(**overrides):
+    options = dict(frame_ms=20, preroll_ms=40, hangover_ms=40,
+                   keepalive_interval_ms=200, keepalive_ms=20)
+    options.update(overrides)
+    return VADGate(lambda frame: frame == SPEECH, 2, **options)
+
+
+def test_framer_carries_remainder_between_chunks():
+    framer = VADFramer(4)
+
+    assert framer.push(b"abcdef") == [b"abcd"]
+    assert framer.push(b"gh") == [b"efgh"]
+    assert framer.push(b"i") == []
+
+
+def test_speech_is_sent_with_preroll_and_hangover():
+    gate = _gate()
+    sent = []
+    frames = [SILENCE] * 5 + [SPEECH] * 2 + [SILENCE] * 5
+
+    for frame in frames:
+        sent.extend(bytes(out.view) for out in gate.process(AudioFrame.wrap(frame)))
+
+    # Two pre-roll frames, the speech itself, then two hangover frames
+    assert sent == [SILENCE] * 2 + [SPEECH] * 2 + [SILENCE] * 2
+    assert gate.frames_sent == 6
+    assert gate.frames_suppressed == len(frames) - 6
+
+
+def test_held_frames_become_preroll_for_the_first_speech():
+    gate = _gate()
+    held = [b"\x02\x00", b"\x03\x00", b"\x04\x00"]
+
+    for frame in held:
+        gate.hold(AudioFrame.wrap(frame))
+    sent = [bytes(out.view) for out in gate.process(AudioFrame.wrap(SPEECH))]
+
+    # Only the newest preroll_ms of what was held is sent ahead of the speech
+    assert sent == held[1:] + [SPEECH]
+    assert gate.frames_suppressed == 1
+
+
+def test_long_silence_only_sends_keepalive_bursts():
+    gate = _gate()
+
+    sent = sum(len(gate.process(AudioFrame.wrap(SILENCE))) for _ in range(100))
+
+    assert sent == 10
+    assert gate.frames_suppressed == 90
+
+
+def test_filter_reslices_capture_chunks():
+    gate = _gate(preroll_ms=0, hangover_ms=0)
+
+    assert gate.filter(SPEECH + SILENCE[:1]) == SPEECH
+    assert gate.filter(SILENCE[1:] + SPEECH) == SPEECH
+
+
+def test_pooled_frames_return_to_pool_after_preroll_and_send():
+    pool = FramePool(4, 4)
+    gate = _gate(preroll_ms=20, hangover_ms=0)
+
+    def capture(data):
+        frame = pool.acquire()
+        frame.view[:] = data
+        return frame
+
+    # A 40 ms pool frame holding silence followed by speech counts as speech
+    held = capture(SILENCE + SILENCE)
+    assert gate.process(held) == []
+    held.release()
+    assert pool.in_use == 1
+
+    spoken = capture(SILENCE + SPEECH)
+    out = gate.process(spoken)
+    spoken.release()
+    assert [bytes(frame.view) for frame in out] == [SILENCE * 2, SILENCE + SPEECH]
+    assert gate.frames_sent == 4
+
+    for frame in out:
+        frame.release()
+    assert pool.in_use == 0